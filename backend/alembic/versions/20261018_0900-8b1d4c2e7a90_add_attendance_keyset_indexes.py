@@ -0,0 +1,26 @@
+"""Add attendance keyset pagination indexes
+
+Revision ID: 8b1d4c2e7a90
+Revises: 3f0463afb84c
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b1d4c2e7a90'
+down_revision = '3f0463afb84c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_attendance_date_id', 'attendance', ['date', 'id'], unique=False)
+    op.create_index('ix_attendance_status_date_id', 'attendance', ['status', 'date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_attendance_status_date_id', table_name='attendance')
+    op.drop_index('ix_attendance_date_id', table_name='attendance')
@@ -0,0 +1,37 @@
+"""Add employee_code_seq for auto-generated employee IDs
+
+Revision ID: c4e9a1f3b657
+Revises: 8b1d4c2e7a90
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e9a1f3b657'
+down_revision = '8b1d4c2e7a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(sa.schema.CreateSequence(sa.Sequence('employee_code_seq')))
+    # Continue numbering after the highest existing EMP-XXXX ID
+    op.execute(
+        """
+        SELECT setval(
+            'employee_code_seq',
+            COALESCE(
+                (SELECT max(substring(employee_id FROM '^EMP-([0-9]+)$')::bigint) FROM employees),
+                0
+            ) + 1,
+            false
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(sa.schema.DropSequence(sa.Sequence('employee_code_seq')))
@@ -0,0 +1,104 @@
+"""Add employee_attendance_counters maintained by attendance triggers
+
+Revision ID: 5d2f8e6b91c3
+Revises: c4e9a1f3b657
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2f8e6b91c3'
+down_revision = 'c4e9a1f3b657'
+branch_labels = None
+depends_on = None
+
+
+# Statement-level triggers see every affected row through transition tables,
+# so a 10k-row bulk upsert costs one grouped counter upsert, not 10k.
+APPLY_FUNCTION = """
+CREATE FUNCTION attendance_counters_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE employee_attendance_counters AS c
+        SET present_count = c.present_count - d.present_count,
+            absent_count = c.absent_count - d.absent_count,
+            total_count = c.total_count - d.total_count
+        FROM (
+            SELECT employee_id,
+                   count(*) FILTER (WHERE status = 'PRESENT') AS present_count,
+                   count(*) FILTER (WHERE status = 'ABSENT') AS absent_count,
+                   count(*) AS total_count
+            FROM old_rows
+            GROUP BY employee_id
+        ) AS d
+        WHERE c.employee_id = d.employee_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO employee_attendance_counters AS c
+            (employee_id, present_count, absent_count, total_count)
+        SELECT employee_id,
+               count(*) FILTER (WHERE status = 'PRESENT'),
+               count(*) FILTER (WHERE status = 'ABSENT'),
+               count(*)
+        FROM new_rows
+        GROUP BY employee_id
+        ON CONFLICT (employee_id) DO UPDATE
+        SET present_count = c.present_count + EXCLUDED.present_count,
+            absent_count = c.absent_count + EXCLUDED.absent_count,
+            total_count = c.total_count + EXCLUDED.total_count;
+    END IF;
+
+    RETURN NULL;
+END;
+$$
+"""
+
+TRIGGERS = {
+    "attendance_counters_insert": "AFTER INSERT ON attendance REFERENCING NEW TABLE AS new_rows",
+    "attendance_counters_update": (
+        "AFTER UPDATE ON attendance REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows"
+    ),
+    "attendance_counters_delete": "AFTER DELETE ON attendance REFERENCING OLD TABLE AS old_rows",
+}
+
+
+def upgrade() -> None:
+    op.create_table('employee_attendance_counters',
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('present_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('absent_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('total_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('employee_id')
+    )
+    op.execute(APPLY_FUNCTION)
+    for name, definition in TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER {name} {definition} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION attendance_counters_apply()"
+        )
+    # Backfill from existing history
+    op.execute(
+        """
+        INSERT INTO employee_attendance_counters
+            (employee_id, present_count, absent_count, total_count)
+        SELECT employee_id,
+               count(*) FILTER (WHERE status = 'PRESENT'),
+               count(*) FILTER (WHERE status = 'ABSENT'),
+               count(*)
+        FROM attendance
+        GROUP BY employee_id
+        """
+    )
+
+
+def downgrade() -> None:
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER {name} ON attendance")
+    op.execute("DROP FUNCTION attendance_counters_apply()")
+    op.drop_table('employee_attendance_counters')
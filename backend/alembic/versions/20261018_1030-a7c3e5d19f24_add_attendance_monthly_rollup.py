@@ -0,0 +1,102 @@
+"""Add attendance_monthly_rollup maintained by attendance triggers
+
+Revision ID: a7c3e5d19f24
+Revises: 5d2f8e6b91c3
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e5d19f24'
+down_revision = '5d2f8e6b91c3'
+branch_labels = None
+depends_on = None
+
+
+APPLY_FUNCTION = """
+CREATE FUNCTION attendance_monthly_rollup_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE attendance_monthly_rollup AS r
+        SET present_count = r.present_count - d.present_count,
+            absent_count = r.absent_count - d.absent_count
+        FROM (
+            SELECT employee_id,
+                   date_trunc('month', date)::date AS month,
+                   count(*) FILTER (WHERE status = 'PRESENT') AS present_count,
+                   count(*) FILTER (WHERE status = 'ABSENT') AS absent_count
+            FROM old_rows
+            GROUP BY 1, 2
+        ) AS d
+        WHERE r.employee_id = d.employee_id AND r.month = d.month;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO attendance_monthly_rollup AS r
+            (employee_id, month, present_count, absent_count)
+        SELECT employee_id,
+               date_trunc('month', date)::date,
+               count(*) FILTER (WHERE status = 'PRESENT'),
+               count(*) FILTER (WHERE status = 'ABSENT')
+        FROM new_rows
+        GROUP BY 1, 2
+        ON CONFLICT (employee_id, month) DO UPDATE
+        SET present_count = r.present_count + EXCLUDED.present_count,
+            absent_count = r.absent_count + EXCLUDED.absent_count;
+    END IF;
+
+    RETURN NULL;
+END;
+$$
+"""
+
+TRIGGERS = {
+    "attendance_rollup_insert": "AFTER INSERT ON attendance REFERENCING NEW TABLE AS new_rows",
+    "attendance_rollup_update": (
+        "AFTER UPDATE ON attendance REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows"
+    ),
+    "attendance_rollup_delete": "AFTER DELETE ON attendance REFERENCING OLD TABLE AS old_rows",
+}
+
+
+def upgrade() -> None:
+    op.create_table('attendance_monthly_rollup',
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('present_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('absent_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('employee_id', 'month')
+    )
+    op.create_index('ix_attendance_monthly_rollup_month', 'attendance_monthly_rollup', ['month', 'employee_id'], unique=False)
+    op.execute(APPLY_FUNCTION)
+    for name, definition in TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER {name} {definition} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION attendance_monthly_rollup_apply()"
+        )
+    # Backfill from existing history
+    op.execute(
+        """
+        INSERT INTO attendance_monthly_rollup
+            (employee_id, month, present_count, absent_count)
+        SELECT employee_id,
+               date_trunc('month', date)::date,
+               count(*) FILTER (WHERE status = 'PRESENT'),
+               count(*) FILTER (WHERE status = 'ABSENT')
+        FROM attendance
+        GROUP BY 1, 2
+        """
+    )
+
+
+def downgrade() -> None:
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER {name} ON attendance")
+    op.execute("DROP FUNCTION attendance_monthly_rollup_apply()")
+    op.drop_index('ix_attendance_monthly_rollup_month', table_name='attendance_monthly_rollup')
+    op.drop_table('attendance_monthly_rollup')
@@ -0,0 +1,55 @@
+"""Add table_versions bumped by statement-level triggers
+
+Revision ID: e2b8d4f6a1c7
+Revises: a7c3e5d19f24
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b8d4f6a1c7'
+down_revision = 'a7c3e5d19f24'
+branch_labels = None
+depends_on = None
+
+
+VERSIONED_TABLES = ("employees", "attendance")
+
+# One UPDATE per write statement (not per row). The row lock is held until
+# commit, so concurrent writers to the same table queue briefly on it; in
+# exchange the version is transactional and never runs ahead of the data.
+BUMP_FUNCTION = """
+CREATE FUNCTION bump_table_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = TG_TABLE_NAME;
+    RETURN NULL;
+END;
+$$
+"""
+
+
+def upgrade() -> None:
+    op.create_table('table_versions',
+    sa.Column('table_name', sa.String(length=63), nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    op.execute(BUMP_FUNCTION)
+    for table in VERSIONED_TABLES:
+        op.execute(f"INSERT INTO table_versions (table_name) VALUES ('{table}')")
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+        )
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER {table}_bump_version ON {table}")
+    op.execute("DROP FUNCTION bump_table_version()")
+    op.drop_table('table_versions')
@@ -0,0 +1,140 @@
+"""Partition attendance by month (range on date)
+
+Revision ID: f3a9c6d2b8e1
+Revises: e2b8d4f6a1c7
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a9c6d2b8e1'
+down_revision = 'e2b8d4f6a1c7'
+branch_labels = None
+depends_on = None
+
+
+# Partitions are named attendance_yYYYYmMM and hold [first of month, first of
+# next month); rows outside every monthly partition land in attendance_default.
+# AttendanceRepository.ensure_partitions() creates later months on startup.
+MONTHS_AHEAD = 3
+
+# Every trigger on attendance (the functions already exist); recreated on the
+# new table. Statement-level, so on a partitioned table they fire once per
+# statement against attendance, whichever partitions the rows went to.
+TRIGGERS = {
+    "attendance_counters_insert": (
+        "AFTER INSERT ON attendance REFERENCING NEW TABLE AS new_rows",
+        "attendance_counters_apply",
+    ),
+    "attendance_counters_update": (
+        "AFTER UPDATE ON attendance REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        "attendance_counters_apply",
+    ),
+    "attendance_counters_delete": (
+        "AFTER DELETE ON attendance REFERENCING OLD TABLE AS old_rows",
+        "attendance_counters_apply",
+    ),
+    "attendance_rollup_insert": (
+        "AFTER INSERT ON attendance REFERENCING NEW TABLE AS new_rows",
+        "attendance_monthly_rollup_apply",
+    ),
+    "attendance_rollup_update": (
+        "AFTER UPDATE ON attendance REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        "attendance_monthly_rollup_apply",
+    ),
+    "attendance_rollup_delete": (
+        "AFTER DELETE ON attendance REFERENCING OLD TABLE AS old_rows",
+        "attendance_monthly_rollup_apply",
+    ),
+    "attendance_bump_version": (
+        "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON attendance",
+        "bump_table_version",
+    ),
+}
+
+INDEXES = {
+    "ix_attendance_employee_id": "(employee_id)",
+    "ix_attendance_date_id": "(date, id)",
+    "ix_attendance_status_date_id": "(status, date, id)",
+}
+
+COLUMNS = "id, employee_id, date, status, created_at, updated_at"
+
+
+def _next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def _create_attendance_table(partitioned: bool) -> None:
+    primary_key = "(id, date)" if partitioned else "(id)"
+    op.execute(
+        f"""
+        CREATE TABLE attendance (
+            id integer NOT NULL DEFAULT nextval('attendance_id_seq'),
+            employee_id integer NOT NULL REFERENCES employees (id) ON DELETE CASCADE,
+            date date NOT NULL,
+            status attendance_status NOT NULL,
+            created_at timestamp with time zone NOT NULL DEFAULT now(),
+            updated_at timestamp with time zone NOT NULL DEFAULT now(),
+            CONSTRAINT attendance_pkey PRIMARY KEY {primary_key},
+            CONSTRAINT uq_attendance_employee_date UNIQUE (employee_id, date)
+        ) {"PARTITION BY RANGE (date)" if partitioned else ""}
+        """
+    )
+    op.execute("ALTER SEQUENCE attendance_id_seq OWNED BY attendance.id")
+    for name, columns in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON attendance {columns}")
+
+
+def _move_aside_old_table(new_name: str) -> None:
+    """Rename attendance and free the index / constraint names it holds."""
+    op.execute(f"ALTER TABLE attendance RENAME TO {new_name}")
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER {name} ON {new_name}")
+    for name in INDEXES:
+        op.execute(f"DROP INDEX {name}")
+    op.execute(f"ALTER TABLE {new_name} DROP CONSTRAINT uq_attendance_employee_date")
+    op.execute(f"ALTER TABLE {new_name} DROP CONSTRAINT attendance_pkey")
+
+
+def _create_triggers() -> None:
+    for name, (definition, function) in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {definition} FOR EACH STATEMENT EXECUTE FUNCTION {function}()")
+
+
+def upgrade() -> None:
+    _move_aside_old_table("attendance_unpartitioned")
+    _create_attendance_table(partitioned=True)
+
+    op.execute("CREATE TABLE attendance_default PARTITION OF attendance DEFAULT")
+    first = op.get_bind().execute(sa.text("SELECT min(date) FROM attendance_unpartitioned")).scalar()
+    month = (first or date.today()).replace(day=1)
+    last = date.today().replace(day=1)
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(last)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE attendance_y{month:%Y}m{month:%m} PARTITION OF attendance "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+        )
+        month = _next_month(month)
+
+    # Copied before the triggers exist: counters and rollups are already right
+    op.execute(f"INSERT INTO attendance ({COLUMNS}) SELECT {COLUMNS} FROM attendance_unpartitioned")
+    op.execute("DROP TABLE attendance_unpartitioned")
+    _create_triggers()
+    op.execute("ANALYZE attendance")
+
+
+def downgrade() -> None:
+    _move_aside_old_table("attendance_partitioned")
+    _create_attendance_table(partitioned=False)
+    op.execute(f"INSERT INTO attendance ({COLUMNS}) SELECT {COLUMNS} FROM attendance_partitioned")
+    op.execute("DROP TABLE attendance_partitioned")  # and its partitions
+    _create_triggers()
+    op.execute("ANALYZE attendance")
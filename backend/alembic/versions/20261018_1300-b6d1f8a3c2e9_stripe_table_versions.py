@@ -0,0 +1,114 @@
+"""Stripe table_versions and skip bumps for statements that change nothing
+
+Revision ID: b6d1f8a3c2e9
+Revises: f3a9c6d2b8e1
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d1f8a3c2e9'
+down_revision = 'f3a9c6d2b8e1'
+branch_labels = None
+depends_on = None
+
+
+VERSIONED_TABLES = ("employees", "attendance")
+
+# Must match TABLE_VERSION_STRIPES in app/models/table_version.py
+STRIPES = 16
+
+# A table's version is the sum of its stripes. Each transaction bumps the
+# stripe its transaction id maps to, so concurrent writers usually lock
+# different rows, and each transaction only ever locks one of them (no
+# deadlocks). The bump stays transactional: readers see it exactly when the
+# data that caused it, which a sequence (bumped before commit) can't offer.
+# Statements whose transition table is empty (e.g. an INSERT ... ON CONFLICT
+# DO NOTHING that skipped every row) don't bump at all.
+BUMP_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM FROM old_rows LIMIT 1;
+        IF NOT FOUND THEN RETURN NULL; END IF;
+    ELSIF TG_OP <> 'TRUNCATE' THEN
+        PERFORM FROM new_rows LIMIT 1;
+        IF NOT FOUND THEN RETURN NULL; END IF;
+    END IF;
+    UPDATE table_versions SET version = version + 1
+    WHERE table_name = TG_TABLE_NAME AND stripe = txid_current() % {STRIPES};
+    RETURN NULL;
+END;
+$$
+"""
+
+OLD_BUMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE table_name = TG_TABLE_NAME;
+    RETURN NULL;
+END;
+$$
+"""
+
+# Transition tables need one trigger per event
+TRIGGERS = {
+    "bump_version_insert": "AFTER INSERT ON {table} REFERENCING NEW TABLE AS new_rows",
+    "bump_version_update": "AFTER UPDATE ON {table} REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "bump_version_delete": "AFTER DELETE ON {table} REFERENCING OLD TABLE AS old_rows",
+    "bump_version_truncate": "AFTER TRUNCATE ON {table}",
+}
+
+
+def upgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER {table}_bump_version ON {table}")
+    op.execute(BUMP_FUNCTION)
+
+    # Existing versions stay in stripe 0, so no ETag changes
+    op.add_column('table_versions', sa.Column('stripe', sa.SmallInteger(), server_default='0', nullable=False))
+    op.drop_constraint('table_versions_pkey', 'table_versions', type_='primary')
+    op.create_primary_key('table_versions_pkey', 'table_versions', ['table_name', 'stripe'])
+    op.alter_column('table_versions', 'stripe', server_default=None)
+    op.execute(
+        "INSERT INTO table_versions (table_name, stripe) "
+        f"SELECT table_name, s FROM table_versions CROSS JOIN generate_series(1, {STRIPES - 1}) AS s"
+    )
+
+    for table in VERSIONED_TABLES:
+        for name, definition in TRIGGERS.items():
+            op.execute(
+                f"CREATE TRIGGER {table}_{name} {definition.format(table=table)} "
+                "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+            )
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        for name in TRIGGERS:
+            op.execute(f"DROP TRIGGER {table}_{name} ON {table}")
+    op.execute(OLD_BUMP_FUNCTION)
+
+    op.execute(
+        """
+        UPDATE table_versions AS t SET version = s.total
+        FROM (SELECT table_name, sum(version) AS total FROM table_versions GROUP BY table_name) AS s
+        WHERE t.table_name = s.table_name AND t.stripe = 0
+        """
+    )
+    op.execute("DELETE FROM table_versions WHERE stripe <> 0")
+    op.drop_constraint('table_versions_pkey', 'table_versions', type_='primary')
+    op.create_primary_key('table_versions_pkey', 'table_versions', ['table_name'])
+    op.drop_column('table_versions', 'stripe')
+
+    for table in VERSIONED_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+        )
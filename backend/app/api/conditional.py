@@ -0,0 +1,85 @@
+"""
+Conditional GET support: strong ETags from table write versions.
+
+Opt a GET route in with the dependency returned by :func:`conditional_get`::
+
+    @router.get("", dependencies=[Depends(conditional_get("employees"))])
+
+The ETag is derived from the ``table_versions`` rows of the tables the
+response reads (one primary-key range scan), the request URL and the app
+version — never from the body. When it matches ``If-None-Match`` the request
+ends with ``304 Not Modified`` before the route fetches or serializes
+anything. Otherwise the ``ETag`` header is set on the response. Versions are
+read through the same session the route reads its data with (``get_read_db``
+by default),
+so a lagging replica never pairs old data with a new ETag.
+
+Routes that return a ``Response`` themselves (e.g. ``TrustedJSONResponse``)
+bypass FastAPI's header merging, so they take the dependency's value — the
+headers to send — and pass it on explicitly.
+"""
+
+import hashlib
+from collections.abc import AsyncGenerator, Callable
+
+from fastapi import Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import get_read_db
+from app.exceptions.exceptions import NotModifiedException
+from app.repositories.table_version import TableVersionRepository
+
+settings = get_settings()
+
+# For the ``responses=`` of routes using the dependency (OpenAPI docs)
+NOT_MODIFIED_RESPONSE = {304: {"description": "Not modified since the ETag sent in If-None-Match"}}
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, as RFC 9110 prescribes for If-None-Match."""
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def conditional_get(
+    *tables: str,
+    key: Callable[[], str] | None = None,
+    session: Callable[..., AsyncGenerator[AsyncSession, None]] = get_read_db,
+) -> Callable[..., dict[str, str]]:
+    """
+    Build a dependency that answers ``If-None-Match`` for a response derived
+    from *tables*. *key* adds anything else the body depends on (e.g. today's
+    date for "present today" figures). *session* must be the session
+    dependency the route reads with, so both share one session.
+    """
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(session),
+    ) -> dict[str, str]:
+        versions = await TableVersionRepository(db).get_versions(tables)
+        parts = [
+            settings.app_version,
+            str(request.url.path),
+            str(request.url.query),
+            *(f"{table}:{versions.get(table, 0)}" for table in tables),
+        ]
+        if key is not None:
+            parts.append(key())
+        digest = hashlib.blake2b("|".join(parts).encode(), digest_size=12).hexdigest()
+        headers = {
+            "ETag": f'"{digest}"',
+            # Let clients keep the body but revalidate before every use
+            "Cache-Control": "no-cache",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, headers["ETag"]):
+            raise NotModifiedException(headers)
+        response.headers.update(headers)
+        return headers
+
+    return dependency
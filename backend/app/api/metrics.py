@@ -0,0 +1,21 @@
+"""Prometheus scrape endpoint."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.telemetry import metrics
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+)
+async def get_metrics() -> PlainTextResponse:
+    """Metrics in the Prometheus text format, summed over all workers in multiprocess mode."""
+    return PlainTextResponse(
+        await metrics.export(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
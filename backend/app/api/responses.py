@@ -0,0 +1,39 @@
+"""
+Fast JSON responses for trusted reads.
+
+List endpoints build plain dict rows straight from Core projections, with
+exactly the keys of their ``response_model``. The whole payload is serialized
+in one call — with orjson when it is installed, otherwise with pydantic-core's
+serializer — and returned as a ``Response``, which FastAPI sends as-is instead
+of validating every row against ``response_model`` again. The route's
+``response_model`` still documents the schema in OpenAPI.
+
+Only use this for data read from the database, never for client input.
+"""
+
+from typing import Any
+
+from fastapi import Response
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize dicts/lists of JSON-ready values, dates, datetimes and enums."""
+    if orjson is not None:
+        # OPT_UTC_Z renders UTC as "Z", matching pydantic's output
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return to_json(content)
+
+
+class TrustedJSONResponse(Response):
+    """JSON response whose content is serialized without re-validation."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
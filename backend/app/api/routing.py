@@ -0,0 +1,35 @@
+"""Route class that frees read-only database connections before serialization."""
+
+import asyncio
+import functools
+from collections.abc import Callable
+
+from fastapi.routing import APIRoute
+
+from app.database import release_read_session
+
+
+class ReadSessionRoute(APIRoute):
+    """
+    For GET routes, closes the request's read-only session (``get_read_db`` /
+    ``get_report_db``) as soon as the endpoint function returns. FastAPI
+    otherwise keeps the dependency open until the response is serialized,
+    holding a pooled connection that no longer runs any query.
+
+    Use it as ``APIRouter(route_class=ReadSessionRoute)``.
+    """
+
+    def get_route_handler(self) -> Callable:
+        endpoint = self.dependant.call
+        # Sync endpoints run in a thread pool: leave them alone
+        if "GET" in self.methods and asyncio.iscoroutinefunction(endpoint):
+
+            @functools.wraps(endpoint)
+            async def call(**values):
+                try:
+                    return await endpoint(**values)
+                finally:
+                    await release_read_session()
+
+            self.dependant.call = call
+        return super().get_route_handler()
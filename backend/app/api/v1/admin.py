@@ -0,0 +1,32 @@
+"""Operational endpoints for inspecting the running worker."""
+
+from typing import Dict
+
+from fastapi import APIRouter
+
+from app.api.routing import ReadSessionRoute
+from app.cache import cache_stats
+from app.schemas.admin import CacheStatsResponse, PoolStatsResponse
+from app.telemetry.metrics import pool_stats
+
+router = APIRouter(prefix="/admin", tags=["Admin"], route_class=ReadSessionRoute)
+
+
+@router.get(
+    "/caches",
+    response_model=Dict[str, CacheStatsResponse],
+    summary="In-process cache statistics",
+    description="Size and hit/miss counters of every cache in this worker process.",
+)
+async def get_cache_stats() -> Dict[str, CacheStatsResponse]:
+    return cache_stats()
+
+
+@router.get(
+    "/pools",
+    response_model=Dict[str, PoolStatsResponse],
+    summary="Database connection pool statistics",
+    description="Configuration and live usage of this worker's connection pools (primary, replica).",
+)
+async def get_pool_stats() -> Dict[str, PoolStatsResponse]:
+    return pool_stats()
@@ -1,21 +1,50 @@
 """Attendance API router."""
 
-from typing import List
+from datetime import date
+from typing import List, Literal, Union
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.schemas.attendance import AttendanceCreate, AttendanceUpdate, AttendanceResponse, EmployeeAttendanceSummary
+from app.api.conditional import NOT_MODIFIED_RESPONSE, conditional_get
+from app.api.responses import TrustedJSONResponse
+from app.api.routing import ReadSessionRoute
+from app.database import get_db, get_read_db, get_report_db, read_session_factory
+from app.models.attendance import AttendanceStatus
+from app.schemas.attendance import (
+    AttendanceBulkCreate,
+    AttendanceBulkResponse,
+    AttendanceCreate,
+    AttendanceResponse,
+    AttendanceUpdate,
+    EmployeeAttendanceSummary,
+    EmployeeMonthlyAttendanceSummary,
+)
+from app.schemas.pagination import MAX_PAGE_SIZE, Page
 from app.services.attendance import AttendanceService
 
-router = APIRouter(prefix="/attendance", tags=["Attendance"])
+router = APIRouter(prefix="/attendance", tags=["Attendance"], route_class=ReadSessionRoute)
 
 
 def get_service(db: AsyncSession = Depends(get_db)) -> AttendanceService:
     return AttendanceService(db)
 
 
+def get_read_service(db: AsyncSession = Depends(get_read_db)) -> AttendanceService:
+    return AttendanceService(db)
+
+
+def get_report_service(db: AsyncSession = Depends(get_report_db)) -> AttendanceService:
+    return AttendanceService(db)
+
+
+# Attendance reads join employees (names, codes), so both tables count
+attendance_etag = conditional_get("attendance", "employees")
+# Summaries read the ETag and the totals from one snapshot
+attendance_report_etag = conditional_get("attendance", "employees", session=get_report_db)
+
+
 @router.post(
     "",
     response_model=AttendanceResponse,
@@ -35,26 +64,101 @@ async def mark_attendance(
     return AttendanceResponse.model_validate(record)
 
 
+@router.post(
+    "/bulk",
+    response_model=AttendanceBulkResponse,
+    summary="Mark attendance for many employees at once",
+    description=(
+        "Resolves all employee codes in one query and writes the records with "
+        "multi-row upserts. Every entry gets a result: `inserted`, `updated`, "
+        "`duplicate` (already recorded, or repeated in the request) or "
+        "`unknown_employee`."
+    ),
+    responses={422: {"description": "Validation error"}},
+)
+async def bulk_mark_attendance(
+    payload: AttendanceBulkCreate,
+    service: AttendanceService = Depends(get_service),
+) -> AttendanceBulkResponse:
+    return await service.bulk_mark_attendance(payload)
+
+
 @router.get(
     "",
-    response_model=List[AttendanceResponse],
-    summary="Get all attendance records with optional date filtering",
+    response_model=Union[List[AttendanceResponse], Page[AttendanceResponse]],
+    summary="Get attendance records with optional filtering",
+    description=(
+        "Records are ordered newest first. Without `limit` every matching record is "
+        "returned as a plain array (legacy behaviour). With `limit` the response is a "
+        "page object; pass its `next_cursor` back as `cursor` to fetch the next page."
+    ),
+    responses={**NOT_MODIFIED_RESPONSE, 400: {"description": "Invalid pagination cursor"}},
 )
 async def get_all_attendance(
-    start_date: str | None = None,
-    end_date: str | None = None,
-    service: AttendanceService = Depends(get_service),
-) -> List[AttendanceResponse]:
-    records = await service.get_all_attendance(start_date, end_date)
-    responses = []
-    for record in records:
-        response_data = AttendanceResponse.model_validate(record)
-        # Add employee info if available
-        if hasattr(record, 'employee') and record.employee:
-            response_data.employee_name = record.employee.full_name
-            response_data.employee_code = record.employee.employee_id
-        responses.append(response_data)
-    return responses
+    start_date: date | None = None,
+    end_date: date | None = None,
+    employee_id: str | None = Query(None, description="Filter by employee_id string (e.g. EMP-001)."),
+    department: str | None = Query(None, description="Filter by employee department."),
+    status: AttendanceStatus | None = Query(None, description="Filter by attendance status."),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; enables cursor pagination."),
+    cursor: str | None = Query(None, description="Opaque cursor returned as `next_cursor` by the previous page."),
+    service: AttendanceService = Depends(get_read_service),
+    cache_headers: dict[str, str] = Depends(attendance_etag),
+) -> TrustedJSONResponse:
+    filters = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "employee_id": employee_id,
+        "department": department,
+        "status": status,
+    }
+    # Rows come straight from the database already shaped like AttendanceResponse
+    if limit is None:
+        return TrustedJSONResponse(await service.get_all_attendance(**filters), headers=cache_headers)
+
+    records, next_cursor = await service.get_attendance_page(limit, cursor, **filters)
+    return TrustedJSONResponse(
+        {"items": records, "next_cursor": next_cursor}, headers=cache_headers
+    )
+
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+@router.get(
+    "/export",
+    summary="Stream attendance records as CSV or NDJSON",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Attendance rows, oldest first",
+            "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()},
+        },
+    },
+)
+async def export_attendance(
+    request: Request,
+    format: Literal["csv", "ndjson"] = "csv",
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> StreamingResponse:
+    session_factory = read_session_factory(request)
+
+    async def body():
+        # The request-scoped session from get_db is closed before the response
+        # body is sent, so the stream owns its session for the whole transfer.
+        async with session_factory() as session:
+            async for chunk in AttendanceService(session).export_attendance(
+                format, start_date, end_date
+            ):
+                yield chunk
+
+    filename = f"attendance_{start_date or 'all'}_{end_date or 'all'}.{format}"
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.put(
@@ -95,11 +199,38 @@ async def delete_attendance(
     "/summary/by-employee",
     response_model=List[EmployeeAttendanceSummary],
     summary="Get attendance summary for all employees",
+    description=(
+        "All-time totals by default. With `start_date` and/or `end_date` (inclusive) "
+        "the totals cover only that range."
+    ),
+    responses={**NOT_MODIFIED_RESPONSE, 400: {"description": "start_date is after end_date"}},
+    dependencies=[Depends(attendance_report_etag)],
 )
 async def get_attendance_summary(
-    service: AttendanceService = Depends(get_service),
+    start_date: date | None = None,
+    end_date: date | None = None,
+    service: AttendanceService = Depends(get_report_service),
 ) -> List[EmployeeAttendanceSummary]:
-    return await service.get_attendance_summary()
+    return await service.get_attendance_summary(start_date, end_date)
+
+
+@router.get(
+    "/summary/monthly",
+    response_model=List[EmployeeMonthlyAttendanceSummary],
+    summary="Get per-employee attendance totals for one month",
+    responses=NOT_MODIFIED_RESPONSE,
+    dependencies=[Depends(attendance_report_etag)],
+)
+async def get_monthly_attendance_summary(
+    month: str = Query(
+        ...,
+        pattern=r"^\d{4}-(0[1-9]|1[0-2])$",
+        examples=["2026-02"],
+        description="Calendar month in YYYY-MM format.",
+    ),
+    service: AttendanceService = Depends(get_report_service),
+) -> List[EmployeeMonthlyAttendanceSummary]:
+    return await service.get_monthly_summary(month)
 
 
 @router.get(
@@ -107,12 +238,14 @@ async def get_attendance_summary(
     response_model=List[AttendanceResponse],
     summary="Get all attendance records for an employee",
     responses={
+        **NOT_MODIFIED_RESPONSE,
         404: {"description": "Employee not found"},
     },
 )
 async def get_attendance(
     employee_id: str,
-    service: AttendanceService = Depends(get_service),
-) -> List[AttendanceResponse]:
+    service: AttendanceService = Depends(get_read_service),
+    cache_headers: dict[str, str] = Depends(attendance_etag),
+) -> TrustedJSONResponse:
     records = await service.get_attendance_by_employee(employee_id)
-    return [AttendanceResponse.model_validate(r) for r in records]
+    return TrustedJSONResponse(records, headers=cache_headers)
@@ -1,28 +1,45 @@
 """Employee API router — POST / GET / PUT / DELETE endpoints."""
 
-from typing import List
+from typing import List, Literal, Union
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.schemas.employee import EmployeeCreate, EmployeeUpdate, EmployeeResponse
+from app.api.conditional import NOT_MODIFIED_RESPONSE, conditional_get
+from app.api.responses import TrustedJSONResponse
+from app.api.routing import ReadSessionRoute
+from app.database import get_db, get_read_db
+from app.exceptions.exceptions import BadRequestException
+from app.schemas.employee import (
+    EmployeeCreate,
+    EmployeeImportResponse,
+    EmployeeResponse,
+    EmployeeUpdate,
+)
+from app.schemas.pagination import MAX_PAGE_SIZE, Page
 from app.services.employee import EmployeeService
 
-router = APIRouter(prefix="/employees", tags=["Employees"])
+router = APIRouter(prefix="/employees", tags=["Employees"], route_class=ReadSessionRoute)
 
 
 def get_service(db: AsyncSession = Depends(get_db)) -> EmployeeService:
     return EmployeeService(db)
 
 
+def get_read_service(db: AsyncSession = Depends(get_read_db)) -> EmployeeService:
+    return EmployeeService(db)
+
+
+employees_etag = conditional_get("employees")
+
+
 @router.post(
     "",
     response_model=EmployeeResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Create a new employee",
     responses={
-        400: {"description": "Duplicate employee_id"},
+        400: {"description": "Duplicate employee_id or email"},
         422: {"description": "Validation error"},
     },
 )
@@ -34,16 +51,81 @@ async def create_employee(
     return EmployeeResponse.model_validate(employee)
 
 
+IMPORT_MEDIA_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+@router.post(
+    "/import",
+    response_model=EmployeeImportResponse,
+    summary="Bulk-import employees from CSV or NDJSON",
+    description=(
+        "Send the file as the raw request body with `Content-Type: text/csv` "
+        "(header row: employee_id, full_name, email, department) or "
+        "`application/x-ndjson` (one JSON object per line). Rows are validated like "
+        "`POST /employees`; a blank employee_id is auto-generated. Valid rows are "
+        "inserted, and every rejected row is reported with its line number."
+    ),
+    responses={400: {"description": "Unsupported content type"}},
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "text/csv": {"schema": {"type": "string"}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_employees(
+    request: Request,
+    format: Literal["csv", "ndjson"] | None = Query(
+        None, description="Overrides the format implied by Content-Type."
+    ),
+    service: EmployeeService = Depends(get_service),
+) -> EmployeeImportResponse:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    fmt = format or IMPORT_MEDIA_TYPES.get(content_type)
+    if fmt is None:
+        raise BadRequestException(
+            message="Unsupported import format; send text/csv or application/x-ndjson.",
+            details={"content_type": content_type},
+        )
+    return await service.import_employees(request.stream(), fmt)
+
+
 @router.get(
     "",
-    response_model=List[EmployeeResponse],
-    summary="List all employees",
+    response_model=Union[List[EmployeeResponse], Page[EmployeeResponse]],
+    summary="List employees",
+    description=(
+        "Without `limit` the full list is returned as a plain array (legacy behaviour). "
+        "With `limit` the response is a page object; pass its `next_cursor` back as "
+        "`cursor` to fetch the following page."
+    ),
+    responses={
+        **NOT_MODIFIED_RESPONSE,
+        400: {"description": "Invalid pagination cursor"},
+    },
 )
 async def list_employees(
-    service: EmployeeService = Depends(get_service),
-) -> List[EmployeeResponse]:
-    employees = await service.get_all_employees()
-    return [EmployeeResponse.model_validate(e) for e in employees]
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; enables cursor pagination."),
+    cursor: str | None = Query(None, description="Opaque cursor returned as `next_cursor` by the previous page."),
+    sort: Literal["id", "employee_id"] = Query("id", description="Sort key for paginated listings."),
+    service: EmployeeService = Depends(get_read_service),
+    cache_headers: dict[str, str] = Depends(employees_etag),
+) -> TrustedJSONResponse:
+    # Rows come straight from the database already shaped like EmployeeResponse
+    if limit is None:
+        return TrustedJSONResponse(await service.get_all_employees(), headers=cache_headers)
+
+    employees, next_cursor = await service.get_employees_page(limit, cursor, sort)
+    return TrustedJSONResponse(
+        {"items": employees, "next_cursor": next_cursor}, headers=cache_headers
+    )
 
 
 @router.put(
@@ -51,6 +133,7 @@ async def list_employees(
     response_model=EmployeeResponse,
     summary="Update an employee by internal ID",
     responses={
+        400: {"description": "Duplicate email"},
         404: {"description": "Employee not found"},
         422: {"description": "Validation error"},
     },
@@ -1,13 +1,16 @@
-"""Health check endpoint."""
+"""Health check endpoints."""
 
-from fastapi import APIRouter
+from dataclasses import asdict
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Response, status
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
 
 from app.config import get_settings
-from app.database import get_db
-from app.schemas.health import HealthResponse
+from app.database import get_db, health_monitor
+from app.schemas.health import HealthResponse, ReadinessResponse
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
@@ -18,9 +21,48 @@ settings = get_settings()
     "",
     response_model=HealthResponse,
     summary="Application health check",
-    description="Returns `ok` when the API and database are reachable.",
+    description=(
+        "Returns `ok` when the API and the primary database are reachable. The "
+        "read replica, if any, is not checked here; see `/health/ready`."
+    ),
 )
 async def health_check(db: AsyncSession = Depends(get_db)) -> HealthResponse:
+    """Ping the primary database: writes fail whenever it is down."""
     # Lightweight DB ping — raises if the connection is broken
     await db.execute(text("SELECT 1"))
     return HealthResponse(status="ok", version=settings.app_version)
+
+
+@router.get(
+    "/live",
+    response_model=HealthResponse,
+    summary="Liveness probe",
+    description="Returns `ok` while the process can serve requests. No I/O.",
+)
+async def liveness() -> HealthResponse:
+    return HealthResponse(status="ok", version=settings.app_version)
+
+
+@router.get(
+    "/ready",
+    response_model=ReadinessResponse,
+    summary="Readiness probe",
+    description=(
+        "Result of the last background check (every `HEALTH_CHECK_INTERVAL_SECONDS`), "
+        "so polling it costs no database round trip. `degraded` (pool waits or 5xx "
+        "rate over their thresholds, replica unreachable) still answers 200; "
+        "`unavailable` (primary unreachable, or the check stalled) and `starting` answer 503."
+    ),
+    responses={503: {"model": ReadinessResponse, "description": "Not ready to serve traffic"}},
+)
+async def readiness(response: Response) -> ReadinessResponse:
+    current = health_monitor.current()
+    if current.status not in ("ok", "degraded"):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return ReadinessResponse(
+        status=current.status,
+        version=settings.app_version,
+        checked_at=datetime.fromtimestamp(current.checked_at, timezone.utc) if current.checked_at else None,
+        databases={name: asdict(database) for name, database in current.databases.items()},
+        reasons=current.reasons,
+    )
@@ -0,0 +1,281 @@
+"""
+In-process caches for expensive read results.
+
+Writers don't evict entries directly: they call :func:`invalidate_on_commit`.
+When the surrounding transaction commits:
+
+  * a ``NOTIFY`` on :data:`settings.cache_invalidation_channel` is sent as part
+    of the transaction, so every worker process running a
+    :class:`CacheInvalidationListener` evicts the same entries;
+  * the entries are evicted locally right after the commit.
+
+Nothing happens on rollback. TTL caches also expire entries as a backstop.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import Any
+
+import asyncpg
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_PENDING_KEY = "invalidate_on_commit"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+_MAX_PAYLOAD_BYTES = 7000
+
+_registry: dict[str, "BaseCache"] = {}
+
+
+class BaseCache(ABC):
+    """Common bookkeeping: registration by name and hit/miss counters."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        _registry[name] = self
+
+    @abstractmethod
+    def invalidate(self, keys: Iterable[Hashable] | None = None) -> None:
+        """Evict *keys*, or every entry if *keys* is ``None``."""
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    def stats(self) -> dict[str, Any]:
+        return {"size": len(self), "hits": self.hits, "misses": self.misses}
+
+
+class TTLCache(BaseCache):
+    """A small dict-backed cache whose entries expire after *ttl* seconds."""
+
+    def __init__(self, name: str, ttl: float) -> None:
+        super().__init__(name)
+        self.ttl = ttl
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        # Bumped on every invalidation so loads that started earlier don't
+        # repopulate the cache with stale data.
+        self._generation = 0
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        generation = self._generation
+        value = await loader()
+        if generation == self._generation and self.ttl > 0:
+            now = time.monotonic()
+            # Keys can change often (e.g. with table versions): drop expired ones
+            self._entries = {k: e for k, e in self._entries.items() if e[0] > now}
+            self._entries[key] = (now + self.ttl, value)
+        return value
+
+    def invalidate(self, keys: Iterable[Hashable] | None = None) -> None:
+        self._generation += 1
+        if keys is None:
+            self._entries.clear()
+        else:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LRUCache(BaseCache):
+    """A bounded mapping that evicts the least recently used entry when full."""
+
+    def __init__(self, name: str, maxsize: int) -> None:
+        super().__init__(name)
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        # Bumped on every invalidation; see put()
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Read before loading a value, then pass it to :meth:`put`."""
+        return self._generation
+
+    def get(self, key: Hashable) -> Any | None:
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any, generation: int | None = None) -> None:
+        """
+        Store *value*. With *generation*, the store is skipped if the cache was
+        invalidated since, so a load that started earlier can't bring back
+        stale data.
+        """
+        if self.maxsize <= 0 or (generation is not None and generation != self._generation):
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, keys: Iterable[Hashable] | None = None) -> None:
+        self._generation += 1
+        if keys is None:
+            self._entries.clear()
+        else:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def cache_stats() -> dict[str, dict[str, Any]]:
+    """Size and hit/miss counters of every registered cache."""
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+
+def invalidate_all() -> None:
+    for cache in _registry.values():
+        cache.invalidate()
+
+
+# ── Commit-time invalidation ──────────────────────────────────────────────────
+
+def invalidate_on_commit(
+    db: AsyncSession, cache: BaseCache, keys: Iterable[Hashable] | None = None
+) -> None:
+    """
+    Evict *keys* (or everything, when ``None``) from *cache* in every process
+    once the transaction currently open on *db* commits.
+    """
+    pending: dict[str, set | None] = db.sync_session.info.setdefault(_PENDING_KEY, {})
+    if keys is None or (cache.name in pending and pending[cache.name] is None):
+        pending[cache.name] = None
+    else:
+        pending.setdefault(cache.name, set()).update(keys)
+
+
+def _payload(pending: dict[str, set | None]) -> str:
+    message = {name: None if keys is None else sorted(keys) for name, keys in pending.items()}
+    payload = json.dumps(message, default=str)
+    if len(payload.encode()) > _MAX_PAYLOAD_BYTES:
+        # Too many keys to list: drop those caches entirely instead
+        payload = json.dumps({name: None for name in pending})
+    return payload
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_before_commit(session: Session) -> None:
+    pending = session.info.get(_PENDING_KEY)
+    if pending and settings.cache_invalidation_channel:
+        # Runs inside the transaction, so the notification is delivered to
+        # other workers only if (and when) the commit succeeds.
+        session.execute(
+            select(func.pg_notify(settings.cache_invalidation_channel, _payload(pending)))
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for name, keys in session.info.pop(_PENDING_KEY, {}).items():
+        cache = _registry.get(name)
+        if cache is not None:
+            cache.invalidate(keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    # A rolled-back savepoint doesn't undo the rest of the transaction; the
+    # invalidations it registered are kept too, which is merely conservative
+    if not session.in_nested_transaction():
+        session.info.pop(_PENDING_KEY, None)
+
+
+# ── Cross-process listener ────────────────────────────────────────────────────
+
+class CacheInvalidationListener:
+    """
+    Holds one dedicated connection that ``LISTEN``s on the invalidation
+    channel and applies the evictions other workers publish. If the
+    connection drops, notifications may have been missed, so every cache is
+    cleared before listening again.
+    """
+
+    def __init__(self, database_url: str, channel: str, retry_seconds: float = 5.0) -> None:
+        self._dsn = make_url(database_url).set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        self._channel = channel
+        self._retry_seconds = retry_seconds
+        self._connection: asyncpg.Connection | None = None
+        self._task: asyncio.Task | None = None
+        self._lost = asyncio.Event()
+
+    async def start(self) -> None:
+        """Connect once (so callers can warm caches afterwards), then supervise."""
+        await self._connect()
+        self._task = asyncio.create_task(self._run(), name="cache-invalidation-listener")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+
+    async def _connect(self) -> bool:
+        self._lost.clear()
+        try:
+            connection = await asyncpg.connect(self._dsn)
+            connection.add_termination_listener(lambda _conn: self._lost.set())
+            await connection.add_listener(self._channel, self._on_notification)
+        except Exception:
+            logger.exception("Cache invalidation listener could not connect")
+            self._lost.set()
+            return False
+        self._connection = connection
+        logger.info("Listening for cache invalidations on '%s'", self._channel)
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await self._lost.wait()
+            logger.warning("Cache invalidation listener disconnected; retrying")
+            invalidate_all()
+            await asyncio.sleep(self._retry_seconds)
+            if await self._connect():
+                # Anything cached while disconnected may have missed an eviction
+                invalidate_all()
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed cache invalidation payload: %r", payload)
+            return
+        for name, keys in message.items():
+            cache = _registry.get(name)
+            if cache is not None:
+                cache.invalidate(keys)
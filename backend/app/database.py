@@ -1,6 +1,14 @@
-from collections.abc import AsyncGenerator
+import asyncio
+import time
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 
+from fastapi import Request
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
@@ -8,18 +16,87 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import get_settings
+from app.telemetry.health import HealthMonitor
+from app.telemetry.metrics import InstrumentedAsyncQueuePool, observe_pool
+from app.telemetry.slow_queries import SlowQueryLog
+from app.telemetry.sql import instrument_engine
 
 settings = get_settings()
 
 # ── Engine ────────────────────────────────────────────────────────────────────
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,          # Log SQL when DEBUG=true
-    pool_pre_ping=True,           # Reconnect on stale connections
-    pool_size=10,
-    max_overflow=20,
+def _create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=settings.debug,          # Log SQL when DEBUG=true
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        poolclass=InstrumentedAsyncQueuePool,  # counts checkouts that wait
+    )
+
+
+engine = _create_engine(settings.database_url)
+observe_pool("primary", lambda: engine.pool)
+# Explains run from a task the app lifespan starts (slow_query_log.start())
+slow_query_log = (
+    SlowQueryLog(
+        settings.slow_query_threshold_ms / 1000,
+        explain_database_url=settings.database_url if settings.slow_query_explain else None,
+        explain_interval_seconds=settings.slow_query_explain_interval_seconds,
+    )
+    if settings.slow_query_threshold_ms > 0
+    else None
+)
+# Per-request query count / DB time; statement shapes only in debug mode
+instrument_engine(engine.sync_engine, track_statements=settings.debug, slow_query_log=slow_query_log)
+
+# Optional read replica; None when READ_DATABASE_URL is unset
+read_engine = _create_engine(settings.read_database_url) if settings.read_database_url else None
+if read_engine is not None:
+    observe_pool("replica", lambda: read_engine.pool)
+    instrument_engine(read_engine.sync_engine, track_statements=settings.debug, slow_query_log=slow_query_log)
+
+# Behind /health/ready; started by the app lifespan (health_monitor.start())
+health_monitor = HealthMonitor(
+    {"primary": settings.database_url}
+    | ({"replica": settings.read_database_url} if settings.read_database_url else {}),
+    interval_seconds=settings.health_check_interval_seconds,
+    timeout_seconds=settings.health_check_timeout_seconds,
+    degraded_pool_wait_ms=settings.health_degraded_pool_wait_ms,
+    degraded_error_rate=settings.health_degraded_error_rate,
 )
 
+
+def engines() -> list[AsyncEngine]:
+    return [engine] if read_engine is None else [engine, read_engine]
+
+
+async def warm_pool(pool_engine: AsyncEngine, connections: int) -> int:
+    """
+    Open *connections* (at most the pool size, so none is overflow) at once
+    and return them to the pool. Returns how many were opened.
+    """
+    count = min(connections, settings.db_pool_size)
+    results = await asyncio.gather(
+        *(pool_engine.connect().start() for _ in range(count)), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, AsyncConnection):
+            await result.close()
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        raise errors[0]
+    return count
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection; connections still checked out close on return."""
+    for pool_engine in engines():
+        await pool_engine.dispose()
+
+
 # ── Session factory ───────────────────────────────────────────────────────────
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -30,6 +107,42 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+def _read_only_sessionmaker(bind: AsyncEngine, report: bool) -> async_sessionmaker[AsyncSession]:
+    """
+    Sessions whose transactions start with ``BEGIN READ ONLY`` (asyncpg sends
+    it as one statement, so no extra round trip). *report* sessions also get
+    one snapshot for all their statements: ``SERIALIZABLE ... DEFERRABLE`` on
+    the primary, which never fails or slows writers, and ``REPEATABLE READ``
+    on a replica, since hot standbys don't allow SERIALIZABLE.
+    """
+    options: dict = {"postgresql_readonly": True}
+    if report and bind is engine:
+        options.update(isolation_level="SERIALIZABLE", postgresql_deferrable=True)
+    elif report:
+        options.update(isolation_level="REPEATABLE READ")
+    return async_sessionmaker(
+        bind=bind.execution_options(**options),
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+# (on the primary, report) -> read-only session factory; without a replica
+# both sides use the primary
+READ_ONLY_SESSIONS = {
+    (primary, report): _read_only_sessionmaker(engine if primary else read_engine or engine, report)
+    for primary in (True, False)
+    for report in (False, True)
+}
+
+
+def is_primary_session(session: AsyncSession) -> bool:
+    """Whether *session* reads from the primary (never a possibly lagging replica)."""
+    return read_engine is None or session.bind.pool is not read_engine.pool
+
+
 # ── Declarative base (shared by all models) ───────────────────────────────────
 class Base(DeclarativeBase):
     pass
@@ -47,3 +160,68 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
         finally:
             await session.close()
+
+
+# Sent on responses to writes (ReadYourWritesMiddleware): the Unix time until
+# which the client's reads go to the primary instead of the replica. Clients
+# echo it back on their reads. A header rather than a cookie, so it also works
+# when the frontend and API are different sites.
+READ_PRIMARY_HEADER = "X-Read-Primary-Until"
+
+
+# The request's read-only session, for release_read_session()
+_read_session: ContextVar[AsyncSession | None] = ContextVar("read_session", default=None)
+
+
+def read_session_factory(request: Request, report: bool = False) -> async_sessionmaker[AsyncSession]:
+    """Read-only sessions on the replica, unless the client wrote recently."""
+    now = time.time()
+    try:
+        until = float(request.headers.get(READ_PRIMARY_HEADER, 0))
+    except ValueError:
+        until = 0.0
+    # Bounded by the window, so a made-up value can't pin a client to the primary
+    sticky = now < until <= now + settings.read_your_writes_seconds
+    return READ_ONLY_SESSIONS[sticky, report]
+
+
+@asynccontextmanager
+async def _read_session_scope(request: Request, report: bool) -> AsyncIterator[AsyncSession]:
+    async with read_session_factory(request, report)() as session:
+        token = _read_session.set(session)
+        try:
+            yield session
+        finally:
+            # No COMMIT: closing returns the connection and the pool's reset
+            # ends the read-only transaction with a ROLLBACK instead, so this
+            # costs the same round trip a COMMIT would
+            _read_session.reset(token)
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Read-only session for GET routes, served by the replica if configured."""
+    async with _read_session_scope(request, report=False) as session:
+        yield session
+
+
+async def get_report_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Like :func:`get_read_db`, with one snapshot for every statement (aggregate reports)."""
+    async with _read_session_scope(request, report=True) as session:
+        yield session
+
+
+async def release_read_session() -> None:
+    """
+    Return the current request's read-only connection to the pool now. Called
+    (by ``ReadSessionRoute``) once the endpoint returns: results are fully
+    buffered, so serializing the response doesn't need the connection.
+    """
+    session = _read_session.get()
+    if session is not None:
+        await session.close()
+
+
+# ── Error helpers ─────────────────────────────────────────────────────────────
+def violated_constraint(exc: IntegrityError) -> str | None:
+    """Name of the constraint an ``IntegrityError`` raised by asyncpg violated."""
+    return getattr(exc.orig.__cause__, "constraint_name", None)
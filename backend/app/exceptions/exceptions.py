@@ -42,6 +42,19 @@ class AttendanceAlreadyMarkedException(AppException):
     message = "Attendance already marked for this date."
 
 
+# ── Conditional requests ──────────────────────────────────────────────────────
+
+class NotModifiedException(AppException):
+    """Raised when the representation the client already holds (If-None-Match) is current."""
+
+    status_code = status.HTTP_304_NOT_MODIFIED
+    message = "Not modified."
+
+    def __init__(self, headers: dict[str, str]) -> None:
+        super().__init__()
+        self.headers = headers
+
+
 # ── Generic HTTP helpers (kept for general use) ───────────────────────────────
 
 class NotFoundException(AppException):
@@ -14,9 +14,9 @@ import logging
 
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
-from app.exceptions.exceptions import AppException
+from app.exceptions.exceptions import AppException, NotModifiedException
 
 logger = logging.getLogger(__name__)
 
@@ -61,7 +61,14 @@ def register_exception_handlers(app: FastAPI) -> None:
             details=exc.details,
         )
 
-    # 2. FastAPI / Starlette HTTPException
+    # 2. Conditional GET hits — a bare 304, never the error envelope
+    @app.exception_handler(NotModifiedException)
+    async def not_modified_handler(
+        request: Request, exc: NotModifiedException
+    ) -> Response:
+        return Response(status_code=exc.status_code, headers=exc.headers)
+
+    # 3. FastAPI / Starlette HTTPException
     @app.exception_handler(HTTPException)
     async def http_exception_handler(
         request: Request, exc: HTTPException
@@ -78,7 +85,7 @@ def register_exception_handlers(app: FastAPI) -> None:
             message=str(exc.detail),
         )
 
-    # 3. Pydantic RequestValidationError (422)
+    # 4. Pydantic RequestValidationError (422)
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(
         request: Request, exc: RequestValidationError
@@ -104,7 +111,7 @@ def register_exception_handlers(app: FastAPI) -> None:
             details=details,
         )
 
-    # 4. Catch-all for unexpected errors
+    # 5. Catch-all for unexpected errors
     @app.exception_handler(Exception)
     async def unhandled_exception_handler(
         request: Request, exc: Exception
@@ -1,23 +1,44 @@
 """FastAPI application entry point."""
 
+import asyncio
+import contextlib
 import logging
 import logging.config
 from contextlib import asynccontextmanager
+from datetime import date, timedelta
 from typing import AsyncGenerator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 
+from app.api import metrics as metrics_api
 from app.api.v1.router import v1_router
+from app.cache import CacheInvalidationListener
 from app.config import get_settings
+from app.database import (
+    READ_PRIMARY_HEADER,
+    AsyncSessionLocal,
+    dispose_engines,
+    engines,
+    health_monitor,
+    slow_query_log,
+    warm_pool,
+)
 from app.exceptions.handlers import register_exception_handlers
+from app.middleware.consistency import ReadYourWritesMiddleware
 from app.middleware.logging import LoggingMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.repositories.attendance import AttendanceRepository
+from app.repositories.employee import EmployeeRepository
+from app.telemetry.metrics import run_flusher
 
 settings = get_settings()
 
 
 # ── Logging configuration ─────────────────────────────────────────────────────
+# Loggers only enqueue records; QueueListener threads (started in the lifespan)
+# do the actual writing, so a slow stdout never blocks the event loop.
 LOGGING_CONFIG: dict = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -26,6 +47,9 @@ LOGGING_CONFIG: dict = {
             "format": "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
             "datefmt": "%Y-%m-%dT%H:%M:%S",
         },
+        "json": {
+            "()": "app.middleware.logging.JSONFormatter",
+        },
     },
     "handlers": {
         "console": {
@@ -33,35 +57,140 @@ LOGGING_CONFIG: dict = {
             "formatter": "default",
             "stream": "ext://sys.stdout",
         },
+        "access_console": {
+            "class": "logging.StreamHandler",
+            "formatter": "json",
+            "stream": "ext://sys.stdout",
+        },
+        "queue": {
+            "class": "logging.handlers.QueueHandler",
+            "handlers": ["console"],
+        },
+        "access_queue": {
+            "class": "logging.handlers.QueueHandler",
+            "handlers": ["access_console"],
+        },
     },
     "root": {
         "level": "DEBUG" if settings.debug else "INFO",
-        "handlers": ["console"],
+        "handlers": ["queue"],
     },
     "loggers": {
         # Reduce SQLAlchemy noise in production
         "sqlalchemy.engine": {
             "level": "DEBUG" if settings.debug else "WARNING",
             "propagate": False,
-            "handlers": ["console"],
+            "handlers": ["queue"],
+        },
+        "hrms.access": {
+            # One JSON line per request, from LoggingMiddleware
+            "level": "INFO",
+            "propagate": False,
+            "handlers": ["access_queue"],
+        },
+        "hrms.slow_query": {
+            # Slow statements and their plans, from app.telemetry.slow_queries
+            "level": "INFO",
+            "propagate": False,
+            "handlers": ["access_queue"],
         },
         "uvicorn.access": {
             # Replaced by our own LoggingMiddleware
             "level": "WARNING",
             "propagate": False,
-            "handlers": ["console"],
+            "handlers": ["queue"],
         },
     },
 }
 
+LOG_QUEUE_HANDLERS = ("queue", "access_queue")
+
 
 # ── Lifespan ──────────────────────────────────────────────────────────────────
+async def warm_database_pools() -> None:
+    """Pre-open pooled connections; a cold pool is only slower, so never fatal."""
+    logger = logging.getLogger(__name__)
+    for pool_engine in engines():
+        try:
+            count = await warm_pool(pool_engine, settings.db_pool_warm_connections)
+            logger.info("Opened %d connections to %s", count, pool_engine.url.render_as_string())
+        except Exception:
+            logger.exception("Could not warm connection pool for %s", pool_engine.url.render_as_string())
+
+
+async def warm_caches() -> None:
+    """Preload the employee id cache; a cold cache is only slower, so never fatal."""
+    logger = logging.getLogger(__name__)
+    try:
+        async with AsyncSessionLocal() as session:
+            count = await EmployeeRepository(session).warm_id_cache(settings.employee_id_cache_size)
+        logger.info("Warmed employee id cache with %d entries", count)
+    except Exception:
+        logger.exception("Could not warm employee id cache")
+
+
+async def ensure_attendance_partitions() -> None:
+    """
+    Create this month's and the next months' attendance partitions if missing,
+    so new records never land in the default partition.
+    """
+    logger = logging.getLogger(__name__)
+    this_month = date.today().replace(day=1)
+    last_month = this_month
+    for _ in range(settings.attendance_partition_months_ahead):
+        last_month = (last_month + timedelta(days=32)).replace(day=1)
+    try:
+        async with AsyncSessionLocal() as session:
+            created = await AttendanceRepository(session).ensure_partitions(this_month, last_month)
+            await session.commit()
+        if created:
+            logger.info("Created attendance partitions: %s", ", ".join(created))
+    except Exception:
+        logger.exception("Could not create attendance partitions")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logging.config.dictConfig(LOGGING_CONFIG)
+    log_listeners = [logging.getHandlerByName(name).listener for name in LOG_QUEUE_HANDLERS]
+    for log_listener in log_listeners:
+        log_listener.start()
     logging.getLogger(__name__).info("🚀  %s v%s starting up", settings.app_name, settings.app_version)
+
+    listener = None
+    if settings.cache_invalidation_channel:
+        # Start listening before warming so no invalidation is missed in between
+        listener = CacheInvalidationListener(settings.database_url, settings.cache_invalidation_channel)
+        await listener.start()
+    if settings.db_pool_warm_connections:
+        await warm_database_pools()
+    await ensure_attendance_partitions()
+    await warm_caches()
+    if slow_query_log is not None:
+        await slow_query_log.start()
+    await health_monitor.start()
+
+    metrics_flusher = None
+    if settings.metrics_multiproc_dir:
+        metrics_flusher = asyncio.create_task(run_flusher(settings.metrics_flush_interval_seconds))
+
     yield
+
+    if metrics_flusher is not None:
+        metrics_flusher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await metrics_flusher
+    await health_monitor.stop()
+    if slow_query_log is not None:
+        await slow_query_log.stop()
+    if listener is not None:
+        await listener.stop()
+    # In-flight requests are done by now: close the pooled connections cleanly
+    await dispose_engines()
     logging.getLogger(__name__).info("🛑  %s shutting down", settings.app_name)
+    # Flush whatever is still queued
+    for log_listener in log_listeners:
+        log_listener.stop()
 
 
 # ── Application factory ───────────────────────────────────────────────────────
@@ -76,13 +205,22 @@ def create_application() -> FastAPI:
     )
 
     # Middleware (added in reverse order of execution)
-    application.add_middleware(LoggingMiddleware)
+    application.add_middleware(
+        LoggingMiddleware,
+        sample_rate_2xx=settings.access_log_sample_rate,
+        sql_repeat_threshold=settings.sql_repeat_warning_threshold if settings.debug else None,
+    )
+    application.add_middleware(MetricsMiddleware)
+    if settings.read_database_url and settings.read_your_writes_seconds > 0:
+        application.add_middleware(ReadYourWritesMiddleware, window_seconds=settings.read_your_writes_seconds)
     application.add_middleware(
         CORSMiddleware,
         allow_origins=settings.allowed_origins,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Read by the frontend and echoed back on reads (read-your-writes)
+        expose_headers=[READ_PRIMARY_HEADER],
     )
 
     # Exception handlers
@@ -90,6 +228,7 @@ def create_application() -> FastAPI:
 
     # Routers
     application.include_router(v1_router)
+    application.include_router(metrics_api.router)
 
     # Root endpoint - redirect to docs
     @application.get("/", include_in_schema=False)
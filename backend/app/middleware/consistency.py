@@ -0,0 +1,37 @@
+"""Read-your-writes middleware — pins a client's reads to the primary after it writes."""
+
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database import READ_PRIMARY_HEADER
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware: every successful non-GET response carries
+    ``READ_PRIMARY_HEADER``, valid for *window_seconds*. A client that sends
+    it back on its next reads gets them from the primary (``get_read_db``), so
+    it sees its write even while the replica lags behind.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: float) -> None:
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_header(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message).append(
+                    READ_PRIMARY_HEADER, f"{time.time() + self.window_seconds:.3f}"
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_header)
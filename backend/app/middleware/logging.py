@@ -1,59 +1,142 @@
-"""Async logging middleware — logs every request and its response."""
+"""Access-log middleware — one structured log line per request."""
 
+import json
 import logging
+import random
 import time
 import uuid
+from datetime import datetime, timezone
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.telemetry.context import RequestTelemetry, current_request
+from app.telemetry.sql import warn_repeated_statements
 
 logger = logging.getLogger("hrms.access")
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class JSONFormatter(logging.Formatter):
+    """
+    Render a record as a single JSON object. Fields passed as
+    ``extra={"fields": {...}}`` are merged in at the top level.
     """
-    Logs each HTTP request/response cycle with:
-      - Unique request ID (X-Request-ID header)
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class LoggingMiddleware:
+    """
+    Pure ASGI middleware that logs each HTTP request/response cycle with:
+      - Unique request ID (X-Request-ID header, also ``request.state.request_id``)
       - Method, path, query string
       - Response status code
       - Wall-clock duration in milliseconds
+      - Number of SQL statements and time spent in them, also sent to the
+        client as a ``Server-Timing`` header (queries after the response
+        has started, e.g. while streaming, only reach the log)
+
+    Unlike ``BaseHTTPMiddleware`` it doesn't wrap the response in an extra task
+    and stream, so streaming responses pass straight through. Only a fraction
+    (*sample_rate_2xx*) of successful requests is logged; everything else
+    always is.
+
+    With *sql_repeat_threshold* set, statements executed more than that many
+    times in one request are reported as possible N+1 queries.
     """
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    def __init__(
+        self, app: ASGIApp, sample_rate_2xx: float = 1.0, sql_repeat_threshold: int | None = None
+    ) -> None:
+        self.app = app
+        self.sample_rate_2xx = sample_rate_2xx
+        self.sql_repeat_threshold = sql_repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         request_id = str(uuid.uuid4())
         start = time.perf_counter()
+        status_code = 500  # if the app fails before starting a response
 
         # Attach request ID so downstream code / other middleware can read it
-        request.state.request_id = request_id
-
-        logger.info(
-            "→ [%s] %s %s%s",
-            request_id,
-            request.method,
-            request.url.path,
-            f"?{request.url.query}" if request.url.query else "",
-        )
+        scope.setdefault("state", {})["request_id"] = request_id
+        # ... and to code with no access to the request (engine events)
+        telemetry = RequestTelemetry(request_id)
+        token = current_request.set(telemetry)
 
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Propagate the ID back to the client for correlation
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Request-ID", request_id)
+                headers.append("Server-Timing", telemetry.server_timing())
+            await send(message)
+
+        error = None
         try:
-            response: Response = await call_next(request)
-        except Exception:
-            elapsed = (time.perf_counter() - start) * 1000
-            logger.exception(
-                "← [%s] UNHANDLED EXCEPTION after %.1f ms",
-                request_id,
-                elapsed,
-            )
+            await self.app(scope, receive, send_with_request_id)
+        except Exception as exc:
+            # The traceback is logged by the exception handlers
+            error = exc.__class__.__name__
             raise
+        finally:
+            current_request.reset(token)
+            self._log(scope, telemetry, status_code, start, error)
+            if self.sql_repeat_threshold is not None:
+                warn_repeated_statements(telemetry, self.sql_repeat_threshold)
 
-        elapsed = (time.perf_counter() - start) * 1000
-        logger.info(
-            "← [%s] %s %.1f ms",
-            request_id,
-            response.status_code,
-            elapsed,
-        )
+    def _log(
+        self,
+        scope: Scope,
+        telemetry: RequestTelemetry,
+        status_code: int,
+        start: float,
+        error: str | None,
+    ) -> None:
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        sampled = 200 <= status_code < 300 and self.sample_rate_2xx < 1.0
+        if sampled and random.random() >= self.sample_rate_2xx:
+            return
 
-        # Propagate the ID back to the client for correlation
-        response.headers["X-Request-ID"] = request_id
-        return response
+        fields = {
+            "request_id": telemetry.request_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status_code,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+            "db_queries": telemetry.db_queries,
+            "db_ms": telemetry.db_ms,
+        }
+        if scope.get("query_string"):
+            fields["query"] = scope["query_string"].decode("latin-1")
+        if sampled:
+            # Lets log consumers scale sampled counts back up
+            fields["sample_rate"] = self.sample_rate_2xx
+        if error:
+            fields["error"] = error
+        logger.log(
+            logging.ERROR if error else logging.INFO,
+            "%s %s %s",
+            scope["method"],
+            scope["path"],
+            status_code,
+            extra={"fields": fields},
+        )
@@ -0,0 +1,54 @@
+"""Request metrics middleware — counts and latency per route template."""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.telemetry.metrics import (
+    http_request_duration,
+    http_requests,
+    http_requests_in_progress,
+)
+
+# Label for requests that matched no route, so raw paths never become labels
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware feeding the ``http_*`` metrics. Requests are labelled
+    with the matched route's path template (``/api/v1/employees/{id}``), read
+    from ``scope["route"]`` once routing has happened, and the status class
+    (``2xx``, ``4xx``, ...).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500  # if the app fails before starting a response
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_progress.dec()
+            route = scope.get("route")
+            labels = (
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                f"{status_code // 100}xx",
+            )
+            http_requests.inc(*labels)
+            http_request_duration.observe(time.perf_counter() - start, *labels)
@@ -3,5 +3,15 @@
 from app.models.base import TimestampMixin  # noqa: F401
 from app.models.employee import Employee  # noqa: F401
 from app.models.attendance import Attendance  # noqa: F401
+from app.models.attendance_counter import EmployeeAttendanceCounter  # noqa: F401
+from app.models.attendance_rollup import AttendanceMonthlyRollup  # noqa: F401
+from app.models.table_version import TableVersion  # noqa: F401
 
-__all__ = ["TimestampMixin", "Employee", "Attendance"]
+__all__ = [
+    "TimestampMixin",
+    "Employee",
+    "Attendance",
+    "EmployeeAttendanceCounter",
+    "AttendanceMonthlyRollup",
+    "TableVersion",
+]
@@ -3,7 +3,7 @@
 import enum
 from datetime import date
 
-from sqlalchemy import Date, Enum, ForeignKey, UniqueConstraint
+from sqlalchemy import Date, Enum, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -19,6 +19,11 @@ class Attendance(Base, TimestampMixin):
     __tablename__ = "attendance"
     __table_args__ = (
         UniqueConstraint("employee_id", "date", name="uq_attendance_employee_date"),
+        # Keyset pagination on (date desc, id desc), optionally narrowed by status
+        Index("ix_attendance_date_id", "date", "id"),
+        Index("ix_attendance_status_date_id", "status", "date", "id"),
+        # One partition per calendar month (see AttendanceRepository.ensure_partitions)
+        {"postgresql_partition_by": "RANGE (date)"},
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -27,7 +32,8 @@ class Attendance(Base, TimestampMixin):
         nullable=False,
         index=True,
     )
-    date: Mapped[date] = mapped_column(Date, nullable=False)
+    # Part of the primary key because it is the partition key
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
     status: Mapped[AttendanceStatus] = mapped_column(
         Enum(AttendanceStatus, name="attendance_status"),
         nullable=False,
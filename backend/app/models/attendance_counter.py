@@ -0,0 +1,27 @@
+"""Per-employee attendance counters, maintained by database triggers."""
+
+from sqlalchemy import ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class EmployeeAttendanceCounter(Base):
+    """
+    Running present / absent / total counts per employee.
+
+    Rows are written only by the statement-level triggers on ``attendance``
+    (see the ``add_employee_attendance_counters`` migration), so every write
+    path — single marks, bulk upserts, updates, deletes and cascades — keeps
+    them in sync inside the same transaction.
+    """
+
+    __tablename__ = "employee_attendance_counters"
+
+    employee_id: Mapped[int] = mapped_column(
+        ForeignKey("employees.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    present_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    absent_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    total_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
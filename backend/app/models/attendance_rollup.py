@@ -0,0 +1,32 @@
+"""Monthly per-employee attendance rollup, maintained by database triggers."""
+
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class AttendanceMonthlyRollup(Base):
+    """
+    Present / absent counts per employee per calendar month.
+
+    Like :class:`EmployeeAttendanceCounter`, rows are written only by
+    statement-level triggers on ``attendance`` (see the
+    ``add_attendance_monthly_rollup`` migration).
+    """
+
+    __tablename__ = "attendance_monthly_rollup"
+    __table_args__ = (
+        # Month-range scans for date-ranged and monthly summaries
+        Index("ix_attendance_monthly_rollup_month", "month", "employee_id"),
+    )
+
+    employee_id: Mapped[int] = mapped_column(
+        ForeignKey("employees.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    month: Mapped[date] = mapped_column(Date, primary_key=True)  # first day of the month
+    present_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    absent_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
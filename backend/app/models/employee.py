@@ -1,11 +1,14 @@
 """Employee SQLAlchemy model."""
 
-from sqlalchemy import String
+from sqlalchemy import Sequence, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
 from app.models.base import TimestampMixin
 
+# Numeric part of auto-generated employee IDs (EMP-0001, EMP-0002, ...)
+employee_code_seq = Sequence("employee_code_seq", metadata=Base.metadata)
+
 
 class Employee(Base, TimestampMixin):
     __tablename__ = "employees"
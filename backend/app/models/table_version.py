@@ -0,0 +1,29 @@
+"""Per-table write versions, bumped by database triggers."""
+
+from sqlalchemy import BigInteger, SmallInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+# Rows per table; must match the ``stripe_table_versions`` migration
+TABLE_VERSION_STRIPES = 16
+
+
+class TableVersion(Base):
+    """
+    A counter per table that every INSERT / UPDATE / DELETE statement that
+    changes rows, and every TRUNCATE, increments (see the ``add_table_versions``
+    and ``stripe_table_versions`` migrations).
+
+    The counter is striped over ``TABLE_VERSION_STRIPES`` rows, picked by
+    transaction id, so concurrent writers don't queue on one row lock; the
+    table's version is the sum of its stripes. The bump is part of the writing
+    transaction, so readers only see a new version together with the data that
+    caused it. Used to compute ETags without reading the rows themselves.
+    """
+
+    __tablename__ = "table_versions"
+
+    table_name: Mapped[str] = mapped_column(String(63), primary_key=True)
+    stripe: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
@@ -1,35 +1,180 @@
 """Attendance repository — all direct DB interactions live here."""
 
-from datetime import date
-from typing import Sequence
+import re
+from datetime import date, timedelta
+from typing import AsyncIterator, Sequence
 
-from sqlalchemy import select, func, case
+from sqlalchemy import (
+    Date,
+    Row,
+    and_,
+    cast,
+    column,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    literal_column,
+    null,
+    select,
+    table,
+    text,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
 from app.models.attendance import Attendance, AttendanceStatus
+from app.models.attendance_counter import EmployeeAttendanceCounter
+from app.models.attendance_rollup import AttendanceMonthlyRollup
 from app.models.employee import Employee
 
 
+# Columns of AttendanceResponse, in order, for the list endpoints' row projections
+_ROW_COLUMNS = (
+    Attendance.id,
+    Attendance.employee_id,
+    Attendance.date,
+    Attendance.status,
+    Attendance.created_at,
+    Attendance.updated_at,
+)
+
+
+# ``attendance`` is range-partitioned by month: attendance_yYYYYmMM holds
+# [first of month, first of next month); anything else goes to the default
+DEFAULT_PARTITION = "attendance_default"
+_PARTITION_NAME = re.compile(r"^attendance_y(\d{4})m(\d{2})$")
+
+
+def _next_month(day: date) -> date:
+    """First day of the month after *day*'s month."""
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def partition_name(month: date) -> str:
+    return f"attendance_y{month:%Y}m{month:%m}"
+
+
+def partition_month(name: str) -> date | None:
+    """First day of the month a partition holds; ``None`` for the default partition."""
+    match = _PARTITION_NAME.match(name)
+    return date(int(match[1]), int(match[2]), 1) if match else None
+
+
+def _split_on_months(
+    start_date: date | None, end_date: date | None
+) -> tuple[date | None, date | None, list[tuple[date, date]]]:
+    """
+    Split an inclusive (possibly open-ended) date range into the whole months
+    it covers — ``[first_month, end_month)`` by first-of-month, either side
+    ``None`` when open — and the inclusive ``(start, end)`` day ranges of the
+    partial months at its edges.
+    """
+    first_month = None
+    if start_date is not None:
+        first_month = start_date if start_date.day == 1 else _next_month(start_date)
+    end_month = None
+    if end_date is not None:
+        is_month_end = _next_month(end_date) - timedelta(days=1) == end_date
+        end_month = _next_month(end_date) if is_month_end else end_date.replace(day=1)
+
+    edges: list[tuple[date, date]] = []
+    if start_date is not None and start_date.day != 1:
+        head_end = _next_month(start_date) - timedelta(days=1)
+        edges.append((start_date, min(head_end, end_date) if end_date else head_end))
+    if end_date is not None and end_month == end_date.replace(day=1):
+        tail_start = end_date.replace(day=1)
+        if not edges or tail_start > edges[0][1]:
+            edges.append((tail_start, end_date))
+    return first_month, end_month, edges
+
+
 class AttendanceRepository:
     def __init__(self, db: AsyncSession) -> None:
         self._db = db
 
-    async def mark_attendance(self, attendance: Attendance) -> Attendance:
-        self._db.add(attendance)
-        await self._db.flush()
-        await self._db.refresh(attendance)
-        return attendance
+    async def mark_attendance(
+        self, employee_code: str, attendance_date: date, status: AttendanceStatus
+    ) -> Attendance | None:
+        """
+        Insert attendance for the employee with ``employee_id == employee_code``
+        in one statement::
 
-    async def get_attendance_by_employee(
-        self, employee_id: int
-    ) -> Sequence[Attendance]:
+            INSERT INTO attendance (...) SELECT id, :date, :status FROM employees
+            WHERE employee_id = :code ON CONFLICT DO NOTHING RETURNING *
+
+        Returns ``None`` when nothing was inserted, i.e. the employee does not
+        exist or attendance for that date is already recorded. Safe under
+        concurrency: a racing duplicate is skipped rather than raising.
+        """
+        status_type = Attendance.__table__.c.status.type
+        stmt = (
+            pg_insert(Attendance)
+            .from_select(
+                ["employee_id", "date", "status"],
+                # Explicit casts: bare parameters in a SELECT list are typed text
+                select(
+                    Employee.id,
+                    cast(literal(attendance_date, Date), Date),
+                    cast(literal(status, status_type), status_type),
+                ).where(Employee.employee_id == employee_code),
+            )
+            .on_conflict_do_nothing(constraint="uq_attendance_employee_date")
+            .returning(Attendance)
+        )
         result = await self._db.execute(
             select(Attendance)
+            .from_statement(stmt)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def bulk_upsert(
+        self, rows: Sequence[dict], update_existing: bool = False
+    ) -> Sequence[Row]:
+        """
+        Write many ``{employee_id, date, status}`` rows with a single multi-row
+        ``INSERT ... ON CONFLICT (employee_id, date) DO NOTHING | DO UPDATE``.
+
+        Returns ``(id, employee_id, date, inserted)`` for every row written;
+        ``inserted`` is false for rows that overwrote an existing record. Rows
+        skipped because of a conflict are not returned. *rows* must not contain
+        the same (employee_id, date) twice.
+        """
+        stmt = pg_insert(Attendance).values(list(rows))
+        if update_existing:
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_attendance_employee_date",
+                set_={"status": stmt.excluded.status, "updated_at": func.now()},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(constraint="uq_attendance_employee_date")
+        stmt = stmt.returning(
+            Attendance.id,
+            Attendance.employee_id,
+            Attendance.date,
+            # xmax is 0 for freshly inserted tuples, non-zero for updated ones
+            literal_column("xmax = 0").label("inserted"),
+        )
+        result = await self._db.execute(stmt)
+        return result.all()
+
+    async def get_attendance_by_employee(self, employee_id: int) -> list[dict]:
+        """An employee's records, newest first, as row dicts like ``AttendanceResponse``."""
+        result = await self._db.execute(
+            select(
+                *_ROW_COLUMNS,
+                null().label("employee_name"),
+                null().label("employee_code"),
+            )
             .where(Attendance.employee_id == employee_id)
             .order_by(Attendance.date.desc())
         )
-        return result.scalars().all()
+        return [row._asdict() for row in result]
 
     async def check_existing_attendance(
         self, employee_id: int, attendance_date: date
@@ -42,18 +187,88 @@ class AttendanceRepository:
         )
         return result.scalar_one_or_none()
 
-    async def get_all_attendance(self, start_date: str | None = None, end_date: str | None = None) -> Sequence[Attendance]:
-        query = select(Attendance).options(joinedload(Attendance.employee))
-        
-        # Apply date filters if provided
+    async def get_all_attendance(
+        self,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        employee_code: str | None = None,
+        department: str | None = None,
+        status: AttendanceStatus | None = None,
+        limit: int | None = None,
+        after: tuple[date, int] | None = None,
+    ) -> list[dict]:
+        """
+        Return attendance records with their employee's name and code, as row
+        dicts shaped like ``AttendanceResponse``, ordered by ``(date desc, id desc)``.
+
+        *after* is the ``(date, id)`` of the last row of the previous page; rows
+        strictly before it in that order are returned, at most *limit* of them.
+        The ordering matches ``ix_attendance_date_id`` (or
+        ``ix_attendance_status_date_id`` when filtering by status), so each page
+        is a backward index range scan.
+        """
+        query = select(
+            *_ROW_COLUMNS,
+            Employee.full_name.label("employee_name"),
+            Employee.employee_id.label("employee_code"),
+        ).join(Employee, Employee.id == Attendance.employee_id)
+
         if start_date:
             query = query.where(Attendance.date >= start_date)
         if end_date:
             query = query.where(Attendance.date <= end_date)
-        
-        query = query.order_by(Attendance.date.desc())
+        if employee_code:
+            query = query.where(Employee.employee_id == employee_code)
+        if department:
+            query = query.where(Employee.department == department)
+        if status:
+            query = query.where(Attendance.status == status)
+        if after is not None:
+            query = query.where(
+                tuple_(Attendance.date, Attendance.id) < after,
+                # Implied by the row comparison, but only this form prunes partitions
+                Attendance.date <= after[0],
+            )
+
+        query = query.order_by(Attendance.date.desc(), Attendance.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
         result = await self._db.execute(query)
-        return result.unique().scalars().all()
+        return [row._asdict() for row in result]
+
+    async def stream_attendance(
+        self,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        yield_per: int = 1000,
+    ) -> AsyncIterator[Row]:
+        """
+        Stream attendance rows joined with their employee, oldest first.
+
+        Uses a server-side cursor (``AsyncSession.stream`` + ``yield_per``) so
+        only *yield_per* rows are buffered at a time, whatever the date range.
+        """
+        query = (
+            select(
+                Attendance.id,
+                Employee.employee_id.label("employee_code"),
+                Employee.full_name.label("employee_name"),
+                Employee.department,
+                Attendance.date,
+                Attendance.status,
+            )
+            .join(Employee, Employee.id == Attendance.employee_id)
+            .order_by(Attendance.date, Attendance.id)
+            .execution_options(yield_per=yield_per)
+        )
+        if start_date:
+            query = query.where(Attendance.date >= start_date)
+        if end_date:
+            query = query.where(Attendance.date <= end_date)
+
+        result = await self._db.stream(query)
+        async for row in result:
+            yield row
 
     async def get_by_id(self, id: int) -> Attendance | None:
         result = await self._db.execute(
@@ -61,54 +276,415 @@ class AttendanceRepository:
         )
         return result.scalar_one_or_none()
 
-    async def update(self, attendance: Attendance) -> Attendance:
-        await self._db.flush()
-        await self._db.refresh(attendance)
-        return attendance
+    async def update_by_id(self, id: int, values: dict) -> Attendance | None:
+        """
+        ``UPDATE attendance SET ... WHERE id = :id RETURNING *`` — one round
+        trip. Returns ``None`` when no record has that id; moving a record onto
+        a date the employee already has raises ``IntegrityError``.
+        """
+        stmt = update(Attendance).where(Attendance.id == id).values(**values).returning(Attendance)
+        result = await self._db.execute(
+            select(Attendance).from_statement(stmt).execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
 
     async def delete_by_id(self, id: int) -> bool:
-        from sqlalchemy import delete as sql_delete
         result = await self._db.execute(
-            sql_delete(Attendance).where(Attendance.id == id)
+            delete(Attendance).where(Attendance.id == id)
         )
         return result.rowcount > 0
 
     async def get_attendance_summary(self):
-        """Get attendance summary for all employees using a single optimized query."""
+        """
+        Get attendance summary for all employees from the trigger-maintained
+        counters: one pass over employees plus a primary-key join, whatever
+        the size of the attendance history.
+        """
         from app.schemas.attendance import EmployeeAttendanceSummary
-        
-        # Single query with aggregation - much faster than N+1 queries
+
         query = (
             select(
                 Employee.employee_id,
                 Employee.full_name,
-                func.count(Attendance.id).label('total_days'),
-                func.sum(
-                    case((Attendance.status == AttendanceStatus.PRESENT, 1), else_=0)
-                ).label('total_present'),
-                func.sum(
-                    case((Attendance.status == AttendanceStatus.ABSENT, 1), else_=0)
-                ).label('total_absent'),
+                EmployeeAttendanceCounter.total_count,
+                EmployeeAttendanceCounter.present_count,
+                EmployeeAttendanceCounter.absent_count,
+            )
+            .select_from(Employee)
+            .outerjoin(
+                EmployeeAttendanceCounter,
+                EmployeeAttendanceCounter.employee_id == Employee.id,
+            )
+            .order_by(Employee.employee_id)
+        )
+
+        result = await self._db.execute(query)
+        return [
+            EmployeeAttendanceSummary(
+                employee_id=row.employee_id,
+                employee_name=row.full_name,
+                total_days=row.total_count or 0,
+                total_present_days=row.present_count or 0,
+                total_absent_days=row.absent_count or 0,
+            )
+            for row in result
+        ]
+
+    async def get_attendance_summary_between(
+        self, start_date: date | None, end_date: date | None
+    ):
+        """
+        Attendance summary for all employees over an inclusive date range.
+
+        Whole calendar months inside the range are read from the monthly
+        rollup; only the partial months at either edge touch the raw
+        attendance table. Either bound may be open.
+        """
+        from app.schemas.attendance import EmployeeAttendanceSummary
+
+        first_month, end_month, edges = _split_on_months(start_date, end_date)
+
+        parts = []
+        if first_month is None or end_month is None or first_month < end_month:
+            rollup = select(
+                AttendanceMonthlyRollup.employee_id,
+                AttendanceMonthlyRollup.present_count.label("present"),
+                AttendanceMonthlyRollup.absent_count.label("absent"),
+            )
+            if first_month is not None:
+                rollup = rollup.where(AttendanceMonthlyRollup.month >= first_month)
+            if end_month is not None:
+                rollup = rollup.where(AttendanceMonthlyRollup.month < end_month)
+            parts.append(rollup)
+
+        # Partial edge months come from the raw table
+        for edge_start, edge_end in edges:
+            parts.append(
+                select(
+                    Attendance.employee_id,
+                    func.count().filter(Attendance.status == AttendanceStatus.PRESENT).label("present"),
+                    func.count().filter(Attendance.status == AttendanceStatus.ABSENT).label("absent"),
+                )
+                .where(Attendance.date >= edge_start, Attendance.date <= edge_end)
+                .group_by(Attendance.employee_id)
+            )
+
+        combined = (union_all(*parts) if len(parts) > 1 else parts[0]).subquery("combined")
+        totals = (
+            select(
+                combined.c.employee_id,
+                func.sum(combined.c.present).label("present"),
+                func.sum(combined.c.absent).label("absent"),
             )
+            .group_by(combined.c.employee_id)
+            .subquery("totals")
+        )
+        query = (
+            select(Employee.employee_id, Employee.full_name, totals.c.present, totals.c.absent)
             .select_from(Employee)
-            .outerjoin(Attendance, Employee.id == Attendance.employee_id)
-            .group_by(Employee.id, Employee.employee_id, Employee.full_name)
+            .outerjoin(totals, totals.c.employee_id == Employee.id)
             .order_by(Employee.employee_id)
         )
-        
+
         result = await self._db.execute(query)
-        rows = result.all()
-        
         summaries = []
-        for row in rows:
+        for row in result:
+            present = int(row.present or 0)
+            absent = int(row.absent or 0)
             summaries.append(
                 EmployeeAttendanceSummary(
                     employee_id=row.employee_id,
                     employee_name=row.full_name,
-                    total_days=row.total_days or 0,
-                    total_present_days=row.total_present or 0,
-                    total_absent_days=row.total_absent or 0,
+                    total_days=present + absent,
+                    total_present_days=present,
+                    total_absent_days=absent,
                 )
             )
-        
         return summaries
+
+    async def get_monthly_summary(self, month: date):
+        """Attendance summary for all employees for one month, from the rollup."""
+        from app.schemas.attendance import EmployeeMonthlyAttendanceSummary
+
+        query = (
+            select(
+                Employee.employee_id,
+                Employee.full_name,
+                AttendanceMonthlyRollup.present_count,
+                AttendanceMonthlyRollup.absent_count,
+            )
+            .select_from(Employee)
+            .outerjoin(
+                AttendanceMonthlyRollup,
+                and_(
+                    AttendanceMonthlyRollup.employee_id == Employee.id,
+                    AttendanceMonthlyRollup.month == month,
+                ),
+            )
+            .order_by(Employee.employee_id)
+        )
+
+        result = await self._db.execute(query)
+        label = month.strftime("%Y-%m")
+        summaries = []
+        for row in result:
+            present = row.present_count or 0
+            absent = row.absent_count or 0
+            summaries.append(
+                EmployeeMonthlyAttendanceSummary(
+                    employee_id=row.employee_id,
+                    employee_name=row.full_name,
+                    month=label,
+                    total_days=present + absent,
+                    total_present_days=present,
+                    total_absent_days=absent,
+                )
+            )
+        return summaries
+
+    # ── Counter maintenance ──────────────────────────────────────────────────
+
+    @staticmethod
+    def _counts_from_history():
+        """Per-employee counts aggregated from the raw attendance table."""
+        return (
+            select(
+                Attendance.employee_id,
+                func.count().filter(Attendance.status == AttendanceStatus.PRESENT).label("present_count"),
+                func.count().filter(Attendance.status == AttendanceStatus.ABSENT).label("absent_count"),
+                func.count().label("total_count"),
+            )
+            .group_by(Attendance.employee_id)
+        )
+
+    async def find_counter_drift(self) -> Sequence[Row]:
+        """
+        Compare the counters with a full aggregation of the attendance table and
+        return ``(employee_id, stored_*, actual_*)`` for every mismatch.
+        """
+        actual = self._counts_from_history().subquery("actual")
+        stored = EmployeeAttendanceCounter.__table__
+        query = (
+            select(
+                func.coalesce(stored.c.employee_id, actual.c.employee_id).label("employee_id"),
+                stored.c.present_count.label("stored_present"),
+                stored.c.absent_count.label("stored_absent"),
+                stored.c.total_count.label("stored_total"),
+                actual.c.present_count.label("actual_present"),
+                actual.c.absent_count.label("actual_absent"),
+                actual.c.total_count.label("actual_total"),
+            )
+            .select_from(
+                stored.join(actual, stored.c.employee_id == actual.c.employee_id, full=True)
+            )
+            .where(
+                tuple_(
+                    func.coalesce(stored.c.present_count, 0),
+                    func.coalesce(stored.c.absent_count, 0),
+                    func.coalesce(stored.c.total_count, 0),
+                )
+                != tuple_(
+                    func.coalesce(actual.c.present_count, 0),
+                    func.coalesce(actual.c.absent_count, 0),
+                    func.coalesce(actual.c.total_count, 0),
+                )
+            )
+            .order_by("employee_id")
+        )
+        result = await self._db.execute(query)
+        return result.all()
+
+    @staticmethod
+    def _monthly_counts_from_history():
+        """Per-employee, per-month counts aggregated from the raw attendance table."""
+        # Literal unit keeps the SELECT and GROUP BY expressions identical
+        month = func.date_trunc(literal_column("'month'"), Attendance.date).cast(Date)
+        return (
+            select(
+                Attendance.employee_id,
+                month.label("month"),
+                func.count().filter(Attendance.status == AttendanceStatus.PRESENT).label("present_count"),
+                func.count().filter(Attendance.status == AttendanceStatus.ABSENT).label("absent_count"),
+            )
+            .group_by(Attendance.employee_id, month)
+        )
+
+    async def find_rollup_drift(self) -> Sequence[Row]:
+        """Like :meth:`find_counter_drift`, for the monthly rollup."""
+        actual = self._monthly_counts_from_history().subquery("actual")
+        stored = AttendanceMonthlyRollup.__table__
+        query = (
+            select(
+                func.coalesce(stored.c.employee_id, actual.c.employee_id).label("employee_id"),
+                func.coalesce(stored.c.month, actual.c.month).label("month"),
+                stored.c.present_count.label("stored_present"),
+                stored.c.absent_count.label("stored_absent"),
+                actual.c.present_count.label("actual_present"),
+                actual.c.absent_count.label("actual_absent"),
+            )
+            .select_from(
+                stored.join(
+                    actual,
+                    and_(
+                        stored.c.employee_id == actual.c.employee_id,
+                        stored.c.month == actual.c.month,
+                    ),
+                    full=True,
+                )
+            )
+            .where(
+                tuple_(
+                    func.coalesce(stored.c.present_count, 0),
+                    func.coalesce(stored.c.absent_count, 0),
+                )
+                != tuple_(
+                    func.coalesce(actual.c.present_count, 0),
+                    func.coalesce(actual.c.absent_count, 0),
+                )
+            )
+            .order_by("employee_id", "month")
+        )
+        result = await self._db.execute(query)
+        return result.all()
+
+    async def rebuild_counters(self) -> int:
+        """
+        Recompute every counter and monthly rollup row from the attendance
+        table. Attendance writes are blocked (SHARE lock) until the surrounding
+        transaction ends, so the rebuild cannot miss a concurrent write.
+        Returns the number of employees with counters.
+        """
+        await self._db.execute(text("LOCK TABLE attendance IN SHARE MODE"))
+        await self._db.execute(delete(EmployeeAttendanceCounter))
+        result = await self._db.execute(
+            insert(EmployeeAttendanceCounter).from_select(
+                ["employee_id", "present_count", "absent_count", "total_count"],
+                self._counts_from_history(),
+            )
+        )
+        await self._db.execute(delete(AttendanceMonthlyRollup))
+        await self._db.execute(
+            insert(AttendanceMonthlyRollup).from_select(
+                ["employee_id", "month", "present_count", "absent_count"],
+                self._monthly_counts_from_history(),
+            )
+        )
+        return result.rowcount
+
+    # ── Partition maintenance ────────────────────────────────────────────────
+
+    async def _lock_partition_maintenance(self) -> None:
+        """Serialize partition DDL between workers / CLI runs (until commit)."""
+        await self._db.execute(text("SELECT pg_advisory_xact_lock(hashtext('attendance_partitions'))"))
+
+    async def list_partitions(self) -> Sequence[Row]:
+        """``(name, estimated_rows)`` for every partition of ``attendance``, oldest first."""
+        result = await self._db.execute(
+            text(
+                """
+                SELECT c.relname AS name, greatest(c.reltuples, 0)::bigint AS estimated_rows
+                FROM pg_inherits AS i
+                JOIN pg_class AS c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'attendance'::regclass
+                ORDER BY c.relname
+                """
+            )
+        )
+        return result.all()
+
+    async def ensure_partitions(self, first_month: date, last_month: date) -> list[str]:
+        """
+        Create the monthly partitions from *first_month* through *last_month*
+        that don't exist yet and return their names. Rows already sitting in
+        the default partition for such a month are moved into it; they were
+        counted when inserted, so counters and rollups are unaffected.
+        """
+        await self._lock_partition_maintenance()
+        existing = {row.name for row in await self.list_partitions()}
+        default = table(DEFAULT_PARTITION, column("date", Date))
+        created = []
+        month = first_month.replace(day=1)
+        while month <= last_month:
+            name = partition_name(month)
+            start, end = month, _next_month(month)
+            month = end
+            if name in existing:
+                continue
+
+            bounds = f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            stranded = await self._db.scalar(
+                select(exists().where(default.c.date >= start, default.c.date < end))
+            )
+            if not stranded:
+                await self._db.execute(text(f"CREATE TABLE {name} PARTITION OF attendance FOR VALUES {bounds}"))
+            else:
+                # Writes would keep routing to the default partition meanwhile
+                await self._db.execute(text(f"LOCK TABLE {DEFAULT_PARTITION} IN EXCLUSIVE MODE"))
+                await self._db.execute(text(f"CREATE TABLE {name} (LIKE attendance INCLUDING DEFAULTS)"))
+                await self._db.execute(
+                    text(
+                        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                        "WHERE date >= :start AND date < :end RETURNING *) "
+                        f"INSERT INTO {name} SELECT * FROM moved"
+                    ),
+                    {"start": start, "end": end},
+                )
+                await self._db.execute(text(f"ALTER TABLE attendance ATTACH PARTITION {name} FOR VALUES {bounds}"))
+            created.append(name)
+        return created
+
+    async def detach_partitions_before(self, month: date, drop: bool = False) -> list[str]:
+        """
+        Detach (and with *drop*, drop) every monthly partition older than
+        *month* — the retention path, instead of a mass ``DELETE``. Per-employee
+        counters are decreased by the partition's rows and its month's rollup
+        rows are removed, in the same transaction. Rows of those months still
+        in the default partition are first moved into partitions of their own,
+        so they are removed too. Returns the partition names.
+        """
+        await self._lock_partition_maintenance()
+        default = table(DEFAULT_PARTITION, column("date", Date))
+        stranded_month = func.date_trunc("month", default.c.date).cast(Date)
+        stranded_months = await self._db.scalars(
+            select(stranded_month.distinct()).where(default.c.date < month.replace(day=1))
+        )
+        for stranded in stranded_months.all():
+            await self.ensure_partitions(stranded, stranded)
+
+        counters = EmployeeAttendanceCounter.__table__
+        removed_names = []
+        for row in await self.list_partitions():
+            partition_start = partition_month(row.name)
+            if partition_start is None or partition_start >= month.replace(day=1):
+                continue
+
+            # No writes to the partition between counting and detaching it
+            await self._db.execute(text(f"LOCK TABLE {row.name} IN SHARE MODE"))
+            status_type = Attendance.__table__.c.status.type
+            partition = table(row.name, column("employee_id"), column("status", status_type))
+            removed = (
+                select(
+                    partition.c.employee_id,
+                    func.count().filter(partition.c.status == AttendanceStatus.PRESENT).label("present"),
+                    func.count().filter(partition.c.status == AttendanceStatus.ABSENT).label("absent"),
+                )
+                .group_by(partition.c.employee_id)
+                .subquery("removed")
+            )
+            await self._db.execute(
+                update(counters)
+                .where(counters.c.employee_id == removed.c.employee_id)
+                .values(
+                    present_count=counters.c.present_count - removed.c.present,
+                    absent_count=counters.c.absent_count - removed.c.absent,
+                    total_count=counters.c.total_count - removed.c.present - removed.c.absent,
+                )
+            )
+            await self._db.execute(
+                delete(AttendanceMonthlyRollup).where(AttendanceMonthlyRollup.month == partition_start)
+            )
+            await self._db.execute(text(f"ALTER TABLE attendance DETACH PARTITION {row.name}"))
+            if drop:
+                await self._db.execute(text(f"DROP TABLE {row.name}"))
+            removed_names.append(row.name)
+        return removed_names
@@ -0,0 +1,40 @@
+"""Dashboard repository — aggregate queries for the dashboard."""
+
+from datetime import date
+
+from sqlalchemy import Row, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.attendance_counter import EmployeeAttendanceCounter
+from app.models.employee import Employee
+
+
+class DashboardRepository:
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+
+    async def get_stats(self, today: date) -> Row:
+        """
+        Compute every dashboard figure in a single statement. Only today's
+        attendance rows are scanned; the all-time total comes from the
+        per-employee counters.
+        """
+        query = (
+            select(
+                select(func.count()).select_from(Employee).scalar_subquery().label("total_employees"),
+                func.count()
+                .filter(Attendance.status == AttendanceStatus.PRESENT)
+                .label("present_today"),
+                func.count()
+                .filter(Attendance.status == AttendanceStatus.ABSENT)
+                .label("absent_today"),
+                select(func.coalesce(func.sum(EmployeeAttendanceCounter.total_count), 0))
+                .scalar_subquery()
+                .label("total_attendance_records"),
+            )
+            .select_from(Attendance)
+            .where(Attendance.date == today)
+        )
+        result = await self._db.execute(query)
+        return result.one()
@@ -2,25 +2,162 @@
 
 from typing import Sequence
 
-from sqlalchemy import delete, select
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    Row,
+    String,
+    Table,
+    Text,
+    case,
+    cast,
+    delete,
+    exists,
+    func,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateTable
 
-from app.models.employee import Employee
+from app.cache import LRUCache
+from app.config import get_settings
+from app.database import is_primary_session
+from app.models.employee import Employee, employee_code_seq
+
+settings = get_settings()
+
+# Employee codes never change, so code → id mappings only go stale when an
+# employee is deleted (see EmployeeService._invalidate_caches). Only filled from
+# the primary: a lagging replica could still return a deleted employee.
+employee_pk_cache = LRUCache("employee_pk", maxsize=settings.employee_id_cache_size)
+
+# Columns of EmployeeResponse, in order, for the list endpoints' row projections
+_ROW_COLUMNS = (
+    Employee.id,
+    Employee.employee_id,
+    Employee.full_name,
+    Employee.email,
+    Employee.department,
+    Employee.created_at,
+    Employee.updated_at,
+)
+
+# Transaction-scoped staging table for bulk imports (kept out of Base.metadata
+# so Alembic never sees it).
+import_staging = Table(
+    "employee_import_staging",
+    MetaData(),
+    Column("line", Integer, nullable=False),
+    Column("employee_id", String(50), nullable=False),
+    Column("full_name", String(255), nullable=False),
+    Column("email", String(255), nullable=False),
+    Column("department", String(100), nullable=False),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
 
 
 class EmployeeRepository:
     def __init__(self, db: AsyncSession) -> None:
         self._db = db
 
-    async def create(self, employee: Employee) -> Employee:
-        self._db.add(employee)
-        await self._db.flush()        # Populate generated fields (id, timestamps)
-        await self._db.refresh(employee)
-        return employee
+    async def create(self, values: dict) -> Employee | None:
+        """
+        Insert an employee in one round trip::
+
+            INSERT INTO employees (...) VALUES (...)
+            ON CONFLICT (employee_id) DO NOTHING RETURNING *
+
+        Returns ``None`` when the employee_id is already taken; any other
+        unique violation (e.g. the email) raises ``IntegrityError``.
+        """
+        stmt = (
+            pg_insert(Employee)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[Employee.employee_id])
+            .returning(Employee)
+        )
+        result = await self._db.execute(
+            select(Employee).from_statement(stmt).execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def create_with_next_code(self, values: dict, prefix: str) -> Employee | None:
+        """
+        Like :meth:`create`, with the employee_id built from the next
+        ``employee_code_seq`` value inside the same statement::
+
+            INSERT INTO employees (..., employee_id)
+            SELECT ..., :prefix || lpad(n::text, greatest(4, length(n::text)), '0')
+            FROM (SELECT nextval('employee_code_seq') AS n) AS allocated
+            ON CONFLICT (employee_id) DO NOTHING RETURNING *
 
-    async def get_all(self) -> Sequence[Employee]:
-        result = await self._db.execute(select(Employee).order_by(Employee.id))
-        return result.scalars().all()
+        Returns ``None`` when that code was already taken (supplied manually).
+        """
+        allocated = select(employee_code_seq.next_value().label("n")).subquery("allocated")
+        digits = cast(allocated.c.n, Text)
+        code = literal(prefix) + func.lpad(digits, func.greatest(4, func.length(digits)), "0")
+        columns = Employee.__table__.c
+        stmt = (
+            pg_insert(Employee)
+            .from_select(
+                [*values, "employee_id"],
+                select(
+                    *(literal(value, columns[name].type) for name, value in values.items()),
+                    code,
+                ).select_from(allocated),
+            )
+            .on_conflict_do_nothing(index_elements=[Employee.employee_id])
+            .returning(Employee)
+        )
+        result = await self._db.execute(
+            select(Employee).from_statement(stmt).execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def allocate_employee_numbers(self, count: int = 1) -> list[int]:
+        """
+        Reserve *count* numbers from ``employee_code_seq`` in one round trip.
+
+        Sequence values are never handed out twice, so concurrent callers cannot
+        collide; numbers reserved by a rolled-back transaction are simply skipped.
+        """
+        result = await self._db.execute(
+            select(employee_code_seq.next_value()).select_from(
+                func.generate_series(1, count)
+            )
+        )
+        return list(result.scalars().all())
+
+    async def get_all(self) -> list[dict]:
+        """Every employee as a plain row dict shaped like ``EmployeeResponse``."""
+        result = await self._db.execute(select(*_ROW_COLUMNS).order_by(Employee.id))
+        return [row._asdict() for row in result]
+
+    async def get_page(
+        self,
+        limit: int,
+        sort: str = "id",
+        after: object | None = None,
+    ) -> list[dict]:
+        """
+        Return up to *limit* employees (as row dicts, like :meth:`get_all`)
+        ordered by *sort* ("id" or "employee_id"), starting strictly after the
+        sort value *after*.
+
+        Both sort columns are unique and indexed, so every page is a single
+        ``WHERE key > :after ORDER BY key LIMIT :n`` index range scan.
+        """
+        column = Employee.employee_id if sort == "employee_id" else Employee.id
+        query = select(*_ROW_COLUMNS)
+        if after is not None:
+            query = query.where(column > after)
+        result = await self._db.execute(query.order_by(column).limit(limit))
+        return [row._asdict() for row in result]
 
     async def get_by_employee_id(self, employee_id: str) -> Employee | None:
         result = await self._db.execute(
@@ -28,19 +165,147 @@ class EmployeeRepository:
         )
         return result.scalar_one_or_none()
 
+    async def resolve_id(self, employee_id: str) -> int | None:
+        """Resolve an employee_id string to the internal id, cache first."""
+        return (await self.get_ids_by_employee_ids([employee_id])).get(employee_id)
+
+    async def get_ids_by_employee_ids(self, employee_ids: Sequence[str]) -> dict[str, int]:
+        """
+        Resolve many employee_id strings to internal ids. Codes missing from
+        :data:`employee_pk_cache` are fetched with one IN query and cached
+        (unless read from a replica); unknown codes are simply absent from
+        the result.
+        """
+        ids: dict[str, int] = {}
+        missing: list[str] = []
+        for employee_id in employee_ids:
+            pk = employee_pk_cache.get(employee_id)
+            if pk is None:
+                missing.append(employee_id)
+            else:
+                ids[employee_id] = pk
+        if not missing:
+            return ids
+
+        # A delete committing during the query invalidates the cache: don't
+        # store what the query saw before it
+        generation = employee_pk_cache.generation
+        result = await self._db.execute(
+            select(Employee.employee_id, Employee.id).where(
+                Employee.employee_id.in_(missing)
+            )
+        )
+        cacheable = is_primary_session(self._db)
+        for row in result:
+            if cacheable:
+                employee_pk_cache.put(row.employee_id, row.id, generation)
+            ids[row.employee_id] = row.id
+        return ids
+
+    async def warm_id_cache(self, limit: int) -> int:
+        """Load up to *limit* of the newest code → id mappings into the cache."""
+        if limit <= 0:
+            return 0
+        result = await self._db.execute(
+            select(Employee.employee_id, Employee.id).order_by(Employee.id.desc()).limit(limit)
+        )
+        rows = result.all()
+        # Oldest first, so the newest employees end up most recently used
+        for row in reversed(rows):
+            employee_pk_cache.put(row.employee_id, row.id)
+        return len(rows)
+
     async def get_by_id(self, id: int) -> Employee | None:
         result = await self._db.execute(
             select(Employee).where(Employee.id == id)
         )
         return result.scalar_one_or_none()
 
-    async def delete_by_id(self, id: int) -> bool:
+    async def delete_by_id(self, id: int) -> str | None:
+        """Delete an employee, returning its employee_id (``None`` if absent)."""
+        result = await self._db.execute(
+            delete(Employee).where(Employee.id == id).returning(Employee.employee_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def update_by_id(self, id: int, values: dict) -> Employee | None:
+        """
+        ``UPDATE employees SET ... WHERE id = :id RETURNING *`` — one round trip.
+        Returns ``None`` when no employee has that id.
+        """
+        stmt = update(Employee).where(Employee.id == id).values(**values).returning(Employee)
         result = await self._db.execute(
-            delete(Employee).where(Employee.id == id)
+            select(Employee).from_statement(stmt).execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    # ── Bulk import ──────────────────────────────────────────────────────────
+
+    async def create_import_staging(self) -> None:
+        """Create the temporary staging table; it is dropped at commit."""
+        await self._db.execute(CreateTable(import_staging))
+
+    async def copy_to_import_staging(self, records: Sequence[tuple]) -> None:
+        """Load ``(line, employee_id, full_name, email, department)`` tuples via COPY."""
+        connection = await self._db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            import_staging.name,
+            records=records,
+            columns=[column.name for column in import_staging.columns],
+        )
+
+    async def merge_import_staging(self) -> Sequence[Row]:
+        """
+        Insert every staged row that conflicts with nothing in one
+        ``INSERT ... SELECT ... ON CONFLICT DO NOTHING`` and return
+        ``(line, employee_id, reason)`` for each staged row that was rejected.
+
+        Within the file the first occurrence of an employee_id / email wins.
+        """
+        ranked = select(
+            import_staging,
+            func.row_number().over(
+                partition_by=import_staging.c.employee_id, order_by=import_staging.c.line
+            ).label("id_rank"),
+            func.row_number().over(
+                partition_by=import_staging.c.email, order_by=import_staging.c.line
+            ).label("email_rank"),
+        ).cte("ranked")
+
+        columns = ["employee_id", "full_name", "email", "department"]
+        inserted = (
+            pg_insert(Employee.__table__)
+            .from_select(
+                columns,
+                select(*(ranked.c[name] for name in columns))
+                .where(ranked.c.id_rank == 1, ranked.c.email_rank == 1)
+                .order_by(ranked.c.line),
+            )
+            .on_conflict_do_nothing()
+            .returning(Employee.__table__.c.employee_id)
+            .cte("inserted")
         )
-        return result.rowcount > 0
 
-    async def update(self, employee: Employee) -> Employee:
-        await self._db.flush()
-        await self._db.refresh(employee)
-        return employee
+        # The outer query sees the table as it was before the CTE's INSERT, so
+        # an existing employee_id here means a conflict with a pre-existing row.
+        reason = case(
+            (ranked.c.id_rank > 1, "duplicate_employee_id_in_file"),
+            (ranked.c.email_rank > 1, "duplicate_email_in_file"),
+            (
+                exists().where(Employee.employee_id == ranked.c.employee_id),
+                "employee_id_exists",
+            ),
+            else_="email_exists",
+        )
+        was_inserted = exists().where(
+            inserted.c.employee_id == ranked.c.employee_id,
+            ranked.c.id_rank == 1,
+            ranked.c.email_rank == 1,
+        )
+        result = await self._db.execute(
+            select(ranked.c.line, ranked.c.employee_id, reason.label("reason"))
+            .where(~was_inserted)
+            .order_by(ranked.c.line)
+        )
+        return result.all()
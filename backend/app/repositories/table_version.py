@@ -0,0 +1,40 @@
+"""Table version repository — reads and bumps ``table_versions``."""
+
+from typing import Sequence
+
+from sqlalchemy import BigInteger, cast, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.table_version import TABLE_VERSION_STRIPES, TableVersion
+
+
+class TableVersionRepository:
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+
+    async def get_versions(self, table_names: Sequence[str]) -> dict[str, int]:
+        """Current version of each table: the sum of its stripes, in one primary-key range scan."""
+        result = await self._db.execute(
+            select(
+                TableVersion.table_name,
+                cast(func.sum(TableVersion.version), BigInteger).label("version"),
+            )
+            .where(TableVersion.table_name.in_(table_names))
+            .group_by(TableVersion.table_name)
+        )
+        return {row.table_name: row.version for row in result}
+
+    async def bump(self, table_name: str) -> None:
+        """
+        Invalidate ETags derived from *table_name* for changes the triggers
+        can't see, e.g. rebuilding the tables derived from it.
+        """
+        await self._db.execute(
+            update(TableVersion)
+            .where(
+                TableVersion.table_name == table_name,
+                # Same stripe as the triggers pick for this transaction
+                TableVersion.stripe == func.txid_current() % TABLE_VERSION_STRIPES,
+            )
+            .values(version=TableVersion.version + 1)
+        )
@@ -0,0 +1,21 @@
+"""Schemas for the operational / admin endpoints."""
+
+from pydantic import BaseModel, Field
+
+
+class CacheStatsResponse(BaseModel):
+    size: int = Field(..., description="Entries currently cached", examples=[1520])
+    hits: int = Field(..., description="Lookups served from the cache", examples=[48210])
+    misses: int = Field(..., description="Lookups that had to go to the database", examples=[311])
+
+
+class PoolStatsResponse(BaseModel):
+    size: int = Field(..., description="Configured pool size (DB_POOL_SIZE)", examples=[10])
+    max_overflow: int = Field(..., description="Extra connections allowed beyond size", examples=[20])
+    timeout_seconds: float = Field(..., description="Longest a checkout waits for a connection", examples=[30.0])
+    recycle_seconds: int = Field(..., description="Maximum connection age; -1 for none", examples=[1800])
+    checked_in: int = Field(..., description="Idle connections in the pool", examples=[7])
+    checked_out: int = Field(..., description="Connections in use", examples=[3])
+    overflow: int = Field(..., description="Overflow connections currently open", examples=[0])
+    checkout_waits: int = Field(..., description="Checkouts that found the pool exhausted", examples=[12])
+    checkout_wait_seconds: float = Field(..., description="Total time spent waiting for a connection", examples=[0.84])
@@ -1,7 +1,7 @@
 """Attendance request / response Pydantic schemas."""
 
 from datetime import date as date_type, datetime as datetime_type
-from typing import Annotated, Optional
+from typing import Annotated, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -24,6 +24,22 @@ class AttendanceCreate(BaseModel):
     )]
 
 
+class AttendanceBulkCreate(BaseModel):
+    records: List[AttendanceCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=50_000,
+        description="Attendance entries to record in a single request.",
+    )
+    on_conflict: Literal["skip", "update"] = Field(
+        "skip",
+        description=(
+            "What to do when attendance already exists for an employee/date: "
+            "`skip` keeps the stored status, `update` overwrites it."
+        ),
+    )
+
+
 class AttendanceUpdate(BaseModel):
     date: Optional[date_type] = Field(
         None,
@@ -60,3 +76,23 @@ class EmployeeAttendanceSummary(BaseModel):
     total_days: int
 
     model_config = {"from_attributes": True}
+
+
+class EmployeeMonthlyAttendanceSummary(EmployeeAttendanceSummary):
+    month: str = Field(..., examples=["2026-02"], description="Calendar month (YYYY-MM).")
+
+
+class AttendanceBulkItemResult(BaseModel):
+    index: int = Field(..., description="Position of the entry in the request's `records`.")
+    employee_id: str
+    date: date_type
+    result: Literal["inserted", "updated", "duplicate", "unknown_employee"]
+    id: Optional[int] = Field(None, description="Attendance record id when inserted or updated.")
+
+
+class AttendanceBulkResponse(BaseModel):
+    inserted: int
+    updated: int
+    duplicates: int
+    unknown_employees: int
+    results: List[AttendanceBulkItemResult]
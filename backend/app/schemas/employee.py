@@ -2,7 +2,7 @@
 
 import re
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
@@ -90,3 +90,23 @@ class EmployeeResponse(BaseModel):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class EmployeeImportError(BaseModel):
+    line: int = Field(..., description="1-based line number in the uploaded file.")
+    employee_id: Optional[str] = None
+    reason: Literal[
+        "invalid",
+        "duplicate_employee_id_in_file",
+        "duplicate_email_in_file",
+        "employee_id_exists",
+        "email_exists",
+    ]
+    details: Optional[object] = None
+
+
+class EmployeeImportResponse(BaseModel):
+    received: int = Field(..., description="Number of data rows read from the file.")
+    inserted: int
+    rejected: int
+    errors: List[EmployeeImportError]
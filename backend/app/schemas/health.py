@@ -1,5 +1,7 @@
 """Schemas for the health-check endpoint."""
 
+from datetime import datetime
+
 from pydantic import BaseModel, Field
 
 
@@ -8,3 +10,17 @@ class HealthResponse(BaseModel):
     version: str = Field(..., examples=["0.1.0"])
 
     model_config = {"json_schema_extra": {"example": {"status": "ok", "version": "0.1.0"}}}
+
+
+class DatabaseHealth(BaseModel):
+    ok: bool = Field(..., examples=[True])
+    latency_ms: float | None = Field(None, description="Round trip of the last SELECT 1", examples=[0.84])
+    error: str | None = Field(None, examples=[None])
+
+
+class ReadinessResponse(BaseModel):
+    status: str = Field(..., description="ok, degraded or unavailable", examples=["ok"])
+    version: str = Field(..., examples=["0.1.0"])
+    checked_at: datetime | None = Field(None, description="When the background check last ran")
+    databases: dict[str, DatabaseHealth] = Field(default_factory=dict)
+    reasons: list[str] = Field(default_factory=list, description="Why the status isn't ok")
@@ -0,0 +1,54 @@
+"""Keyset (cursor) pagination schemas and helpers."""
+
+import base64
+import json
+from typing import Any, Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+from app.exceptions.exceptions import BadRequestException
+
+T = TypeVar("T")
+
+# Hard upper bound for a single page, whatever the client asks for.
+MAX_PAGE_SIZE = 500
+
+
+# ── Response ──────────────────────────────────────────────────────────────────
+
+class Page(BaseModel, Generic[T]):
+    """One page of a keyset-paginated listing."""
+
+    items: List[T]
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for the next page; null when this is the last page.",
+    )
+
+
+# ── Cursor encoding ───────────────────────────────────────────────────────────
+
+def encode_cursor(sort: str, values: list[Any]) -> str:
+    """Encode the sort key of the last row on a page into an opaque cursor."""
+    raw = json.dumps({"s": sort, "v": values}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> list[Any]:
+    """Decode a cursor produced by :func:`encode_cursor` for the given *sort*."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = data["v"]
+        cursor_sort = data["s"]
+    except (ValueError, KeyError, TypeError):
+        raise BadRequestException(
+            message="Invalid pagination cursor.",
+            details={"cursor": cursor},
+        )
+    if cursor_sort != sort or not isinstance(values, list):
+        raise BadRequestException(
+            message="Pagination cursor does not match the requested sort order.",
+            details={"cursor": cursor, "sort": sort},
+        )
+    return values
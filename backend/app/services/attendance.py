@@ -1,100 +1,346 @@
 """Attendance service — validation and orchestration."""
 
-from typing import Sequence
+import csv
+import io
+import json
+from datetime import date
+from typing import AsyncIterator, Sequence
 
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import invalidate_on_commit
+from app.database import violated_constraint
 from app.exceptions.exceptions import (
     AttendanceAlreadyMarkedException,
+    BadRequestException,
     EmployeeNotFoundException,
     NotFoundException,
 )
 from app.models.attendance import Attendance, AttendanceStatus
 from app.repositories.attendance import AttendanceRepository
-from app.repositories.employee import EmployeeRepository
-from app.schemas.attendance import AttendanceCreate, AttendanceUpdate, EmployeeAttendanceSummary
+from app.repositories.employee import EmployeeRepository, employee_pk_cache
+from app.schemas.attendance import (
+    AttendanceBulkCreate,
+    AttendanceBulkItemResult,
+    AttendanceBulkResponse,
+    AttendanceCreate,
+    AttendanceUpdate,
+    EmployeeAttendanceSummary,
+    EmployeeMonthlyAttendanceSummary,
+)
+from app.schemas.pagination import decode_cursor, encode_cursor
+from app.services.dashboard import dashboard_stats_cache
+
+# Target size of each chunk written to the client by exports.
+EXPORT_CHUNK_SIZE = 64 * 1024
+EXPORT_COLUMNS = ("id", "employee_code", "employee_name", "department", "date", "status")
+# Rows per INSERT statement in bulk marking (3 bind params per row).
+BULK_CHUNK_SIZE = 1000
+# Postgres' default name for the foreign key from attendance to employees
+ATTENDANCE_EMPLOYEE_FK = "attendance_employee_id_fkey"
 
 
 class AttendanceService:
     def __init__(self, db: AsyncSession) -> None:
+        self._db = db
         self._repo = AttendanceRepository(db)
         self._emp_repo = EmployeeRepository(db)
 
+    def _invalidate_caches(self) -> None:
+        """Drop cached reads derived from attendance once this write commits."""
+        invalidate_on_commit(self._db, dashboard_stats_cache)
+
     async def mark_attendance(self, payload: AttendanceCreate) -> Attendance:
-        # 1. Verify employee exists
-        employee = await self._emp_repo.get_by_employee_id(payload.employee_id)
-        if not employee:
+        # 1. Resolve the employee and insert in a single round trip
+        self._invalidate_caches()
+        attendance = await self._repo.mark_attendance(
+            payload.employee_id, payload.date, payload.status
+        )
+        if attendance:
+            return attendance
+
+        # 2. Nothing inserted — work out why (only on the failure path)
+        employee_pk = await self._emp_repo.resolve_id(payload.employee_id)
+        if employee_pk is None:
             raise EmployeeNotFoundException(
                 message=f"Employee '{payload.employee_id}' not found.",
                 details={"employee_id": payload.employee_id},
             )
 
-        # 2. Prevent duplicate attendance for the same date
         existing = await self._repo.check_existing_attendance(
-            employee.id, payload.date
+            employee_pk, payload.date
         )
-        if existing:
-            raise AttendanceAlreadyMarkedException(
-                message=(
-                    f"Attendance for employee '{payload.employee_id}' "
-                    f"on {payload.date} is already recorded as '{existing.status}'."
-                ),
-                details={
-                    "employee_id": payload.employee_id,
-                    "date": str(payload.date),
-                    "existing_status": existing.status,
-                },
-            )
+        existing_status = existing.status if existing else None
+        raise AttendanceAlreadyMarkedException(
+            message=(
+                f"Attendance for employee '{payload.employee_id}' "
+                f"on {payload.date} is already recorded as '{existing_status}'."
+            ),
+            details={
+                "employee_id": payload.employee_id,
+                "date": str(payload.date),
+                "existing_status": existing_status,
+            },
+        )
+
+    async def bulk_mark_attendance(
+        self, payload: AttendanceBulkCreate
+    ) -> AttendanceBulkResponse:
+        """
+        Record many attendance entries with one employee lookup plus one
+        upsert per chunk of rows, reporting the outcome of every entry.
+        """
+        records = payload.records
+        update_existing = payload.on_conflict == "update"
+        results: list[AttendanceBulkItemResult | None] = [None] * len(records)
+
+        # 1. Resolve every distinct employee code (cache first, then one IN query)
+        employee_pks = await self._emp_repo.get_ids_by_employee_ids(
+            list({record.employee_id for record in records})
+        )
+
+        # 2. Collapse entries hitting the same employee/date; a statement may
+        #    not touch the same row twice. With "update" the last entry wins.
+        winners: dict[tuple[int, date], int] = {}
+        for index, record in enumerate(records):
+            employee_pk = employee_pks.get(record.employee_id)
+            if employee_pk is None:
+                results[index] = self._bulk_result(index, record, "unknown_employee")
+                continue
+            key = (employee_pk, record.date)
+            previous = winners.get(key)
+            if previous is None:
+                winners[key] = index
+            elif update_existing:
+                results[previous] = self._bulk_result(previous, records[previous], "duplicate")
+                winners[key] = index
+            else:
+                results[index] = self._bulk_result(index, record, "duplicate")
+
+        # 3. Upsert in chunks and classify what came back
+        self._invalidate_caches()
+        pending = list(winners.items())
+        for start in range(0, len(pending), BULK_CHUNK_SIZE):
+            chunk = pending[start:start + BULK_CHUNK_SIZE]
+            try:
+                # A savepoint, so a failed chunk doesn't abort the transaction
+                async with self._db.begin_nested():
+                    written = await self._bulk_upsert_chunk(chunk, records, update_existing)
+            except IntegrityError as exc:
+                if violated_constraint(exc) != ATTENDANCE_EMPLOYEE_FK:
+                    raise
+                # An employee was deleted after its id was looked up (or cached):
+                # look the chunk's employees up again and retry once without them
+                chunk = await self._drop_deleted_employees(chunk, records, results)
+                written = await self._bulk_upsert_chunk(chunk, records, update_existing)
+            written_by_key = {(row.employee_id, row.date): row for row in written}
+            for key, index in chunk:
+                row = written_by_key.get(key)
+                if row is None:
+                    results[index] = self._bulk_result(index, records[index], "duplicate")
+                else:
+                    outcome = "inserted" if row.inserted else "updated"
+                    results[index] = self._bulk_result(index, records[index], outcome, row.id)
+
+        counts = {"inserted": 0, "updated": 0, "duplicate": 0, "unknown_employee": 0}
+        for item in results:
+            counts[item.result] += 1
+        return AttendanceBulkResponse(
+            inserted=counts["inserted"],
+            updated=counts["updated"],
+            duplicates=counts["duplicate"],
+            unknown_employees=counts["unknown_employee"],
+            results=results,
+        )
+
+    async def _bulk_upsert_chunk(
+        self,
+        chunk: list[tuple[tuple[int, date], int]],
+        records: list[AttendanceCreate],
+        update_existing: bool,
+    ) -> Sequence[Row]:
+        if not chunk:
+            return []
+        return await self._repo.bulk_upsert(
+            [
+                {"employee_id": pk, "date": day, "status": records[index].status}
+                for (pk, day), index in chunk
+            ],
+            update_existing=update_existing,
+        )
+
+    async def _drop_deleted_employees(
+        self,
+        chunk: list[tuple[tuple[int, date], int]],
+        records: list[AttendanceCreate],
+        results: list[AttendanceBulkItemResult | None],
+    ) -> list[tuple[tuple[int, date], int]]:
+        """
+        Re-resolve the employees of *chunk*, bypassing the cache. Entries whose
+        employee no longer exists are reported as unknown; the rest are returned
+        with their current ids.
+        """
+        codes = {records[index].employee_id for _, index in chunk}
+        employee_pk_cache.invalidate(codes)
+        employee_pks = await self._emp_repo.get_ids_by_employee_ids(list(codes))
+        remaining = []
+        for (_, day), index in chunk:
+            employee_pk = employee_pks.get(records[index].employee_id)
+            if employee_pk is None:
+                results[index] = self._bulk_result(index, records[index], "unknown_employee")
+            else:
+                remaining.append(((employee_pk, day), index))
+        return remaining
 
-        # 3. Persist
-        attendance = Attendance(
-            employee_id=employee.id,
-            date=payload.date,
-            status=payload.status,
+    @staticmethod
+    def _bulk_result(
+        index: int, record: AttendanceCreate, result: str, id: int | None = None
+    ) -> AttendanceBulkItemResult:
+        return AttendanceBulkItemResult(
+            index=index,
+            employee_id=record.employee_id,
+            date=record.date,
+            result=result,
+            id=id,
         )
-        return await self._repo.mark_attendance(attendance)
 
-    async def get_attendance_by_employee(
-        self, employee_id: str
-    ) -> Sequence[Attendance]:
-        employee = await self._emp_repo.get_by_employee_id(employee_id)
-        if not employee:
+    async def get_attendance_by_employee(self, employee_id: str) -> list[dict]:
+        employee_pk = await self._emp_repo.resolve_id(employee_id)
+        if employee_pk is None:
             raise EmployeeNotFoundException(
                 message=f"Employee '{employee_id}' not found.",
                 details={"employee_id": employee_id},
             )
-        return await self._repo.get_attendance_by_employee(employee.id)
+        return await self._repo.get_attendance_by_employee(employee_pk)
 
-    async def get_all_attendance(self, start_date: str | None = None, end_date: str | None = None) -> Sequence[Attendance]:
-        return await self._repo.get_all_attendance(start_date, end_date)
+    async def get_all_attendance(
+        self,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        employee_id: str | None = None,
+        department: str | None = None,
+        status: AttendanceStatus | None = None,
+    ) -> list[dict]:
+        return await self._repo.get_all_attendance(
+            start_date,
+            end_date,
+            employee_code=employee_id,
+            department=department,
+            status=status,
+        )
+
+    async def get_attendance_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        employee_id: str | None = None,
+        department: str | None = None,
+        status: AttendanceStatus | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Return one keyset page of attendance rows plus the cursor for the next one."""
+        after = None
+        if cursor:
+            values = decode_cursor(cursor, "date_id")
+            try:
+                day, id = values
+                if type(id) is not int:
+                    raise TypeError(id)
+                after = (date.fromisoformat(day), id)
+            except (TypeError, ValueError):
+                raise BadRequestException(
+                    message="Invalid pagination cursor.",
+                    details={"cursor": cursor},
+                )
+
+        # Fetch one extra row to know whether another page exists
+        records = await self._repo.get_all_attendance(
+            start_date,
+            end_date,
+            employee_code=employee_id,
+            department=department,
+            status=status,
+            limit=limit + 1,
+            after=after,
+        )
+        if len(records) <= limit:
+            return records, None
+        records = records[:limit]
+        last = records[-1]
+        return records, encode_cursor("date_id", [last["date"].isoformat(), last["id"]])
+
+    async def export_attendance(
+        self,
+        fmt: str,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield the attendance export as CSV or NDJSON, in chunks of roughly
+        *chunk_size* bytes. Rows are read through a server-side cursor, so memory
+        use is bounded by the chunk size rather than the date range.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == "csv" else None
+        if writer:
+            writer.writerow(EXPORT_COLUMNS)
+
+        async for row in self._repo.stream_attendance(start_date, end_date):
+            values = (
+                row.id,
+                row.employee_code,
+                row.employee_name,
+                row.department,
+                row.date.isoformat(),
+                row.status.value,
+            )
+            if writer:
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values))))
+                buffer.write("\n")
+
+            if buffer.tell() >= chunk_size:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue().encode()
 
     async def update_attendance(self, id: int, payload: AttendanceUpdate) -> Attendance:
-        attendance = await self._repo.get_by_id(id)
+        # Update only provided fields, in a single UPDATE ... RETURNING
+        values = payload.model_dump(exclude_none=True)
+        try:
+            attendance = (
+                await self._repo.update_by_id(id, values)
+                if values
+                else await self._repo.get_by_id(id)
+            )
+        except IntegrityError as exc:
+            # Changing the date onto one the employee already has
+            if violated_constraint(exc) != "uq_attendance_employee_date":
+                raise
+            raise AttendanceAlreadyMarkedException(
+                message=f"Attendance for this employee on {payload.date} already exists.",
+                details={"date": str(payload.date)},
+            ) from exc
         if not attendance:
             raise NotFoundException(
                 message=f"Attendance record with id {id} not found.",
                 details={"id": id},
             )
-        
-        # Update only provided fields
-        if payload.status is not None:
-            attendance.status = payload.status
-        if payload.date is not None:
-            # Check if changing date would create duplicate
-            existing = await self._repo.check_existing_attendance(
-                attendance.employee_id, payload.date
-            )
-            if existing and existing.id != id:
-                raise AttendanceAlreadyMarkedException(
-                    message=f"Attendance for this employee on {payload.date} already exists.",
-                    details={"date": str(payload.date)},
-                )
-            attendance.date = payload.date
-        
-        await self._repo.update(attendance)
+
+        if values:
+            self._invalidate_caches()
         return attendance
 
     async def delete_attendance(self, id: int) -> None:
+        self._invalidate_caches()
         deleted = await self._repo.delete_by_id(id)
         if not deleted:
             raise NotFoundException(
@@ -102,6 +348,20 @@ class AttendanceService:
                 details={"id": id},
             )
 
-    async def get_attendance_summary(self) -> list[EmployeeAttendanceSummary]:
+    async def get_attendance_summary(
+        self, start_date: date | None = None, end_date: date | None = None
+    ) -> list[EmployeeAttendanceSummary]:
         """Get attendance summary for all employees showing total present/absent days."""
-        return await self._repo.get_attendance_summary()
+        if start_date is None and end_date is None:
+            return await self._repo.get_attendance_summary()
+        if start_date and end_date and start_date > end_date:
+            raise BadRequestException(
+                message="start_date must not be after end_date.",
+                details={"start_date": str(start_date), "end_date": str(end_date)},
+            )
+        return await self._repo.get_attendance_summary_between(start_date, end_date)
+
+    async def get_monthly_summary(self, month: str) -> list[EmployeeMonthlyAttendanceSummary]:
+        """Get per-employee attendance totals for one month given as YYYY-MM."""
+        year, month_number = (int(part) for part in month.split("-"))
+        return await self._repo.get_monthly_summary(date(year, month_number, 1))
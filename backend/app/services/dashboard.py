@@ -0,0 +1,43 @@
+"""Dashboard service — cached aggregate statistics."""
+
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import TTLCache
+from app.config import get_settings
+from app.repositories.dashboard import DashboardRepository
+from app.repositories.table_version import TableVersionRepository
+from app.schemas.dashboard import DashboardStatsResponse
+
+settings = get_settings()
+
+# Invalidated by every employee / attendance write (see invalidate_on_commit).
+# Also keyed by the tables' versions: a reader on a lagging replica can only
+# fill the entry for the versions it saw, never serve old figures to readers
+# that already see the write.
+dashboard_stats_cache = TTLCache("dashboard_stats", ttl=settings.dashboard_cache_ttl_seconds)
+
+
+class DashboardService:
+    def __init__(self, db: AsyncSession) -> None:
+        self._repo = DashboardRepository(db)
+        self._versions = TableVersionRepository(db)
+
+    async def get_stats(self) -> DashboardStatsResponse:
+        # The API server's date, like the route's ETag key, not the database's current_date
+        today = date.today()
+
+        async def load() -> DashboardStatsResponse:
+            row = await self._repo.get_stats(today)
+            return DashboardStatsResponse(
+                total_employees=row.total_employees or 0,
+                present_today=row.present_today or 0,
+                absent_today=row.absent_today or 0,
+                total_attendance_records=row.total_attendance_records or 0,
+            )
+
+        # Keyed by date so "today" figures never outlive midnight
+        versions = await self._versions.get_versions(("employees", "attendance"))
+        key = (today, versions.get("employees", 0), versions.get("attendance", 0))
+        return await dashboard_stats_cache.get_or_load(key, load)
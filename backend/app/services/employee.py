@@ -1,87 +1,317 @@
 """Employee service — business logic and validation."""
 
-from typing import Sequence
+import codecs
+import csv
+import json
+from collections import deque
+from typing import AsyncIterator, NoReturn
 
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import invalidate_on_commit
+from app.database import violated_constraint
 from app.exceptions.exceptions import (
+    BadRequestException,
     EmployeeAlreadyExistsException,
     EmployeeNotFoundException,
 )
 from app.models.employee import Employee
-from app.repositories.employee import EmployeeRepository
-from app.schemas.employee import EmployeeCreate, EmployeeUpdate
+from app.repositories.employee import EmployeeRepository, employee_pk_cache
+from app.schemas.employee import (
+    EmployeeCreate,
+    EmployeeImportError,
+    EmployeeImportResponse,
+    EmployeeUpdate,
+)
+from app.schemas.pagination import decode_cursor, encode_cursor
+from app.services.dashboard import dashboard_stats_cache
+
+EMPLOYEE_ID_PREFIX = "EMP-"
+# Rows buffered before each COPY into the import staging table.
+IMPORT_CHUNK_SIZE = 5000
+IMPORT_CSV_COLUMNS = ("employee_id", "full_name", "email", "department")
+# Postgres' default name for the UNIQUE constraint on employees.email
+EMAIL_UNIQUE_CONSTRAINT = "employees_email_key"
+
+
+def format_employee_id(number: int) -> str:
+    """
+    Render a sequence number as an employee ID (e.g. 42 -> EMP-0042).
+    ``EmployeeRepository.create_with_next_code`` builds the same format in SQL.
+    """
+    return f"{EMPLOYEE_ID_PREFIX}{number:04d}"
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a UTF-8 byte stream into lines without buffering the whole body."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+class _LineFeed:
+    """A sync line iterator for :func:`csv.reader`, refilled between rows."""
+
+    def __init__(self) -> None:
+        self._lines: deque[str] = deque()
+        self.ran_dry = False
+
+    def extend(self, lines: list[str]) -> None:
+        self._lines.extend(lines)
+        self.ran_dry = False
+
+    def __iter__(self) -> "_LineFeed":
+        return self
+
+    def __next__(self) -> str:
+        if not self._lines:
+            self.ran_dry = True
+            raise StopIteration
+        return self._lines.popleft()
+
+
+async def _iter_csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, list[str]]]:
+    """
+    Parse a CSV byte stream into rows, numbered by the line each row starts on.
+
+    One :func:`csv.reader` reads the whole stream, so quoted fields may span
+    lines. If the reader runs out of lines mid-row, the row's lines are fed
+    again together with the next one.
+    """
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    lines: list[str] = []
+    start = 0
+    async for line_no, line in _aenumerate(_iter_lines(chunks), start=1):
+        if not lines:
+            if not line.strip():
+                continue
+            start = line_no
+        lines.append(line + "\n")
+        feed.extend(lines)
+        row = next(reader)
+        if feed.ran_dry:
+            continue  # Inside a quoted field
+        lines = []
+        yield start, row
+    if lines:
+        # Unterminated quoted field: the reader returns what it has
+        feed.extend(lines)
+        yield start, next(reader)
+
+
+async def _aenumerate(items: AsyncIterator[str], start: int = 0) -> AsyncIterator[tuple[int, str]]:
+    index = start
+    async for item in items:
+        yield index, item
+        index += 1
 
 
 class EmployeeService:
     def __init__(self, db: AsyncSession) -> None:
+        self._db = db
         self._repo = EmployeeRepository(db)
 
-    async def _generate_employee_id(self) -> str:
-        """Generate a unique employee ID in format EMP-XXXX."""
-        employees = await self._repo.get_all()
-        if not employees:
-            return "EMP-0001"
-        
-        # Extract numeric parts and find the max
-        max_num = 0
-        for emp in employees:
-            if emp.employee_id.startswith("EMP-"):
-                try:
-                    num = int(emp.employee_id.split("-")[1])
-                    max_num = max(max_num, num)
-                except (IndexError, ValueError):
-                    continue
-        
-        return f"EMP-{max_num + 1:04d}"
+    def _invalidate_caches(self, *employee_ids: str) -> None:
+        """Drop cached reads derived from employees once this write commits."""
+        invalidate_on_commit(self._db, dashboard_stats_cache)
+        if employee_ids:
+            invalidate_on_commit(self._db, employee_pk_cache, employee_ids)
 
     async def create_employee(self, payload: EmployeeCreate) -> Employee:
-        # Auto-generate employee_id if not provided
-        employee_id = payload.employee_id
-        if not employee_id:
-            employee_id = await self._generate_employee_id()
-        
-        existing = await self._repo.get_by_employee_id(employee_id)
-        if existing:
-            raise EmployeeAlreadyExistsException(
-                message=f"Employee with ID '{employee_id}' already exists.",
-                details={"employee_id": employee_id},
-            )
+        values = payload.model_dump(exclude={"employee_id"})
+        self._invalidate_caches()
+        try:
+            if payload.employee_id:
+                employee = await self._repo.create({**values, "employee_id": payload.employee_id})
+                if employee is None:
+                    raise EmployeeAlreadyExistsException(
+                        message=f"Employee with ID '{payload.employee_id}' already exists.",
+                        details={"employee_id": payload.employee_id},
+                    )
+                return employee
 
-        employee = Employee(
-            employee_id=employee_id,
-            full_name=payload.full_name,
-            email=payload.email,
-            department=payload.department,
-        )
-        return await self._repo.create(employee)
+            # Auto-generate an EMP-XXXX ID in the INSERT itself, skipping numbers
+            # already taken by a manually supplied ID (the insert comes back empty)
+            employee = None
+            while employee is None:
+                employee = await self._repo.create_with_next_code(values, EMPLOYEE_ID_PREFIX)
+            return employee
+        except IntegrityError as exc:
+            self._raise_for_conflict(exc, payload.email)
 
-    async def get_all_employees(self) -> Sequence[Employee]:
+    @staticmethod
+    def _raise_for_conflict(exc: IntegrityError, email: str | None) -> NoReturn:
+        """Translate a unique violation on the email into the domain exception."""
+        if violated_constraint(exc) == EMAIL_UNIQUE_CONSTRAINT:
+            raise EmployeeAlreadyExistsException(
+                message=f"Employee with email '{email}' already exists.",
+                details={"email": email},
+            ) from exc
+        raise exc
+
+    async def get_all_employees(self) -> list[dict]:
         return await self._repo.get_all()
 
+    async def get_employees_page(
+        self, limit: int, cursor: str | None = None, sort: str = "id"
+    ) -> tuple[list[dict], str | None]:
+        """Return one keyset page of employee rows plus the cursor for the next one."""
+        after = None
+        if cursor:
+            values = decode_cursor(cursor, sort)
+            try:
+                (value,) = values
+                if value is None or isinstance(value, (bool, dict, list)):
+                    raise TypeError(value)
+                after = int(value) if sort == "id" else str(value)
+            except (TypeError, ValueError):
+                raise BadRequestException(
+                    message="Invalid pagination cursor.",
+                    details={"cursor": cursor},
+                )
+
+        # Fetch one extra row to know whether another page exists
+        employees = await self._repo.get_page(limit + 1, sort=sort, after=after)
+        if len(employees) <= limit:
+            return employees, None
+        employees = employees[:limit]
+        return employees, encode_cursor(sort, [employees[-1][sort]])
+
     async def update_employee(self, id: int, payload: EmployeeUpdate) -> Employee:
-        employee = await self._repo.get_by_id(id)
+        # Update only provided fields, in a single UPDATE ... RETURNING
+        values = payload.model_dump(exclude_none=True)
+        try:
+            employee = (
+                await self._repo.update_by_id(id, values)
+                if values
+                else await self._repo.get_by_id(id)
+            )
+        except IntegrityError as exc:
+            self._raise_for_conflict(exc, payload.email)
         if not employee:
             raise EmployeeNotFoundException(
                 message=f"Employee with id {id} not found.",
                 details={"id": id},
             )
-        
-        # Update only provided fields
-        if payload.full_name is not None:
-            employee.full_name = payload.full_name
-        if payload.email is not None:
-            employee.email = payload.email
-        if payload.department is not None:
-            employee.department = payload.department
-        
-        await self._repo.update(employee)
+
+        if values:
+            self._invalidate_caches(employee.employee_id)
         return employee
 
     async def delete_employee(self, id: int) -> None:
-        deleted = await self._repo.delete_by_id(id)
-        if not deleted:
+        deleted_employee_id = await self._repo.delete_by_id(id)
+        if not deleted_employee_id:
             raise EmployeeNotFoundException(
                 message=f"Employee with id {id} not found.",
                 details={"id": id},
             )
+        self._invalidate_caches(deleted_employee_id)
+
+    async def import_employees(
+        self, chunks: AsyncIterator[bytes], fmt: str
+    ) -> EmployeeImportResponse:
+        """
+        Import employees from a CSV (with header) or NDJSON byte stream.
+
+        Rows are validated with :class:`EmployeeCreate` as they arrive and COPY'd
+        into a staging table in chunks, then merged into ``employees`` with a
+        single statement. Memory use is bounded by the chunk size.
+        """
+        await self._repo.create_import_staging()
+        errors: list[EmployeeImportError] = []
+        received = 0
+        staged = 0
+        chunk: list[tuple[int, EmployeeCreate]] = []
+        header: list[str] | None = None
+
+        records = (
+            _iter_csv_rows(chunks)
+            if fmt == "csv"
+            else _aenumerate(_iter_lines(chunks), start=1)
+        )
+        async for line_no, record in records:
+            if fmt == "csv" and header is None:
+                header = [name.strip().lower() for name in record]
+                continue
+            if fmt != "csv" and not record.strip():
+                continue
+
+            received += 1
+            data = None
+            try:
+                if fmt == "csv":
+                    data = {
+                        name: value.strip() or None
+                        for name, value in zip(header, record)
+                        if name in IMPORT_CSV_COLUMNS
+                    }
+                else:
+                    data = json.loads(record)
+                chunk.append((line_no, EmployeeCreate.model_validate(data)))
+            except ValidationError as exc:
+                errors.append(
+                    EmployeeImportError(
+                        line=line_no,
+                        employee_id=data.get("employee_id") if isinstance(data, dict) else None,
+                        reason="invalid",
+                        details=[
+                            {"field": ".".join(str(loc) for loc in err["loc"]), "message": err["msg"]}
+                            for err in exc.errors()
+                        ],
+                    )
+                )
+            except ValueError as exc:
+                # Malformed JSON line
+                errors.append(
+                    EmployeeImportError(line=line_no, reason="invalid", details=str(exc))
+                )
+
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                staged += await self._stage_import_chunk(chunk)
+                chunk = []
+
+        if chunk:
+            staged += await self._stage_import_chunk(chunk)
+
+        self._invalidate_caches()
+        rejected = await self._repo.merge_import_staging()
+        errors.extend(
+            EmployeeImportError(line=row.line, employee_id=row.employee_id, reason=row.reason)
+            for row in rejected
+        )
+        errors.sort(key=lambda error: error.line)
+        return EmployeeImportResponse(
+            received=received,
+            inserted=staged - len(rejected),
+            rejected=len(errors),
+            errors=errors,
+        )
+
+    async def _stage_import_chunk(self, chunk: list[tuple[int, EmployeeCreate]]) -> int:
+        """COPY one chunk of validated rows, allocating IDs for rows without one."""
+        missing = sum(1 for _, payload in chunk if not payload.employee_id)
+        numbers = iter(await self._repo.allocate_employee_numbers(missing) if missing else ())
+        await self._repo.copy_to_import_staging(
+            [
+                (
+                    line_no,
+                    payload.employee_id or format_employee_id(next(numbers)),
+                    payload.full_name,
+                    payload.email,
+                    payload.department,
+                )
+                for line_no, payload in chunk
+            ]
+        )
+        return len(chunk)
+
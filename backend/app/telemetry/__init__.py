@@ -0,0 +1 @@
+"""Telemetry — metrics and instrumentation for requests and the database."""
@@ -0,0 +1,35 @@
+"""Per-request telemetry context, reachable from anywhere via a contextvar."""
+
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class RequestTelemetry:
+    """What one HTTP request has done so far; mutated in place while it runs."""
+
+    request_id: str
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    # Executions per normalized statement — only filled when tracking repeats
+    statement_counts: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def db_ms(self) -> float:
+        return round(self.db_seconds * 1000, 2)
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` header value for the database work."""
+        noun = "query" if self.db_queries == 1 else "queries"
+        return f'db;dur={self.db_ms};desc="{self.db_queries} {noun}"'
+
+
+# Set by LoggingMiddleware for the duration of each request; ``None`` outside
+# requests (startup, background tasks, CLI commands)
+current_request: ContextVar[RequestTelemetry | None] = ContextVar("current_request", default=None)
+
+
+def current_request_id() -> str | None:
+    telemetry = current_request.get()
+    return telemetry.request_id if telemetry is not None else None
@@ -0,0 +1,181 @@
+"""
+Background health monitor behind the readiness probe.
+
+Probes must not compete with real traffic for pooled connections, so the
+monitor checks each database with ``SELECT 1`` on its own connection, outside
+the pools, every interval. It also compares the pool-wait and HTTP 5xx
+counters with their values at the previous check. ``/health/ready`` only
+returns the last result, so probes cost no I/O.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.telemetry.metrics import db_pool_checkout_wait_seconds, db_pool_checkout_waits, http_requests
+
+logger = logging.getLogger(__name__)
+
+# Fewer requests than this per interval never count as a high error rate
+MIN_REQUESTS_FOR_ERROR_RATE = 20
+# Health routes are excluded from the error rate: probes would dilute it
+_HEALTH_ROUTE_PREFIX = "/api/v1/health"
+
+
+@dataclass(slots=True)
+class DatabaseStatus:
+    ok: bool
+    latency_ms: float | None = None
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class HealthStatus:
+    # "ok", "degraded" (serving, but slow or failing), "unavailable" or "starting"
+    status: str
+    checked_at: float = 0.0  # Unix time
+    databases: dict[str, DatabaseStatus] = field(default_factory=dict)
+    reasons: list[str] = field(default_factory=list)
+
+
+class HealthMonitor:
+    """
+    Checks *database_urls* (pool name → URL, e.g. ``primary``/``replica``)
+    every *interval_seconds* once :meth:`start` has been awaited. The primary
+    being unreachable makes the status ``unavailable``; anything else over a
+    threshold makes it ``degraded``.
+    """
+
+    def __init__(
+        self,
+        database_urls: dict[str, str],
+        interval_seconds: float = 5.0,
+        timeout_seconds: float = 2.0,
+        degraded_pool_wait_ms: float = 100.0,
+        degraded_error_rate: float = 0.05,
+    ) -> None:
+        self._dsns = {
+            name: make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+            for name, url in database_urls.items()
+        }
+        self._interval = interval_seconds
+        self._timeout = timeout_seconds
+        self._degraded_pool_wait_ms = degraded_pool_wait_ms
+        self._degraded_error_rate = degraded_error_rate
+        self._connections: dict[str, asyncpg.Connection] = {}
+        self._previous: dict[str, float] = {}
+        self._status = HealthStatus("starting", reasons=["not checked yet"])
+        self._checked = 0.0  # time.monotonic() of the last check
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        """Check once (so the first probe has an answer), then every interval."""
+        await self.check()
+        self._task = asyncio.create_task(self._run(), name="health-monitor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        for connection in self._connections.values():
+            if not connection.is_closed():
+                await connection.close()
+        self._connections.clear()
+
+    def current(self) -> HealthStatus:
+        """The last result; ``unavailable`` if the monitor has stopped checking."""
+        if self._task is not None and time.monotonic() - self._checked > 3 * self._interval:
+            return HealthStatus(
+                "unavailable", self._status.checked_at, self._status.databases, ["health check is stale"]
+            )
+        return self._status
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Health check failed")
+
+    async def check(self) -> HealthStatus:
+        databases = dict(
+            zip(self._dsns, await asyncio.gather(*(self._ping(name) for name in self._dsns)))
+        )
+        reasons = [
+            f"{name} database unreachable: {status.error}"
+            for name, status in databases.items()
+            if not status.ok
+        ]
+        unavailable = not databases["primary"].ok if "primary" in databases else False
+        reasons.extend(self._load_reasons())
+
+        status = "unavailable" if unavailable else "degraded" if reasons else "ok"
+        if status != self._status.status:
+            log = logger.info if status == "ok" else logger.warning
+            log("Health status %s -> %s %s", self._status.status, status, "; ".join(reasons))
+        self._status = HealthStatus(status, time.time(), databases, reasons)
+        self._checked = time.monotonic()
+        return self._status
+
+    async def _ping(self, name: str) -> DatabaseStatus:
+        start = time.perf_counter()
+        try:
+            connection = self._connections.get(name)
+            if connection is None or connection.is_closed():
+                connection = self._connections[name] = await asyncio.wait_for(
+                    asyncpg.connect(self._dsns[name], server_settings={"application_name": "hrms-health"}),
+                    self._timeout,
+                )
+            await asyncio.wait_for(connection.fetchval("SELECT 1"), self._timeout)
+        except Exception as exc:
+            connection = self._connections.pop(name, None)
+            if connection is not None:
+                # Timed out or broken: don't reuse a connection in an unknown state
+                connection.terminate()
+            return DatabaseStatus(ok=False, error=str(exc) or type(exc).__name__)
+        return DatabaseStatus(ok=True, latency_ms=round((time.perf_counter() - start) * 1000, 2))
+
+    def _load_reasons(self) -> list[str]:
+        """Pool waits and 5xx rate since the previous check, over the thresholds."""
+        current = {}
+        for name in self._dsns:
+            current[f"{name}:waits"] = db_pool_checkout_waits.value(name)
+            current[f"{name}:wait_seconds"] = db_pool_checkout_wait_seconds.value(name)
+        current["requests"] = current["errors"] = 0.0
+        for (_suffix, labels), value in http_requests.samples().items():
+            labels = dict(labels)
+            if labels["route"].startswith(_HEALTH_ROUTE_PREFIX):
+                continue
+            current["requests"] += value
+            if labels["status"] == "5xx":
+                current["errors"] += value
+        previous, self._previous = self._previous, current
+        if not previous:
+            return []
+
+        def delta(key: str) -> float:
+            return current[key] - previous.get(key, 0.0)
+
+        reasons = []
+        for name in self._dsns:
+            waits = delta(f"{name}:waits")
+            if waits:
+                mean_wait_ms = delta(f"{name}:wait_seconds") / waits * 1000
+                if mean_wait_ms > self._degraded_pool_wait_ms:
+                    reasons.append(
+                        f"{name} pool exhausted: {waits:.0f} checkouts waited {mean_wait_ms:.0f} ms on average"
+                    )
+        requests = delta("requests")
+        if requests >= MIN_REQUESTS_FOR_ERROR_RATE:
+            error_rate = delta("errors") / requests
+            if error_rate > self._degraded_error_rate:
+                reasons.append(f"{error_rate:.0%} of {requests:.0f} requests failed with 5xx")
+        return reasons
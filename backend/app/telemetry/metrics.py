@@ -0,0 +1,376 @@
+"""
+Minimal Prometheus metrics — counters, gauges, histograms and the text
+exposition format, without the ``prometheus_client`` dependency.
+
+Every worker process keeps its own values in memory. With
+``METRICS_MULTIPROC_DIR`` set, each worker periodically writes a snapshot to
+``<dir>/<pid>.json`` (see :func:`run_flusher`) and ``/metrics`` sums the
+snapshots of all workers, so any worker can answer a scrape. Counters and
+histograms of exited workers keep counting towards the totals; gauges only
+include live workers. Clear the directory before starting the server.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+LabelValues = tuple[str, ...]
+# (sample suffix, ((label, value), ...)) -> value
+Samples = dict[tuple[str, tuple[tuple[str, str], ...]], float]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_metrics: dict[str, "Metric"] = {}
+_collectors: list[Callable[[], None]] = []
+_pools: dict[str, Callable[[], AsyncAdaptedQueuePool]] = {}
+
+
+# ── Metric types ──────────────────────────────────────────────────────────────
+
+class Metric(ABC):
+    type: str = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _metrics[name] = self
+
+    def _labels(self, values: LabelValues) -> tuple[tuple[str, str], ...]:
+        return tuple(zip(self.labelnames, values))
+
+    @abstractmethod
+    def samples(self) -> Samples:
+        """Current values keyed by (sample suffix, labels)."""
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        """This worker's count for *labelvalues*."""
+        return self._values.get(labelvalues, 0.0)
+
+    def samples(self) -> Samples:
+        return {("_total", self._labels(key)): value for key, value in self._values.items()}
+
+
+class Gauge(Metric):
+    """A value that goes up and down; summed over live workers only."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        self._values[labelvalues] = value
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def dec(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+    def samples(self) -> Samples:
+        return {("", self._labels(key)): value for key, value in self._values.items()}
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket..., +Inf count, sum]
+        self._values: dict[LabelValues, list[float]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        state = self._values.get(labelvalues)
+        if state is None:
+            state = self._values[labelvalues] = [0.0] * (len(self.buckets) + 2)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[index] += 1
+                break
+        else:
+            state[len(self.buckets)] += 1
+        state[-1] += value
+
+    def samples(self) -> Samples:
+        samples: Samples = {}
+        for key, state in self._values.items():
+            labels = self._labels(key)
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, float("inf")), state):
+                cumulative += count
+                samples[("_bucket", (*labels, ("le", _format_bound(bound))))] = cumulative
+            samples[("_count", labels)] = cumulative
+            samples[("_sum", labels)] = state[-1]
+        return samples
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def register_collector(collector: Callable[[], None]) -> None:
+    """Run *collector* before every snapshot, e.g. to refresh gauges."""
+    _collectors.append(collector)
+
+
+# ── Application metrics ───────────────────────────────────────────────────────
+
+http_requests = Counter(
+    "http_requests",
+    "HTTP requests handled, by route template and status class.",
+    ("method", "route", "status"),
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency, by route template and status class.",
+    ("method", "route", "status"),
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled.",
+)
+
+db_pool_size = Gauge("db_pool_size", "Configured size of the connection pool.", ("pool",))
+db_pool_checked_out = Gauge("db_pool_checked_out", "Connections currently checked out.", ("pool",))
+db_pool_overflow = Gauge("db_pool_overflow", "Overflow connections currently open.", ("pool",))
+db_pool_checkout_waits = Counter(
+    "db_pool_checkout_waits",
+    "Checkouts that found the pool exhausted and had to wait for a connection.",
+    ("pool",),
+)
+db_pool_checkout_wait_seconds = Counter(
+    "db_pool_checkout_wait_seconds",
+    "Total time spent waiting for a pooled connection.",
+    ("pool",),
+)
+
+
+# ── Connection pool instrumentation ──────────────────────────────────────────
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    ``AsyncAdaptedQueuePool`` that counts checkouts which had to wait. Only
+    public pool API is used: a checkout waits when, as :meth:`connect` is
+    called, no connection is idle and the overflow is used up.
+    """
+
+    metrics_name = "default"
+
+    def connect(self):
+        exhausted = self.checkedin() == 0 and self.overflow() >= settings.db_max_overflow
+        if not exhausted:
+            return super().connect()
+
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            db_pool_checkout_waits.inc(self.metrics_name)
+            db_pool_checkout_wait_seconds.inc(
+                self.metrics_name, amount=time.perf_counter() - start
+            )
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+
+def observe_pool(name: str, get_pool: Callable[[], AsyncAdaptedQueuePool]) -> None:
+    """
+    Report size / checked-out / overflow gauges for the pool returned by
+    *get_pool* (a callable, since ``engine.dispose()`` swaps the pool).
+    """
+
+    def label(pool) -> None:
+        if isinstance(pool, InstrumentedAsyncQueuePool):
+            pool.metrics_name = name
+
+    def collect() -> None:
+        pool = get_pool()
+        label(pool)
+        db_pool_size.set(pool.size(), name)
+        db_pool_checked_out.set(pool.checkedout(), name)
+        db_pool_overflow.set(max(pool.overflow(), 0), name)
+
+    label(get_pool())
+    register_collector(collect)
+    _pools[name] = get_pool
+
+
+def pool_stats() -> dict[str, dict[str, float]]:
+    """
+    Live state of every observed pool, in this worker, plus the configured
+    ``DB_MAX_OVERFLOW`` / ``DB_POOL_RECYCLE_SECONDS`` (all pools share them).
+    """
+    stats = {}
+    for name, get_pool in _pools.items():
+        pool = get_pool()
+        stats[name] = {
+            "size": pool.size(),
+            "max_overflow": settings.db_max_overflow,
+            "timeout_seconds": pool.timeout(),
+            "recycle_seconds": settings.db_pool_recycle_seconds,
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "checkout_waits": db_pool_checkout_waits.value(name),
+            "checkout_wait_seconds": db_pool_checkout_wait_seconds.value(name),
+        }
+    return stats
+
+
+# ── Snapshots & exposition ────────────────────────────────────────────────────
+
+def snapshot() -> dict[str, Samples]:
+    for collector in _collectors:
+        try:
+            collector()
+        except Exception:
+            logger.exception("Metrics collector failed")
+    return {name: metric.samples() for name, metric in _metrics.items()}
+
+
+def _snapshot_path(directory: str, pid: int) -> Path:
+    return Path(directory) / f"{pid}.json"
+
+
+def _write_snapshot(directory: str, pid: int, data: dict[str, Samples]) -> None:
+    serializable = {
+        name: [[suffix, list(map(list, labels)), value] for (suffix, labels), value in samples.items()]
+        for name, samples in data.items()
+    }
+    path = _snapshot_path(directory, pid)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(serializable))
+    os.replace(tmp, path)  # atomic: readers never see a half-written file
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _aggregate(directory: str, own_pid: int, own: dict[str, Samples]) -> dict[str, Samples]:
+    """Sum this process' live snapshot with the files written by other workers."""
+    totals = {name: dict(samples) for name, samples in own.items()}
+    for path in Path(directory).glob("*.json"):
+        try:
+            pid = int(path.stem)
+        except ValueError:
+            continue
+        if pid == own_pid:
+            continue
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        alive = None
+        for name, samples in data.items():
+            metric = _metrics.get(name)
+            if metric is None:
+                continue
+            if metric.type == "gauge":
+                if alive is None:
+                    alive = _pid_alive(pid)
+                if not alive:
+                    continue
+            target = totals.setdefault(name, {})
+            for suffix, labels, value in samples:
+                key = (suffix, tuple(tuple(pair) for pair in labels))
+                target[key] = target.get(key, 0.0) + value
+    return totals
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render(data: dict[str, Samples]) -> str:
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines: list[str] = []
+    for name, samples in data.items():
+        metric = _metrics.get(name)
+        if metric is None:
+            continue
+        lines.append(f"# HELP {name} {_escape(metric.documentation)}")
+        lines.append(f"# TYPE {name} {metric.type}")
+        for (suffix, labels), value in sorted(samples.items()):
+            label_text = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels)
+            sample_name = f"{name}{suffix}"
+            if label_text:
+                sample_name += f"{{{label_text}}}"
+            lines.append(f"{sample_name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+async def export() -> str:
+    """Render the metrics of this worker, or of all workers in multiprocess mode."""
+    data = snapshot()
+    directory = settings.metrics_multiproc_dir
+    if directory:
+        data = await asyncio.to_thread(_aggregate, directory, os.getpid(), data)
+    return render(data)
+
+
+async def flush() -> None:
+    """Write this worker's snapshot for the others to aggregate."""
+    if settings.metrics_multiproc_dir:
+        await asyncio.to_thread(
+            _write_snapshot, settings.metrics_multiproc_dir, os.getpid(), snapshot()
+        )
+
+
+async def run_flusher(interval: float) -> None:
+    """Flush snapshots every *interval* seconds until cancelled (then once more)."""
+    os.makedirs(settings.metrics_multiproc_dir, exist_ok=True)
+    try:
+        while True:
+            try:
+                await flush()
+            except OSError:
+                logger.exception("Could not write metrics snapshot")
+            await asyncio.sleep(interval)
+    finally:
+        await flush()
@@ -0,0 +1,180 @@
+"""
+Slow-query log with optional ``EXPLAIN`` capture.
+
+Statements that take longer than the threshold are logged (JSON, logger
+``hrms.slow_query``) with their normalized SQL, the shape of their bind
+parameters, the duration and the request ID. Parameter values are never
+logged.
+
+With an explain DSN, the statement is also handed to a background task that
+runs ``EXPLAIN (FORMAT JSON)`` for it — with the original parameters, on its
+own connection, outside the pool — and logs the plan. Our managed Postgres
+doesn't allow ``auto_explain``, so this is how bad plans become visible.
+Each statement shape is explained at most once per interval, and only a
+bounded number of explains is ever queued.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Sequence
+from typing import Any
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.telemetry.context import current_request_id
+from app.telemetry.sql import normalize_statement
+
+logger = logging.getLogger("hrms.slow_query")
+
+# EXPLAIN without ANALYZE never runs the statement, but only these have a plan
+_EXPLAINABLE = ("select", "with", "insert", "update", "delete")
+
+
+def _param_shape(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shapes(parameters: Any, executemany: bool) -> Any:
+    """Types (and sequence lengths) of the bind parameters, without values."""
+    if executemany:
+        rows = list(parameters)
+        return {"rows": len(rows), "row": parameter_shapes(rows[0], False) if rows else []}
+    if isinstance(parameters, dict):
+        return {key: _param_shape(value) for key, value in parameters.items()}
+    return [_param_shape(value) for value in parameters or ()]
+
+
+class SlowQueryLog:
+    """
+    Called by the engine instrumentation for statements slower than
+    *threshold_seconds*. EXPLAIN capture is off unless *explain_database_url*
+    is given and :meth:`start` has been awaited.
+    """
+
+    def __init__(
+        self,
+        threshold_seconds: float,
+        explain_database_url: str | None = None,
+        explain_interval_seconds: float = 300.0,
+        explain_timeout_seconds: float = 5.0,
+        max_pending: int = 16,
+    ) -> None:
+        self.threshold_seconds = threshold_seconds
+        self._dsn = (
+            make_url(explain_database_url).set(drivername="postgresql").render_as_string(
+                hide_password=False
+            )
+            if explain_database_url
+            else None
+        )
+        self._interval = explain_interval_seconds
+        self._timeout = explain_timeout_seconds
+        # shape -> time.monotonic() of its last explain, oldest first
+        self._last_explained: dict[str, float] = {}
+        self._queue: asyncio.Queue | None = None
+        self._max_pending = max_pending
+        self._connection: asyncpg.Connection | None = None
+        self._task: asyncio.Task | None = None
+
+    # ── Recording (runs inside the engine's cursor events) ───────────────────
+
+    def record(self, statement: str, parameters: Any, executemany: bool, elapsed: float) -> None:
+        shape = normalize_statement(statement)
+        request_id = current_request_id()
+        logger.warning(
+            "Slow query (%.1f ms)",
+            elapsed * 1000,
+            extra={
+                "fields": {
+                    "request_id": request_id,
+                    "duration_ms": round(elapsed * 1000, 2),
+                    "sql": shape,
+                    "params": parameter_shapes(parameters, executemany),
+                }
+            },
+        )
+        if self._should_explain(shape):
+            first = list(parameters)[0] if executemany and parameters else parameters
+            try:
+                self._queue.put_nowait((statement, first, shape, request_id))
+            except asyncio.QueueFull:
+                return
+            self._mark_explained(shape)
+
+    def _mark_explained(self, shape: str) -> None:
+        """
+        Record the explain of *shape* and forget shapes whose interval has
+        passed: literal-varying SQL (e.g. ``IN`` lists of every length) would
+        otherwise grow the dict for the life of the worker.
+        """
+        now = time.monotonic()
+        self._last_explained.pop(shape, None)
+        self._last_explained[shape] = now
+        while self._last_explained:
+            oldest, explained_at = next(iter(self._last_explained.items()))
+            if now - explained_at < self._interval:
+                break
+            del self._last_explained[oldest]
+
+    def _should_explain(self, shape: str) -> bool:
+        if self._queue is None or not shape.lower().startswith(_EXPLAINABLE):
+            return False
+        last = self._last_explained.get(shape)
+        return last is None or time.monotonic() - last >= self._interval
+
+    # ── EXPLAIN worker ───────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        if self._dsn is None:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_pending)
+        self._task = asyncio.create_task(self._run(), name="slow-query-explainer")
+
+    async def stop(self) -> None:
+        self._queue = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            statement, parameters, shape, request_id = await queue.get()
+            try:
+                plan = await self._explain(statement, parameters)
+            except Exception as exc:
+                if not isinstance(exc, asyncpg.PostgresError) and self._connection is not None:
+                    # Timed out or broken: don't reuse a connection in an unknown state
+                    self._connection.terminate()
+                    self._connection = None
+                logger.warning("Could not EXPLAIN slow query: %s", exc, extra={"fields": {"sql": shape}})
+                continue
+            logger.warning(
+                "Plan of slow query",
+                extra={"fields": {"request_id": request_id, "sql": shape, "plan": plan}},
+            )
+
+    async def _explain(self, statement: str, parameters: Sequence[Any] | None) -> Any:
+        if self._connection is None or self._connection.is_closed():
+            self._connection = await asyncpg.connect(
+                self._dsn,
+                server_settings={
+                    "application_name": "hrms-slow-query-explain",
+                    "statement_timeout": str(int(self._timeout * 1000)),
+                },
+            )
+        result = await asyncio.wait_for(
+            self._connection.fetchval(f"EXPLAIN (FORMAT JSON) {statement}", *(parameters or ())),
+            self._timeout,
+        )
+        return json.loads(result) if isinstance(result, str) else result
@@ -0,0 +1,80 @@
+"""
+SQL instrumentation — per-request statement counts, DB time and repeated
+statement (N+1) detection, hooked into the engine's cursor events.
+"""
+
+import logging
+import re
+import time
+from typing import TYPE_CHECKING
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.telemetry.context import RequestTelemetry, current_request
+
+if TYPE_CHECKING:
+    from app.telemetry.slow_queries import SlowQueryLog
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER_LIST = re.compile(r"\$\d+(?:\s*,\s*\$\d+)*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Statement shape: whitespace collapsed and bind placeholder lists folded,
+    so ``IN ($1, $2, $3)`` and ``IN ($7)`` count as the same statement.
+    """
+    return _WHITESPACE.sub(" ", _PLACEHOLDER_LIST.sub("?", statement)).strip()
+
+
+def instrument_engine(
+    engine: Engine,
+    track_statements: bool = False,
+    slow_query_log: "SlowQueryLog | None" = None,
+) -> None:
+    """
+    Attribute every cursor execution on *engine* (a sync engine — pass
+    ``async_engine.sync_engine``) to the current request. With
+    *track_statements*, also count executions per statement shape for
+    :func:`warn_repeated_statements`. Statements slower than its threshold
+    go to *slow_query_log*, inside requests or not.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        if slow_query_log is not None and elapsed >= slow_query_log.threshold_seconds:
+            slow_query_log.record(statement, parameters, executemany, elapsed)
+        telemetry = current_request.get()
+        if telemetry is None:
+            return
+        telemetry.db_queries += 1
+        telemetry.db_seconds += elapsed
+        if track_statements:
+            telemetry.statement_counts[normalize_statement(statement)] += 1
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # after_cursor_execute doesn't fire for failed statements
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+
+def warn_repeated_statements(telemetry: RequestTelemetry, threshold: int) -> None:
+    """Warn about statement shapes executed more than *threshold* times."""
+    for statement, count in telemetry.statement_counts.items():
+        if count > threshold:
+            logger.warning(
+                "Possible N+1: statement ran %d times in request %s: %s",
+                count,
+                telemetry.request_id,
+                statement,
+            )
@@ -0,0 +1 @@
+"""Performance benchmarks for HRMSLite (run with ``python -m benchmarks.<name>``)."""
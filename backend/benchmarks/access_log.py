@@ -0,0 +1,156 @@
+"""
+Requests/s on ``GET /api/v1/health`` with the previous ``BaseHTTPMiddleware``
+access log versus the pure-ASGI ``LoggingMiddleware``.
+
+Requests are driven straight through the ASGI app in-process (no sockets,
+no server) and the health check's database session is replaced by a stub,
+so the numbers isolate middleware + framework overhead. Log output goes to
+``os.devnull``: synchronously for the old middleware (as before), through a
+QueueHandler/QueueListener for the new one.
+
+Usage:
+    python -m benchmarks.access_log [--requests 20000] [--concurrency 32]
+"""
+
+import argparse
+import asyncio
+import logging
+import logging.handlers
+import os
+import queue
+import time
+import uuid
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.api.v1.router import v1_router
+from app.database import get_db, get_read_db
+from app.middleware.logging import JSONFormatter, LoggingMiddleware
+
+baseline_logger = logging.getLogger("bench.baseline")
+
+
+class BaselineLoggingMiddleware(BaseHTTPMiddleware):
+    """The access-log middleware as it was before (two log lines per request)."""
+
+    async def dispatch(self, request, call_next):
+        request_id = str(uuid.uuid4())
+        start = time.perf_counter()
+        request.state.request_id = request_id
+        baseline_logger.info(
+            "→ [%s] %s %s%s", request_id, request.method, request.url.path,
+            f"?{request.url.query}" if request.url.query else "",
+        )
+        response = await call_next(request)
+        baseline_logger.info(
+            "← [%s] %s %.1f ms", request_id, response.status_code, (time.perf_counter() - start) * 1000
+        )
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+class StubSession:
+    async def execute(self, statement):
+        return None
+
+
+async def stub_db():
+    yield StubSession()
+
+
+def build_app(middleware: type | None, **options) -> FastAPI:
+    app = FastAPI()
+    app.include_router(v1_router)
+    app.dependency_overrides[get_db] = stub_db
+    app.dependency_overrides[get_read_db] = stub_db
+    if middleware is not None:
+        app.add_middleware(middleware, **options)
+    return app
+
+
+async def drive(app: FastAPI, requests: int, concurrency: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/health",
+        "raw_path": b"/api/v1/health",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+    async def send(message):
+        pass
+
+    async def request() -> None:
+        body_sent = False
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Like a real server: nothing more until the client disconnects
+            await asyncio.Event().wait()
+
+        await app(dict(scope), receive, send)
+
+    async def worker(count: int) -> None:
+        for _ in range(count):
+            await request()
+
+    start = time.perf_counter()
+    share, extra = divmod(requests, concurrency)
+    await asyncio.gather(*(worker(share + (i < extra)) for i in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--sample-rate", type=float, default=1.0, help="2xx sample rate for the new middleware")
+    args = parser.parse_args()
+
+    devnull = open(os.devnull, "w")
+    baseline_handler = logging.StreamHandler(devnull)
+    baseline_handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"))
+    baseline_logger.addHandler(baseline_handler)
+    baseline_logger.setLevel(logging.INFO)
+    baseline_logger.propagate = False
+
+    access_handler = logging.StreamHandler(devnull)
+    access_handler.setFormatter(JSONFormatter())
+    log_queue: queue.Queue = queue.Queue()
+    listener = logging.handlers.QueueListener(log_queue, access_handler)
+    access_logger = logging.getLogger("hrms.access")
+    access_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
+    listener.start()
+
+    cases = [
+        ("no middleware", build_app(None)),
+        ("BaseHTTPMiddleware (before)", build_app(BaselineLoggingMiddleware)),
+        ("pure ASGI (after)", build_app(LoggingMiddleware, sample_rate_2xx=args.sample_rate)),
+    ]
+    print(f"{args.requests:,} requests, concurrency {args.concurrency}, 2xx sample rate {args.sample_rate}")
+    results = {}
+    for label, app in cases:
+        asyncio.run(drive(app, min(1000, args.requests), args.concurrency))  # warm-up
+        results[label] = asyncio.run(drive(app, args.requests, args.concurrency))
+        print(f"  {label:<30} {results[label]:10,.0f} req/s")
+    listener.stop()
+
+    before, after = results["BaseHTTPMiddleware (before)"], results["pure ASGI (after)"]
+    print(f"  {'gain':<30} {(after / before - 1) * 100:+10.1f} %")
+
+
+if __name__ == "__main__":
+    main()
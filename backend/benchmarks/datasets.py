@@ -0,0 +1,135 @@
+"""
+Deterministic synthetic datasets for the database benchmarks.
+
+Rows are generated inside Postgres (``generate_series``), so even the 25M-row
+dataset never travels over the wire. Every value is a pure function of the
+employee number and the day, so two runs at the same size produce identical
+tables and comparable timings.
+
+Seeding TRUNCATEs the application tables: only ever point it at a throwaway
+database.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.repositories.attendance import AttendanceRepository
+from app.services.employee import EMPLOYEE_ID_PREFIX
+
+# Last day of every dataset (also "today" for the dashboard benchmark)
+ANCHOR_DATE = date(2026, 6, 30)
+PRESENT_PERCENT = 85
+
+DEPARTMENTS = (
+    "Engineering", "Marketing", "Sales", "Human Resources", "Finance",
+    "Operations", "Customer Support", "Product Management", "Design", "Legal",
+)
+
+
+@dataclass(frozen=True)
+class Dataset:
+    name: str
+    employees: int
+    days: int
+
+    @property
+    def attendance_rows(self) -> int:
+        return self.employees * self.days
+
+    @property
+    def first_date(self) -> date:
+        return ANCHOR_DATE - timedelta(days=self.days - 1)
+
+    @property
+    def marker(self) -> str:
+        return f"benchmark dataset {self.name}: {self.employees} employees x {self.days} days"
+
+
+DATASETS = {
+    dataset.name: dataset
+    for dataset in (
+        Dataset("small", employees=1_000, days=250),       # 250k attendance rows
+        Dataset("medium", employees=10_000, days=250),     # 2.5M
+        Dataset("large", employees=50_000, days=500),      # 25M
+    )
+}
+
+
+def employee_code(number: int) -> str:
+    """Same format as ``format_employee_id``; the SQL below must agree with it."""
+    return f"{EMPLOYEE_ID_PREFIX}{number:04d}"
+
+
+_INSERT_EMPLOYEES = text(
+    f"""
+    INSERT INTO employees (employee_id, full_name, email, department)
+    SELECT
+        '{EMPLOYEE_ID_PREFIX}' || lpad(n::text, greatest(4, length(n::text)), '0'),
+        'Employee ' || n,
+        'employee' || n || '@bench.example.com',
+        (CAST(:departments AS text[]))[1 + n % {len(DEPARTMENTS)}]
+    FROM generate_series(1, :count) AS n
+    ORDER BY n
+    """
+)
+
+# Deterministic ~PRESENT_PERCENT% present rate from a cheap hash of (employee, day)
+_INSERT_ATTENDANCE = text(
+    f"""
+    INSERT INTO attendance (employee_id, date, status)
+    SELECT
+        e.id,
+        d::date,
+        CASE
+            WHEN (e.id * 2654435761 + (d::date - DATE '2000-01-01') * 40503) % 100 < {PRESENT_PERCENT}
+            THEN 'PRESENT'::attendance_status
+            ELSE 'ABSENT'::attendance_status
+        END
+    FROM generate_series(CAST(:start AS date), CAST(:end AS date), INTERVAL '1 day') AS d
+    CROSS JOIN employees AS e
+    ORDER BY d, e.id
+    """
+)
+
+
+async def current_marker(engine: AsyncEngine) -> str | None:
+    async with engine.connect() as conn:
+        result = await conn.execute(text("SELECT obj_description('attendance'::regclass, 'pg_class')"))
+        return result.scalar()
+
+
+async def seed(engine: AsyncEngine, dataset: Dataset, progress=print) -> None:
+    """Replace all application data with *dataset*, one month per transaction."""
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "TRUNCATE employees, attendance, employee_attendance_counters, "
+                "attendance_monthly_rollup RESTART IDENTITY CASCADE"
+            )
+        )
+        await conn.execute(_INSERT_EMPLOYEES, {"departments": list(DEPARTMENTS), "count": dataset.employees})
+        await conn.execute(text("SELECT setval('employee_code_seq', :count)"), {"count": dataset.employees})
+    progress(f"  {dataset.employees:,} employees")
+
+    # Real monthly partitions rather than everything in attendance_default
+    async with AsyncSession(engine) as session:
+        await AttendanceRepository(session).ensure_partitions(dataset.first_date, ANCHOR_DATE)
+        await session.commit()
+
+    # Month-sized statements keep the triggers' transition tables bounded
+    start, written = dataset.first_date, 0
+    while start <= ANCHOR_DATE:
+        end = min((start.replace(day=1) + timedelta(days=32)).replace(day=1) - timedelta(days=1), ANCHOR_DATE)
+        async with engine.begin() as conn:
+            await conn.execute(_INSERT_ATTENDANCE, {"start": start, "end": end})
+        written += ((end - start).days + 1) * dataset.employees
+        progress(f"  {written:,} / {dataset.attendance_rows:,} attendance rows")
+        start = end + timedelta(days=1)
+
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE"))
+        await conn.execute(text(f"COMMENT ON TABLE attendance IS '{dataset.marker}'"))
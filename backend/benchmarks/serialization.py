@@ -0,0 +1,123 @@
+"""
+Per-row cost of serializing list responses: the old per-object path versus the
+trusted-row fast path used by the list endpoints.
+
+Old path (what ``GET /attendance`` used to do for every row):
+    AttendanceResponse.model_validate(orm_obj) + setting employee_name/code,
+    then FastAPI's response_model validation + jsonable_encoder, then json.dumps.
+
+Fast path:
+    plain dict rows from a Core projection -> one ``dumps()`` call.
+
+No database is needed; rows are synthesized in memory.
+
+Usage:
+    python -m benchmarks.serialization [--rows 100000] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.responses import dumps, orjson
+from app.models.attendance import AttendanceStatus
+from app.schemas.attendance import AttendanceResponse
+from app.schemas.employee import EmployeeResponse
+
+
+def make_attendance(count: int) -> tuple[list, list[dict]]:
+    """The same rows as ORM-like objects (with an employee) and as plain dicts."""
+    now = datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc)
+    objects, rows = [], []
+    for i in range(count):
+        employee = SimpleNamespace(full_name=f"Employee {i % 500}", employee_id=f"EMP-{i % 500:04d}")
+        values = {
+            "id": i + 1,
+            "employee_id": i % 500 + 1,
+            "date": date(2026, 1, 1) + timedelta(days=i // 500),
+            "status": AttendanceStatus.PRESENT if i % 7 else AttendanceStatus.ABSENT,
+            "created_at": now,
+            "updated_at": now,
+        }
+        objects.append(SimpleNamespace(**values, employee=employee))
+        rows.append({**values, "employee_name": employee.full_name, "employee_code": employee.employee_id})
+    return objects, rows
+
+
+def make_employees(count: int) -> tuple[list, list[dict]]:
+    now = datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc)
+    rows = [
+        {
+            "id": i + 1,
+            "employee_id": f"EMP-{i + 1:04d}",
+            "full_name": f"Employee {i}",
+            "email": f"employee{i}@company.com",
+            "department": "Engineering",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+    return [SimpleNamespace(**row) for row in rows], rows
+
+
+async def old_attendance(objects: list, field) -> bytes:
+    items = []
+    for record in objects:
+        item = AttendanceResponse.model_validate(record)
+        item.employee_name = record.employee.full_name
+        item.employee_code = record.employee.employee_id
+        items.append(item)
+    content = await serialize_response(field=field, response_content=items)
+    return JSONResponse(content).body
+
+
+async def old_employees(objects: list, field) -> bytes:
+    items = [EmployeeResponse.model_validate(e) for e in objects]
+    content = await serialize_response(field=field, response_content=items)
+    return JSONResponse(content).body
+
+
+def measure(label: str, rows: int, repeat: int, run) -> float:
+    best = min(_timed(run) for _ in range(repeat))
+    print(f"  {label:<10} {best * 1e3:9.1f} ms total  {best / rows * 1e6:7.2f} µs/row")
+    return best
+
+
+def _timed(run) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{args.rows:,} rows, best of {args.repeat}; serializer: {'orjson' if orjson else 'pydantic-core'}")
+    cases = [
+        ("attendance", make_attendance, old_attendance, List[AttendanceResponse]),
+        ("employees", make_employees, old_employees, List[EmployeeResponse]),
+    ]
+    for name, make, old, response_type in cases:
+        objects, rows = make(args.rows)
+        field = create_response_field(name="Response", type_=response_type)
+        assert asyncio.run(old(objects, field)) == dumps(rows), "paths disagree"
+
+        print(f"\n{name}")
+        before = measure("before", args.rows, args.repeat, lambda: asyncio.run(old(objects, field)))
+        after = measure("after", args.rows, args.repeat, lambda: dumps(rows))
+        print(f"  speed-up   {before / after:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
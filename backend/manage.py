@@ -0,0 +1,186 @@
+"""Maintenance commands for HRMSLite.
+
+Usage:
+    python manage.py attendance-counters verify
+    python manage.py attendance-counters rebuild
+    python manage.py attendance-partitions list
+    python manage.py attendance-partitions ensure [--from YYYY-MM] [--months-ahead N]
+    python manage.py attendance-partitions detach --before YYYY-MM [--drop]
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import date, datetime, timedelta
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal, engine
+from app.repositories.attendance import AttendanceRepository, partition_month
+from app.repositories.table_version import TableVersionRepository
+
+
+# ── attendance-counters ───────────────────────────────────────────────────────
+
+async def verify_attendance_counters(args: argparse.Namespace) -> int:
+    """Report counters and monthly rollups that disagree with the attendance table."""
+    async with AsyncSessionLocal() as session:
+        repo = AttendanceRepository(session)
+        drift = await repo.find_counter_drift()
+        rollup_drift = await repo.find_rollup_drift()
+
+    if not drift and not rollup_drift:
+        print("✓ Attendance counters and monthly rollups match the attendance table.")
+        return 0
+
+    if drift:
+        print(f"✗ {len(drift)} employee(s) with drifted counters:")
+        for row in drift:
+            print(
+                f"  employee {row.employee_id}: "
+                f"stored present/absent/total = "
+                f"{row.stored_present}/{row.stored_absent}/{row.stored_total}, "
+                f"actual = {row.actual_present}/{row.actual_absent}/{row.actual_total}"
+            )
+    if rollup_drift:
+        print(f"✗ {len(rollup_drift)} drifted monthly rollup row(s):")
+        for row in rollup_drift:
+            print(
+                f"  employee {row.employee_id}, {row.month:%Y-%m}: "
+                f"stored present/absent = {row.stored_present}/{row.stored_absent}, "
+                f"actual = {row.actual_present}/{row.actual_absent}"
+            )
+    print("\nRun `python manage.py attendance-counters rebuild` to fix them.")
+    return 1
+
+
+async def rebuild_attendance_counters(args: argparse.Namespace) -> int:
+    """Recompute all counters and monthly rollups from the attendance table."""
+    async with AsyncSessionLocal() as session:
+        try:
+            count = await AttendanceRepository(session).rebuild_counters()
+            # Summaries served from the counters may change: refresh their ETags
+            await TableVersionRepository(session).bump("attendance")
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+    print(f"✓ Rebuilt attendance counters for {count} employee(s).")
+    return 0
+
+
+# ── attendance-partitions ─────────────────────────────────────────────────────
+
+def month_argument(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM, got {value!r}")
+
+
+async def list_attendance_partitions(args: argparse.Namespace) -> int:
+    """Print every attendance partition with its estimated row count."""
+    async with AsyncSessionLocal() as session:
+        partitions = await AttendanceRepository(session).list_partitions()
+    for row in partitions:
+        month = partition_month(row.name)
+        label = f"{month:%Y-%m}" if month else "default"
+        print(f"  {label:<8} {row.name:<24} ~{row.estimated_rows:,} rows")
+    return 0
+
+
+async def ensure_attendance_partitions(args: argparse.Namespace) -> int:
+    """Create missing monthly partitions from --from (default: this month) onwards."""
+    first = args.from_month or date.today().replace(day=1)
+    last = date.today().replace(day=1)
+    for _ in range(args.months_ahead):
+        last = (last + timedelta(days=32)).replace(day=1)
+    async with AsyncSessionLocal() as session:
+        try:
+            created = await AttendanceRepository(session).ensure_partitions(first, max(first, last))
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+    print(f"✓ Created {len(created)} partition(s){': ' + ', '.join(created) if created else ''}.")
+    return 0
+
+
+async def detach_attendance_partitions(args: argparse.Namespace) -> int:
+    """Retention: detach (or drop) the partitions of months before --before."""
+    async with AsyncSessionLocal() as session:
+        try:
+            removed = await AttendanceRepository(session).detach_partitions_before(args.before, drop=args.drop)
+            if removed:
+                # Lists and summaries change without any row-level write: refresh their ETags
+                await TableVersionRepository(session).bump("attendance")
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+    if not removed:
+        print(f"✓ No partitions before {args.before:%Y-%m}.")
+        return 0
+    action = "Dropped" if args.drop else "Detached"
+    print(f"✓ {action} {len(removed)} partition(s): {', '.join(removed)}")
+    if not args.drop:
+        print("  The tables still exist outside `attendance`; archive or DROP them when done.")
+    return 0
+
+
+# ── Entry point ───────────────────────────────────────────────────────────────
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="HRMSLite maintenance commands.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    counters = commands.add_parser(
+        "attendance-counters", help="Check or rebuild the attendance counters and monthly rollups."
+    )
+    counters_actions = counters.add_subparsers(dest="action", required=True)
+    counters_actions.add_parser("verify", help="Report drift without changing anything.").set_defaults(
+        handler=verify_attendance_counters
+    )
+    counters_actions.add_parser("rebuild", help="Recompute every counter.").set_defaults(
+        handler=rebuild_attendance_counters
+    )
+
+    partitions = commands.add_parser(
+        "attendance-partitions", help="Manage the monthly partitions of the attendance table."
+    )
+    partitions_actions = partitions.add_subparsers(dest="action", required=True)
+    partitions_actions.add_parser("list", help="List partitions and estimated sizes.").set_defaults(
+        handler=list_attendance_partitions
+    )
+    ensure = partitions_actions.add_parser("ensure", help="Create missing monthly partitions.")
+    ensure.add_argument(
+        "--from", dest="from_month", type=month_argument, help="first month (YYYY-MM, default: this month)"
+    )
+    ensure.add_argument(
+        "--months-ahead", type=int, default=get_settings().attendance_partition_months_ahead,
+        help="months after this one to create",
+    )
+    ensure.set_defaults(handler=ensure_attendance_partitions)
+    detach = partitions_actions.add_parser(
+        "detach", help="Remove months before --before from attendance, adjusting counters and rollups."
+    )
+    detach.add_argument("--before", type=month_argument, required=True, help="first month to keep (YYYY-MM)")
+    detach.add_argument("--drop", action="store_true", help="drop the detached tables")
+    detach.set_defaults(handler=detach_attendance_partitions)
+
+    return parser
+
+
+async def run(args: argparse.Namespace) -> int:
+    try:
+        return await args.handler(args)
+    finally:
+        await engine.dispose()
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,39 @@
-"""Seed script to populate database with 100 employees and attendance records."""
+"""
+Seed the database with synthetic employees and attendance records.
 
+Rows are generated in a process pool as COPY-ready chunks and streamed into
+Postgres with asyncpg's ``COPY`` over several connections, so memory stays
+bounded by the chunks in flight and millions of rows load in about a minute.
+The same options and ``--seed`` always produce the same data.
+
+Each chunk commits on its own: an interrupted run leaves the chunks loaded
+so far in place.
+
+Usage:
+    python seed_data.py [--employees 100] [--days 30] [--present-rate 0.85] [--seed 42]
+                        [--include-weekends] [--workers N] [--connections 4] [--chunk-rows 250000]
+
+Example (10M attendance rows):
+    python seed_data.py --employees 40000 --days 250 --include-weekends
+"""
+
+import argparse
 import asyncio
-from datetime import date, timedelta
+import io
+import os
 import random
-from sqlalchemy.ext.asyncio import AsyncSession
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
 
-from app.database import AsyncSessionLocal
-from app.models.employee import Employee
-from app.models.attendance import Attendance, AttendanceStatus
+import asyncpg
+from sqlalchemy.engine import make_url
 
+from app.config import get_settings
+from app.database import AsyncSessionLocal, engine
+from app.repositories.attendance import AttendanceRepository
+from app.services.employee import format_employee_id
 
 # Sample data for generating realistic employees
 FIRST_NAMES = [
@@ -48,125 +73,209 @@ DEPARTMENTS = [
     "Operations", "Customer Support", "Product Management", "Design", "Legal"
 ]
 
+EMPLOYEE_COLUMNS = ["id", "employee_id", "full_name", "email", "department"]
+ATTENDANCE_COLUMNS = ["employee_id", "date", "status"]
+EMPLOYEE_CHUNK = 50_000
+
+
+# ── Generation (runs in worker processes) ─────────────────────────────────────
+# Workers return rows in COPY text format: tab-separated, newline-terminated.
+
+def generate_employees(seed: int, start: int, keys: list[tuple[int, int]]) -> tuple[bytes, int]:
+    """Employees for ``(id, code number)`` pairs; *start* is the first pair's index."""
+    lines = []
+    for index, (pk, number) in enumerate(keys, start):
+        rng = random.Random(f"{seed}:employee:{index}")
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        email = f"{first_name.lower()}.{last_name.lower()}{number}@company.com"
+        lines.append(
+            f"{pk}\t{format_employee_id(number)}\t{first_name} {last_name}\t{email}\t{rng.choice(DEPARTMENTS)}\n"
+        )
+    return "".join(lines).encode(), len(lines)
+
 
-async def generate_employee_id(session: AsyncSession, index: int) -> str:
-    """Generate employee ID in format EMP-0001, EMP-0002, etc."""
-    return f"EMP-{index:04d}"
-
-
-async def seed_employees(session: AsyncSession, count: int = 100):
-    """Create employees with realistic data."""
-    from sqlalchemy import select, func
-    
-    # Check existing employee count to start from next ID
-    result = await session.execute(select(func.max(Employee.employee_id)))
-    max_id = result.scalar()
-    
-    start_index = 1
-    if max_id:
-        # Extract number from EMP-XXXX format
-        try:
-            start_index = int(max_id.split('-')[1]) + 1
-        except:
-            start_index = 1
-    
-    print(f"Creating {count} employees starting from EMP-{start_index:04d}...")
-    
-    employees = []
-    for i in range(count):
-        emp_num = start_index + i
-        first_name = random.choice(FIRST_NAMES)
-        last_name = random.choice(LAST_NAMES)
-        full_name = f"{first_name} {last_name}"
-        email = f"{first_name.lower()}.{last_name.lower()}{emp_num}@company.com"
-        department = random.choice(DEPARTMENTS)
-        employee_id = f"EMP-{emp_num:04d}"
-        
-        employee = Employee(
-            employee_id=employee_id,
-            full_name=full_name,
-            email=email,
-            department=department
+def generate_attendance(
+    seed: int, employee_ids: list[int], days: list[str], present_rate: float
+) -> tuple[bytes, int]:
+    """One record per employee per day; statuses depend only on the seed and employee."""
+    lines = []
+    for employee_id in employee_ids:
+        draw = random.Random(f"{seed}:attendance:{employee_id}").random
+        prefix = f"{employee_id}\t"
+        lines.extend(
+            f"{prefix}{day}\t{'PRESENT' if draw() < present_rate else 'ABSENT'}\n" for day in days
         )
-        employees.append(employee)
-        
-        if (i + 1) % 10 == 0:
-            print(f"  Generated {i + 1}/{count} employees...")
-    
-    session.add_all(employees)
-    await session.flush()
-    print(f"✓ Created {count} employees")
-    return employees
-
-
-async def seed_attendance(session: AsyncSession, employees: list[Employee], days: int = 30):
-    """Create attendance records for the past N days."""
-    print(f"\nCreating attendance records for past {days} days...")
-    
-    today = date.today()
-    attendance_records = []
-    
-    for day_offset in range(days):
-        attendance_date = today - timedelta(days=day_offset)
-        
-        # Skip weekends (optional - remove if you want weekend attendance)
-        if attendance_date.weekday() >= 5:  # 5=Saturday, 6=Sunday
-            continue
-        
-        for employee in employees:
-            # 85% chance of being present (realistic attendance rate)
-            status = AttendanceStatus.PRESENT if random.random() < 0.85 else AttendanceStatus.ABSENT
-            
-            attendance = Attendance(
-                employee_id=employee.id,
-                date=attendance_date,
-                status=status
+    return "".join(lines).encode(), len(lines)
+
+
+# ── Loading ───────────────────────────────────────────────────────────────────
+
+class Progress:
+    """Single-line progress / throughput display."""
+
+    def __init__(self, label: str, total: int) -> None:
+        self.label = label
+        self.total = total
+        self.done = 0
+        self.started = time.perf_counter()
+        self._last_draw = 0.0
+        self._tty = sys.stdout.isatty()
+
+    def advance(self, rows: int) -> None:
+        self.done += rows
+        now = time.perf_counter()
+        if self._tty and (now - self._last_draw >= 0.2 or self.done == self.total):
+            self._last_draw = now
+            sys.stdout.write(f"\r{self._line(now)}\033[K")
+            sys.stdout.flush()
+
+    def finish(self) -> None:
+        line = self._line(time.perf_counter())
+        print(f"\r{line}\033[K" if self._tty else line)
+
+    def _line(self, now: float) -> str:
+        elapsed = max(now - self.started, 1e-9)
+        rate = self.done / elapsed
+        eta = (self.total - self.done) / rate if rate else 0.0
+        percent = self.done / self.total * 100 if self.total else 100.0
+        return (
+            f"  {self.label}: {self.done:,}/{self.total:,} ({percent:5.1f}%)  "
+            f"{rate:,.0f} rows/s  elapsed {elapsed:.0f}s  eta {eta:.0f}s"
+        )
+
+
+async def copy_chunks(
+    pool: asyncpg.Pool,
+    executor: ProcessPoolExecutor,
+    table: str,
+    columns: list[str],
+    jobs,
+    progress: Progress,
+    max_in_flight: int,
+) -> None:
+    """Generate *jobs* (``(function, *args)``) in *executor* and COPY each result into *table*."""
+    loop = asyncio.get_running_loop()
+
+    async def load(generated: asyncio.Future) -> None:
+        data, rows = await generated
+        async with pool.acquire() as connection:
+            await connection.copy_to_table(table, source=io.BytesIO(data), columns=columns, format="text")
+        progress.advance(rows)
+
+    pending: set[asyncio.Task] = set()
+    for job in jobs:
+        if len(pending) >= max_in_flight:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()  # surface the first failure
+        pending.add(asyncio.create_task(load(loop.run_in_executor(executor, *job))))
+    await asyncio.gather(*pending)
+    progress.finish()
+
+
+async def ensure_partitions(days: list[str]) -> None:
+    """Monthly attendance partitions for every seeded day, so nothing lands in the default one."""
+    if not days:
+        return
+    try:
+        async with AsyncSessionLocal() as session:
+            await AttendanceRepository(session).ensure_partitions(
+                date.fromisoformat(min(days)), date.fromisoformat(max(days))
             )
-            attendance_records.append(attendance)
-        
-        if (day_offset + 1) % 5 == 0:
-            print(f"  Generated attendance for {day_offset + 1}/{days} days...")
-    
-    session.add_all(attendance_records)
-    await session.flush()
-    print(f"✓ Created {len(attendance_records)} attendance records")
-
-
-async def main():
-    """Main seeding function."""
-    print("=" * 60)
-    print("DATABASE SEEDING SCRIPT")
-    print("=" * 60)
-    print("\nThis will add 100 employees and their attendance records.")
-    print("Press Ctrl+C to cancel...\n")
-    
-    await asyncio.sleep(2)  # Give user time to cancel
-    
-    async with AsyncSessionLocal() as session:
-        try:
-            # Create employees
-            employees = await seed_employees(session, count=100)
-            
-            # Create attendance records for past 30 days
-            await seed_attendance(session, employees, days=30)
-            
-            # Commit all changes
             await session.commit()
-            
-            print("\n" + "=" * 60)
-            print("✓ SEEDING COMPLETED SUCCESSFULLY!")
-            print("=" * 60)
-            print(f"\nSummary:")
-            print(f"  • 100 employees created")
-            print(f"  • Attendance marked for past 30 days (weekdays only)")
-            print(f"  • Average attendance rate: ~85%")
-            print(f"\nYou can now view the data in your application!")
-            
-        except Exception as e:
-            await session.rollback()
-            print(f"\n✗ ERROR: {e}")
-            raise
+    finally:
+        await engine.dispose()
+
+
+def attendance_days(days: int, include_weekends: bool, today: date) -> list[str]:
+    """ISO dates of the past *days* calendar days, weekends skipped unless asked for."""
+    dates = (today - timedelta(days=offset) for offset in range(days))
+    return [day.isoformat() for day in dates if include_weekends or day.weekday() < 5]
+
+
+async def seed(args: argparse.Namespace) -> None:
+    settings = get_settings()
+    dsn = make_url(settings.database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+    days = attendance_days(args.days, args.include_weekends, date.today())
+    total_attendance = args.employees * len(days)
+    print(
+        f"Seeding {args.employees:,} employees × {len(days)} days = {total_attendance:,} attendance "
+        f"records (seed {args.seed}, {args.workers} workers, {args.connections} connections)"
+    )
+
+    await ensure_partitions(days)
+    pool = await asyncpg.create_pool(dsn, min_size=args.connections, max_size=args.connections)
+    try:
+        # Primary keys and employee codes come from the same sequences the API uses
+        keys = [
+            (row[0], row[1])
+            for row in await pool.fetch(
+                "SELECT nextval(pg_get_serial_sequence('employees', 'id')), nextval('employee_code_seq') "
+                "FROM generate_series(1, $1)",
+                args.employees,
+            )
+        ]
+        if keys:
+            print(f"  Employee IDs {format_employee_id(keys[0][1])} … {format_employee_id(keys[-1][1])}")
+
+        max_in_flight = args.workers + args.connections
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            await copy_chunks(
+                pool, executor, "employees", EMPLOYEE_COLUMNS,
+                (
+                    (generate_employees, args.seed, start, keys[start:start + EMPLOYEE_CHUNK])
+                    for start in range(0, len(keys), EMPLOYEE_CHUNK)
+                ),
+                Progress("employees", len(keys)),
+                max_in_flight,
+            )
+
+            employee_ids = [pk for pk, _ in keys]
+            per_chunk = max(1, args.chunk_rows // max(len(days), 1))
+            await copy_chunks(
+                pool, executor, "attendance", ATTENDANCE_COLUMNS,
+                (
+                    (generate_attendance, args.seed, employee_ids[start:start + per_chunk], days, args.present_rate)
+                    for start in range(0, len(employee_ids), per_chunk)
+                ) if days else (),
+                Progress("attendance", total_attendance),
+                max_in_flight,
+            )
+
+        # Fresh statistics so the first queries against the new data plan well
+        await pool.execute("ANALYZE employees")
+        await pool.execute("ANALYZE attendance")
+    finally:
+        await pool.close()
+    print("✓ Seeding completed")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=100, help="employees to create (default: 100)")
+    parser.add_argument("--days", type=int, default=30, help="calendar days of history, ending today (default: 30)")
+    parser.add_argument("--present-rate", type=float, default=0.85, help="share of PRESENT records (default: 0.85)")
+    parser.add_argument("--seed", type=int, default=None, help="random seed (default: random, printed)")
+    parser.add_argument("--include-weekends", action="store_true", help="also mark Saturdays and Sundays")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="generator processes")
+    parser.add_argument("--connections", type=int, default=4, help="concurrent COPY connections")
+    parser.add_argument("--chunk-rows", type=int, default=250_000, help="attendance rows per COPY")
+    args = parser.parse_args(argv)
+
+    if not 0.0 <= args.present_rate <= 1.0:
+        parser.error("--present-rate must be between 0 and 1")
+    for option in ("employees", "days", "workers", "connections", "chunk_rows"):
+        if getattr(args, option) < (0 if option in ("employees", "days") else 1):
+            parser.error(f"--{option.replace('_', '-')} is out of range")
+    if args.seed is None:
+        args.seed = random.randrange(2**31)
+    return args
+
+
+def main() -> None:
+    asyncio.run(seed(parse_args()))
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
@@ -0,0 +1,6 @@
+import os
+
+# Importing the app must not need a database or a cache listener
+os.environ.setdefault("CACHE_INVALIDATION_CHANNEL", "")
+os.environ.setdefault("SLOW_QUERY_THRESHOLD_MS", "0")
+os.environ.setdefault("READ_DATABASE_URL", "")
@@ -0,0 +1,85 @@
+"""Bulk marking when an employee is deleted after its id was looked up."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.cache import _PENDING_KEY
+from app.models.attendance import AttendanceStatus
+from app.repositories.attendance import AttendanceRepository
+from app.repositories.employee import EmployeeRepository
+from app.schemas.attendance import AttendanceBulkCreate
+from app.services.attendance import ATTENDANCE_EMPLOYEE_FK, AttendanceService
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.sync_session = SimpleNamespace(info={})
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+
+def foreign_key_violation() -> IntegrityError:
+    cause = Exception("ForeignKeyViolationError")
+    cause.constraint_name = ATTENDANCE_EMPLOYEE_FK
+    orig = Exception("insert or update on table violates foreign key constraint")
+    orig.__cause__ = cause
+    return IntegrityError("INSERT INTO attendance ...", {}, orig)
+
+
+@pytest.fixture
+def database(monkeypatch):
+    """EMP-0002 (id 2) is deleted once the first lookup has returned."""
+    state = {"lookups": 0, "upserts": []}
+
+    async def get_ids_by_employee_ids(self, codes):
+        state["lookups"] += 1
+        live = {"EMP-0001": 1} if state["lookups"] > 1 else {"EMP-0001": 1, "EMP-0002": 2}
+        return {code: live[code] for code in codes if code in live}
+
+    async def bulk_upsert(self, rows, update_existing=False):
+        if any(row["employee_id"] == 2 for row in rows):
+            raise foreign_key_violation()
+        state["upserts"].append(rows)
+        return [
+            SimpleNamespace(employee_id=row["employee_id"], date=row["date"], id=10, inserted=True)
+            for row in rows
+        ]
+
+    monkeypatch.setattr(EmployeeRepository, "get_ids_by_employee_ids", get_ids_by_employee_ids)
+    monkeypatch.setattr(AttendanceRepository, "bulk_upsert", bulk_upsert)
+    return state
+
+
+def test_deleted_employee_is_reported_unknown(database):
+    payload = AttendanceBulkCreate(
+        records=[
+            {"employee_id": "EMP-0001", "date": date(2026, 10, 18), "status": AttendanceStatus.PRESENT},
+            {"employee_id": "EMP-0002", "date": date(2026, 10, 18), "status": AttendanceStatus.ABSENT},
+        ]
+    )
+    response = asyncio.run(AttendanceService(FakeSession()).bulk_mark_attendance(payload))
+
+    assert [item.result for item in response.results] == ["inserted", "unknown_employee"]
+    assert (response.inserted, response.unknown_employees) == (1, 1)
+    assert [[row["employee_id"] for row in rows] for rows in database["upserts"]] == [[1]]
+
+
+def test_rolled_back_savepoint_keeps_pending_invalidations():
+    session = Session(create_engine("sqlite://"))
+    session.execute(text("SELECT 1"))
+    session.info[_PENDING_KEY] = {"dashboard_stats": None}
+    with pytest.raises(ValueError):
+        with session.begin_nested():
+            raise ValueError
+    assert _PENDING_KEY in session.info
+    session.rollback()
+    assert _PENDING_KEY not in session.info
@@ -0,0 +1,54 @@
+"""Dashboard stats cached from a lagging replica never hide a newer write."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.repositories.dashboard import DashboardRepository
+from app.repositories.table_version import TableVersionRepository
+from app.services.dashboard import DashboardService, dashboard_stats_cache
+
+
+class Snapshot:
+    """What one session sees: table versions and the present-today count."""
+
+    def __init__(self, attendance_version: int, present_today: int) -> None:
+        self.versions = {"employees": 1, "attendance": attendance_version}
+        self.present_today = present_today
+
+
+@pytest.fixture(autouse=True)
+def fake_database(monkeypatch):
+    async def get_versions(self, tables):
+        return self._db.versions
+
+    async def get_stats(self, today):
+        return SimpleNamespace(
+            total_employees=1,
+            present_today=self._db.present_today,
+            absent_today=0,
+            total_attendance_records=self._db.present_today,
+        )
+
+    monkeypatch.setattr(TableVersionRepository, "get_versions", get_versions)
+    monkeypatch.setattr(DashboardRepository, "get_stats", get_stats)
+    dashboard_stats_cache.invalidate()
+    yield
+    dashboard_stats_cache.invalidate()
+
+
+def present_today(snapshot: Snapshot) -> int:
+    return asyncio.run(DashboardService(snapshot).get_stats()).present_today
+
+
+def test_stale_replica_load_is_not_served_to_readers_of_the_write():
+    # The write committed (and cleared the cache); the replica hasn't replayed it yet
+    assert present_today(Snapshot(attendance_version=1, present_today=0)) == 0
+    # The primary, or the caught-up replica, sees the new version: cache miss
+    assert present_today(Snapshot(attendance_version=2, present_today=1)) == 1
+
+
+def test_same_versions_hit_the_cache():
+    assert present_today(Snapshot(attendance_version=3, present_today=5)) == 5
+    assert present_today(Snapshot(attendance_version=3, present_today=99)) == 5
@@ -0,0 +1,45 @@
+"""Auto-numbered employee creates are a single INSERT."""
+
+import asyncio
+
+from sqlalchemy.dialects import postgresql
+
+from app.schemas.employee import EmployeeCreate
+from app.services.employee import EmployeeService
+
+
+class RecordingSession:
+    """Answers every statement with "no row", except the *succeed_on*-th one."""
+
+    def __init__(self, succeed_on: int) -> None:
+        self.statements: list[str] = []
+        self._succeed_on = succeed_on
+        self.sync_session = type("SyncSession", (), {"info": {}})()
+
+    async def execute(self, statement):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        row = "employee" if len(self.statements) == self._succeed_on else None
+
+        class Result:
+            def scalar_one_or_none(self):
+                return row
+
+        return Result()
+
+
+def test_code_is_generated_inside_the_insert():
+    session = RecordingSession(succeed_on=1)
+    payload = EmployeeCreate(full_name="Ada Lovelace", email="ada@example.com", department="Engineering")
+    assert asyncio.run(EmployeeService(session).create_employee(payload)) == "employee"
+
+    [statement] = session.statements
+    assert statement.startswith("INSERT INTO employees")
+    assert "nextval('employee_code_seq')" in statement
+    assert "ON CONFLICT (employee_id) DO NOTHING RETURNING" in statement
+
+
+def test_taken_code_is_retried_with_the_next_number():
+    session = RecordingSession(succeed_on=2)
+    payload = EmployeeCreate(full_name="Ada Lovelace", email="ada@example.com", department="Engineering")
+    assert asyncio.run(EmployeeService(session).create_employee(payload)) == "employee"
+    assert len(session.statements) == 2
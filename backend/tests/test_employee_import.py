@@ -0,0 +1,34 @@
+"""CSV import parsing: rows are numbered by the line they start on."""
+
+import asyncio
+
+from app.services.employee import _iter_csv_rows
+
+
+def parse(data: bytes, chunk_size: int = 7) -> list[tuple[int, list[str]]]:
+    async def chunks():
+        for offset in range(0, len(data), chunk_size):
+            yield data[offset : offset + chunk_size]
+
+    async def collect():
+        return [row async for row in _iter_csv_rows(chunks())]
+
+    return asyncio.run(collect())
+
+
+def test_quoted_fields_may_span_lines():
+    data = b'id,name\r\n\r\nE1,"Doe,\r\nJane"\nE2,"said ""hi""\n\nbye"\nE3,Lee\n'
+    assert parse(data) == [
+        (1, ["id", "name"]),
+        (3, ["E1", "Doe,\nJane"]),
+        (5, ["E2", 'said "hi"\n\nbye']),
+        (8, ["E3", "Lee"]),
+    ]
+
+
+def test_stray_quote_in_unquoted_field_is_literal():
+    assert parse(b'E1,O"Brien\nE2,Lee') == [(1, ["E1", 'O"Brien']), (2, ["E2", "Lee"])]
+
+
+def test_unterminated_quoted_field_ends_the_stream():
+    assert parse(b'E1,"open\nE2,Lee\n') == [(1, ["E1", "open\nE2,Lee\n"])]
@@ -0,0 +1,55 @@
+"""The employee code → id cache never keeps a mapping a delete invalidated."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app import database
+from app.repositories.employee import EmployeeRepository, employee_pk_cache
+
+
+class FakeSession:
+    """Returns *rows* for any query, running *during_query* first."""
+
+    def __init__(self, rows, during_query=None, pool=None) -> None:
+        self._rows = rows
+        self._during_query = during_query
+        self.bind = SimpleNamespace(pool=pool)
+
+    async def execute(self, statement):
+        if self._during_query is not None:
+            self._during_query()
+        return [SimpleNamespace(employee_id=code, id=pk) for code, pk in self._rows]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    employee_pk_cache.invalidate()
+    yield
+    employee_pk_cache.invalidate()
+
+
+def resolve(session, *codes):
+    return asyncio.run(EmployeeRepository(session).get_ids_by_employee_ids(list(codes)))
+
+
+def test_lookup_fills_the_cache():
+    assert resolve(FakeSession([("EMP-0001", 1)]), "EMP-0001") == {"EMP-0001": 1}
+    assert employee_pk_cache.get("EMP-0001") == 1
+
+
+def test_delete_committed_during_the_lookup_is_not_undone():
+    # The query saw the row, but the delete's invalidation ran before put()
+    session = FakeSession([("EMP-0001", 1)], lambda: employee_pk_cache.invalidate(["EMP-0001"]))
+    assert resolve(session, "EMP-0001") == {"EMP-0001": 1}
+    assert employee_pk_cache.get("EMP-0001") is None
+
+
+def test_replica_lookups_are_not_cached(monkeypatch):
+    replica_pool = object()
+    monkeypatch.setattr(database, "read_engine", SimpleNamespace(pool=replica_pool))
+    assert resolve(FakeSession([("EMP-0001", 1)], pool=replica_pool), "EMP-0001") == {"EMP-0001": 1}
+    assert employee_pk_cache.get("EMP-0001") is None
+    resolve(FakeSession([("EMP-0001", 1)], pool=object()), "EMP-0001")
+    assert employee_pk_cache.get("EMP-0001") == 1
@@ -0,0 +1,108 @@
+"""Keyset pagination cursors."""
+
+import asyncio
+import base64
+import json
+from datetime import date
+
+import pytest
+
+from app.exceptions.exceptions import BadRequestException
+from app.schemas.pagination import decode_cursor, encode_cursor
+from app.services.attendance import AttendanceService
+from app.services.employee import EmployeeService
+
+
+def raw_cursor(data) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    ("sort", "values"),
+    [("id", [42]), ("employee_id", ["EMP-0042"]), ("date_id", ["2026-10-18", 7])],
+)
+def test_round_trip(sort, values):
+    assert decode_cursor(encode_cursor(sort, values), sort) == values
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not a cursor!",
+        base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+        raw_cursor(["id", [1]]),
+        raw_cursor({"s": "id"}),
+        raw_cursor({"v": [1]}),
+        raw_cursor({"s": "id", "v": 1}),
+        encode_cursor("employee_id", ["EMP-0001"]),
+    ],
+)
+def test_malformed_or_mismatched_cursor_is_a_bad_request(cursor):
+    with pytest.raises(BadRequestException):
+        decode_cursor(cursor, "id")
+
+
+class PageRepository:
+    def __init__(self) -> None:
+        self.after = None
+
+    async def get_page(self, limit, sort, after):
+        self.after = after
+        return []
+
+
+def employees_after(cursor: str, sort: str):
+    service = EmployeeService.__new__(EmployeeService)
+    service._repo = PageRepository()
+    asyncio.run(service.get_employees_page(10, cursor, sort))
+    return service._repo.after
+
+
+def test_employee_cursor_value_is_coerced_to_the_sort_column_type():
+    assert employees_after(encode_cursor("id", ["7"]), "id") == 7
+    assert employees_after(encode_cursor("employee_id", ["EMP-0007"]), "employee_id") == "EMP-0007"
+
+
+@pytest.mark.parametrize("values", [[], [1, 2], [None], ["seven"], [True], [{}]])
+def test_invalid_employee_cursor_value_is_a_bad_request(values):
+    with pytest.raises(BadRequestException):
+        employees_after(encode_cursor("id", values), "id")
+
+
+class AttendancePageRepository:
+    def __init__(self) -> None:
+        self.after = None
+
+    async def get_all_attendance(self, *args, after=None, **kwargs):
+        self.after = after
+        return []
+
+
+def attendance_after(cursor: str):
+    service = AttendanceService.__new__(AttendanceService)
+    service._repo = AttendancePageRepository()
+    asyncio.run(service.get_attendance_page(10, cursor))
+    return service._repo.after
+
+
+def test_attendance_cursor_is_a_date_and_an_id():
+    assert attendance_after(encode_cursor("date_id", ["2026-10-18", 7])) == (date(2026, 10, 18), 7)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [],
+        ["2026-10-18"],
+        ["2026-10-18", 7, 8],
+        ["2026-10-18", True],
+        ["2026-10-18", "7"],
+        ["2026-10-18", 7.5],
+        ["18/10/2026", 7],
+        [20261018, 7],
+    ],
+)
+def test_invalid_attendance_cursor_is_a_bad_request(values):
+    with pytest.raises(BadRequestException):
+        attendance_after(encode_cursor("date_id", values))
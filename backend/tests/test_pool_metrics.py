@@ -0,0 +1,43 @@
+"""Pool wait metrics, measured through public pool API only."""
+
+import asyncio
+
+from sqlalchemy.util import greenlet_spawn
+
+from app.telemetry import metrics
+from app.telemetry.metrics import (
+    InstrumentedAsyncQueuePool,
+    db_pool_checkout_wait_seconds,
+    db_pool_checkout_waits,
+)
+
+
+class FakeConnection:
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def test_only_checkouts_of_an_exhausted_pool_count_as_waits(monkeypatch):
+    monkeypatch.setattr(metrics, "settings", metrics.settings.model_copy(update={"db_max_overflow": 0}))
+    pool = InstrumentedAsyncQueuePool(FakeConnection, pool_size=1, max_overflow=0, timeout=5)
+    pool.metrics_name = "test_waits"
+
+    async def scenario() -> None:
+        first = await greenlet_spawn(pool.connect)
+        assert db_pool_checkout_waits.value("test_waits") == 0
+
+        async def release_first() -> None:
+            await asyncio.sleep(0.05)
+            await greenlet_spawn(first.close)
+
+        release = asyncio.create_task(release_first())
+        second = await greenlet_spawn(pool.connect)
+        await release
+        await greenlet_spawn(second.close)
+
+    asyncio.run(scenario())
+    assert db_pool_checkout_waits.value("test_waits") == 1
+    assert db_pool_checkout_wait_seconds.value("test_waits") >= 0.04
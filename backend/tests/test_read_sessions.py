@@ -0,0 +1,86 @@
+"""Read-only sessions go back to the pool even when a GET route raises."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import database
+from app.main import app
+from app.repositories.attendance import AttendanceRepository
+from app.repositories.employee import EmployeeRepository
+from app.repositories.table_version import TableVersionRepository
+
+
+class FakePool:
+    def __init__(self) -> None:
+        self.checked_out = 0
+        # checked_out when each response started: the session must be closed
+        # by then, not later by garbage collection
+        self.at_response: list[int] = []
+
+
+class FakeSession:
+    """Checks a "connection" out of *pool* on enter, back in on close."""
+
+    def __init__(self, pool: FakePool) -> None:
+        self._pool = pool
+        self._open = False
+
+    async def __aenter__(self):
+        self._open = True
+        self._pool.checked_out += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self) -> None:
+        if self._open:
+            self._open = False
+            self._pool.checked_out -= 1
+
+
+@pytest.fixture
+def pool(monkeypatch) -> FakePool:
+    pool = FakePool()
+    for key in list(database.READ_ONLY_SESSIONS):
+        monkeypatch.setitem(database.READ_ONLY_SESSIONS, key, lambda: FakeSession(pool))
+
+    async def get_versions(self, tables):
+        return {"attendance": 1, "employees": 1}
+
+    monkeypatch.setattr(TableVersionRepository, "get_versions", get_versions)
+    return pool
+
+
+@pytest.fixture
+def client(pool) -> TestClient:
+    async def recording_app(scope, receive, send):
+        async def send_and_record(message):
+            if message["type"] == "http.response.start":
+                pool.at_response.append(pool.checked_out)
+            await send(message)
+
+        await app(scope, receive, send_and_record)
+
+    return TestClient(recording_app)
+
+
+def test_not_found_in_endpoint_releases_session(pool, client, monkeypatch):
+    async def resolve_id(self, employee_id):
+        return None
+
+    monkeypatch.setattr(EmployeeRepository, "resolve_id", resolve_id)
+    response = client.get("/api/v1/attendance/EMP-9999")
+    assert response.status_code == 404
+    assert pool.at_response == [0]
+
+
+def test_not_modified_from_dependency_releases_session(pool, client, monkeypatch):
+    async def get_attendance_summary(self):
+        return []
+
+    monkeypatch.setattr(AttendanceRepository, "get_attendance_summary", get_attendance_summary)
+    etag = client.get("/api/v1/attendance/summary/by-employee").headers["ETag"]
+    response = client.get("/api/v1/attendance/summary/by-employee", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert pool.at_response == [0, 0]
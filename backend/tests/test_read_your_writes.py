@@ -0,0 +1,47 @@
+"""Read-your-writes routing: the header written after a write pins reads to the primary."""
+
+import time
+
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.database import READ_ONLY_SESSIONS, READ_PRIMARY_HEADER, read_session_factory
+from app.middleware.consistency import ReadYourWritesMiddleware
+
+
+def request_with(headers: dict[str, str]) -> Request:
+    raw = [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "headers": raw})
+
+
+def test_successful_writes_return_the_header():
+    async def ok(request):
+        return PlainTextResponse("")
+
+    async def rejected(request):
+        return PlainTextResponse("", status_code=400)
+
+    app = Starlette(
+        routes=[Route("/", ok, methods=["GET", "POST"]), Route("/rejected", rejected, methods=["POST"])]
+    )
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=5)
+    client = TestClient(app)
+
+    until = float(client.post("/").headers[READ_PRIMARY_HEADER])
+    assert time.time() < until <= time.time() + 5
+    assert READ_PRIMARY_HEADER not in client.get("/").headers
+    assert READ_PRIMARY_HEADER not in client.post("/rejected").headers
+
+
+def test_reads_go_to_the_primary_only_inside_the_window():
+    now = time.time()
+    primary, replica = READ_ONLY_SESSIONS[True, False], READ_ONLY_SESSIONS[False, False]
+    assert read_session_factory(request_with({})) is replica
+    assert read_session_factory(request_with({READ_PRIMARY_HEADER: f"{now + 2}"})) is primary
+    assert read_session_factory(request_with({READ_PRIMARY_HEADER: f"{now - 1}"})) is replica
+    # Beyond the window: not something this API issued
+    assert read_session_factory(request_with({READ_PRIMARY_HEADER: f"{now + 3600}"})) is replica
+    assert read_session_factory(request_with({READ_PRIMARY_HEADER: "soon"})) is replica
@@ -0,0 +1,21 @@
+"""The slow-query log only remembers shapes explained within the interval."""
+
+from app.telemetry import slow_queries
+from app.telemetry.slow_queries import SlowQueryLog
+
+
+def test_shapes_past_the_interval_are_forgotten(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(slow_queries.time, "monotonic", lambda: now[0])
+    log = SlowQueryLog(0.1, explain_interval_seconds=300)
+
+    for length in range(1, 101):
+        log._mark_explained(f"SELECT * FROM employees WHERE id IN ({', '.join(['$1'] * length)})")
+        now[0] += 1
+    assert len(log._last_explained) == 100
+
+    now[0] += 250
+    log._mark_explained("SELECT 1")
+    # Only the shapes explained in the last 300 s are left
+    assert len(log._last_explained) == 50
+    assert list(log._last_explained)[-1] == "SELECT 1"
@@ -0,0 +1,68 @@
+"""Splitting attendance summary ranges into rollup months and edge days."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.repositories.attendance import _split_on_months
+
+d = date.fromisoformat
+
+
+@pytest.mark.parametrize(
+    ("start_date", "end_date", "expected"),
+    [
+        # Whole months only
+        (d("2026-03-01"), d("2026-03-31"), (d("2026-03-01"), d("2026-04-01"), [])),
+        (d("2024-02-01"), d("2024-02-29"), (d("2024-02-01"), d("2024-03-01"), [])),
+        (d("2025-11-01"), d("2026-01-31"), (d("2025-11-01"), d("2026-02-01"), [])),
+        # Partial months at both edges, across a year boundary
+        (
+            d("2025-12-15"),
+            d("2026-01-10"),
+            (
+                d("2026-01-01"),
+                d("2026-01-01"),
+                [(d("2025-12-15"), d("2025-12-31")), (d("2026-01-01"), d("2026-01-10"))],
+            ),
+        ),
+        # Within a single month: one edge range, no whole month
+        (d("2026-03-10"), d("2026-03-20"), (d("2026-04-01"), d("2026-03-01"), [(d("2026-03-10"), d("2026-03-20"))])),
+        (d("2026-03-01"), d("2026-03-20"), (d("2026-03-01"), d("2026-03-01"), [(d("2026-03-01"), d("2026-03-20"))])),
+        (d("2026-03-10"), d("2026-03-31"), (d("2026-04-01"), d("2026-04-01"), [(d("2026-03-10"), d("2026-03-31"))])),
+        (d("2026-03-10"), d("2026-03-10"), (d("2026-04-01"), d("2026-03-01"), [(d("2026-03-10"), d("2026-03-10"))])),
+        # Open-ended
+        (None, None, (None, None, [])),
+        (None, d("2026-03-15"), (None, d("2026-03-01"), [(d("2026-03-01"), d("2026-03-15"))])),
+        (None, d("2026-03-31"), (None, d("2026-04-01"), [])),
+        (d("2026-03-15"), None, (d("2026-04-01"), None, [(d("2026-03-15"), d("2026-03-31"))])),
+        (d("2026-03-01"), None, (d("2026-03-01"), None, [])),
+    ],
+)
+def test_split_on_months(start_date, end_date, expected):
+    assert _split_on_months(start_date, end_date) == expected
+
+
+def covered_days(start_date: date, end_date: date) -> list[date]:
+    """Every day the split counts, in order, as the summary query would."""
+    first_month, end_month, edges = _split_on_months(start_date, end_date)
+    days = []
+    day = first_month
+    while first_month < end_month and day < end_month:
+        days.append(day)
+        day += timedelta(days=1)
+    for edge_start, edge_end in edges:
+        day = edge_start
+        while day <= edge_end:
+            days.append(day)
+            day += timedelta(days=1)
+    return sorted(days)
+
+
+def test_every_day_is_counted_exactly_once():
+    starts = [d("2024-01-01") + timedelta(days=offset) for offset in range(0, 120, 3)]
+    for start_date in starts:
+        for length in (0, 1, 27, 28, 30, 31, 45, 62, 90):
+            end_date = start_date + timedelta(days=length)
+            expected = [start_date + timedelta(days=offset) for offset in range(length + 1)]
+            assert covered_days(start_date, end_date) == expected, (start_date, end_date)
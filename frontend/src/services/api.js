@@ -8,6 +8,22 @@ const api = axios.create({
   },
 })
 
+// Read-your-writes: after a write the API returns X-Read-Primary-Until; echoing
+// it on later requests keeps our reads on the primary until the replica catches up
+const READ_PRIMARY_HEADER = 'x-read-primary-until'
+let readPrimaryUntil = null
+
+api.interceptors.request.use((config) => {
+  if (readPrimaryUntil) config.headers[READ_PRIMARY_HEADER] = readPrimaryUntil
+  return config
+})
+
+api.interceptors.response.use((response) => {
+  const until = response.headers[READ_PRIMARY_HEADER]
+  if (until) readPrimaryUntil = until
+  return response
+})
+
 // Employees
 export const getEmployees = () => api.get('/v1/employees')
 export const createEmployee = (data) => api.post('/v1/employees', data)